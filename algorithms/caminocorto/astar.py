@@ -1,5 +1,9 @@
-import networkx as nx
 import math
+import weakref
+from heapq import heappop, heappush
+
+from algorithms.grafo_csr import obtener_csr
+from algorithms.caminocorto.dijkstra import INF, MotorDijkstra, ids_de, obtener_motor
 
 def distancia_euclidea(coord1, coord2):
     """Distancia aproximada en km entre dos coordenadas geográficas (lat, lon)"""
@@ -8,24 +12,151 @@ def distancia_euclidea(coord1, coord2):
     return math.sqrt((lat1 - lat2)**2 + (lon1 - lon2)**2) * 111  # Aprox. km
 
 def heuristica(u, v, G):
-    """Heurística para A* basada en distancia euclídea entre nodos"""
-    try:
-        coord_u = G.nodes[u]['pos']
-        coord_v = G.nodes[v]['pos']
-        return distancia_euclidea(coord_u, coord_v)
-    except:
+    """Heurística para A* basada en distancia euclídea entre nodos (0 si alguno no tiene coordenadas)"""
+    coord_u = G.nodes[u].get('pos', (0, 0))
+    coord_v = G.nodes[v].get('pos', (0, 0))
+    if coord_u == (0, 0) or coord_v == (0, 0):
         return 0
+    return distancia_euclidea(coord_u, coord_v)
+
+
+class MotorAStar(MotorDijkstra):
+    """A* sobre el CSR: una sola búsqueda guiada por una heurística h(id) -> cota inferior"""
+    def buscar(self, origen, destino, h):
+        self._limpiar()
+        offsets, destinos, distancia, eta = self.csr.listas()
+        dist, pred, tiempo, cerrado = self.dist, self.pred, self.tiempo, self.cerrado
+        tocados = self.tocados
+        dist[origen] = 0.0
+        tocados.append(origen)
+        estimada = {origen: h(origen)}
+        heap = [(estimada[origen], 0.0, origen)]
+        asentados = 0
+        while heap:
+            _, d, u = heappop(heap)
+            if cerrado[u] or d > dist[u]:
+                continue
+            cerrado[u] = True
+            asentados += 1
+            if u == destino:
+                break
+            tu = tiempo[u]
+            for i in range(offsets[u], offsets[u + 1]):
+                v = destinos[i]
+                if cerrado[v]:
+                    continue
+                nd = d + distancia[i]
+                if nd < dist[v]:
+                    if dist[v] == INF:
+                        tocados.append(v)
+                        estimada[v] = h(v)
+                    dist[v] = nd
+                    pred[v] = u
+                    tiempo[v] = tu + eta[i]
+                    if estimada[v] < INF:
+                        heappush(heap, (nd + estimada[v], nd, v))
+        self.asentados = asentados
+
+
+def heuristica_euclidea(csr, destino):
+    """h(id) con la distancia euclídea al destino a partir de las coordenadas del CSR"""
+    pos = csr.pos.tolist()
+    lat_t, lon_t = pos[destino]
+    if (lat_t, lon_t) == (0, 0):
+        return lambda v: 0.0
+
+    def h(v):
+        lat, lon = pos[v]
+        if lat == 0 and lon == 0:
+            return 0.0
+        return math.sqrt((lat - lat_t)**2 + (lon - lon_t)**2) * 111
+    return h
+
+
+class LandmarksALT:
+    """
+    Preproceso de ALT (A*, Landmarks, desigualdad Triangular). Para cada landmark L se guardan
+    d(L, v) y d(v, L) para todo v; por la desigualdad triangular
+        d(v, t) >= max(d(L, t) - d(L, v), d(v, L) - d(t, L))
+    es una cota inferior admisible y consistente, mucho más ajustada que la euclídea.
+    Solo guarda ids y distancias, no el CSR: se memoriza con el CSR como clave débil.
+    """
+    def __init__(self, G, cantidad=8):
+        csr = obtener_csr(G)
+        self.landmarks = []
+        adelante = MotorDijkstra(csr)
+        atras = MotorDijkstra(csr.invertido())
+        desde, hacia = [], []
+        # Selección por lejanía: cada landmark es el nodo más lejano de los ya elegidos
+        cercania = [INF] * csr.n
+        candidato = 0
+        for _ in range(min(cantidad, csr.n)):
+            self.landmarks.append(candidato)
+            adelante.buscar(candidato)
+            atras.buscar(candidato)
+            desde.append(list(adelante.dist))
+            hacia.append(list(atras.dist) if csr.dirigido else desde[-1])
+            for v, d in enumerate(desde[-1]):
+                if d < cercania[v]:
+                    cercania[v] = d
+            alcanzables = [v for v in range(csr.n) if cercania[v] < INF]
+            if len(alcanzables) < csr.n:
+                # Otra componente: el siguiente landmark va allí
+                candidato = next(v for v in range(csr.n) if cercania[v] == INF)
+            else:
+                candidato = max(range(csr.n), key=cercania.__getitem__)
+        # Por nodo, las distancias a/desde cada landmark (acceso contiguo durante la búsqueda)
+        self.desde = list(zip(*desde))
+        self.hacia = list(zip(*hacia))
+
+    def heuristica(self, destino):
+        desde_t = self.desde[destino]
+        hacia_t = self.hacia[destino]
+
+        def h(v):
+            mejor = 0.0
+            for d_lv, d_lt, d_vl, d_tl in zip(self.desde[v], desde_t, self.hacia[v], hacia_t):
+                if d_lt < INF:
+                    if d_lv == INF:
+                        continue
+                    if d_lt - d_lv > mejor:
+                        mejor = d_lt - d_lv
+                if d_tl < INF:
+                    if d_vl == INF:
+                        return INF  # v no llega a L pero t sí: v tampoco llega a t
+                    if d_vl - d_tl > mejor:
+                        mejor = d_vl - d_tl
+            return mejor
+        return h
+
+
+_CACHE_LANDMARKS = weakref.WeakKeyDictionary()
+
+
+def obtener_landmarks(G, cantidad=8):
+    """Tablas de landmarks del grafo, calculadas una sola vez por CSR"""
+    csr = obtener_csr(G)
+    alt = _CACHE_LANDMARKS.get(csr)
+    if alt is None or len(alt.landmarks) < min(cantidad, csr.n):
+        alt = LandmarksALT(csr, cantidad)
+        _CACHE_LANDMARKS[csr] = alt
+    return alt
+
 
-def shortest_path_astar(G, origen, destino):
-    """Camino más corto usando A* entre origen y destino"""
+def shortest_path_astar(G, origen, destino, modo="euclidea"):
+    """Camino más corto usando A* entre origen y destino (modo 'euclidea' o 'alt')"""
+    nombre = "A* (ALT)" if modo == "alt" else "A* (A-Star)"
     try:
-        path = nx.astar_path(G, origen, destino, heuristic=lambda u, v: heuristica(u, v, G), weight='distancia')
-        distancia = nx.astar_path_length(G, origen, destino, heuristic=lambda u, v: heuristica(u, v, G), weight='distancia')
-        tiempo = sum(G[path[i]][path[i+1]]['eta'] for i in range(len(path)-1))
-        return path, distancia, tiempo, "A* (A-Star)"
-    except nx.NetworkXNoPath:
-        print("No hay camino entre los nodos.")
-        return None, float('inf'), float('inf'), "A* (A-Star)"
+        csr = obtener_csr(G)
+        s, t = ids_de(csr, origen, destino)
+        h = obtener_landmarks(csr).heuristica(t) if modo == "alt" else heuristica_euclidea(csr, t)
+        motor = obtener_motor(csr, MotorAStar)
+        motor.buscar(s, t, h)
+        ids = motor.camino(t)
+        if ids is None:
+            print("No hay camino entre los nodos.")
+            return None, float('inf'), float('inf'), nombre
+        return [csr.nodos[i] for i in ids], motor.dist[t], motor.tiempo[t], nombre
     except Exception as e:
         print(e)
-        return None, float('inf'), float('inf'), "A* (A-Star)"
+        return None, float('inf'), float('inf'), nombre
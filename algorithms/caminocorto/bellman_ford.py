@@ -1,31 +1,135 @@
-import networkx as nx
-from tkinter import messagebox
+from collections import deque
 
-def shortest_paths_from_source_bellman(G, origen):
+from algorithms.grafo_csr import obtener_csr
+from algorithms.caminocorto.dijkstra import INF, ArbolCaminos, ids_de
+
+
+class ResultadoBellman:
+    """
+    Resultado de Bellman-Ford: el árbol de caminos más cortos o, si desde el origen se alcanza
+    un ciclo de peso negativo, ese ciclo (nombres de nodos, cerrado: el primero se repite al final).
+    """
+    def __init__(self, arbol=None, ciclo=None, relajaciones=0):
+        self.arbol = arbol
+        self.ciclo = ciclo
+        self.relajaciones = relajaciones
+        self.algoritmo = "Bellman-Ford"
+
+    def vistas(self):
+        """(distancias, rutas, tiempos) como en los demás algoritmos; vacíos si hay ciclo negativo"""
+        if self.arbol is None:
+            return {}, {}, {}
+        return self.arbol.vistas()
+
+
+def _ciclo_en_predecesores(pred):
+    """Un ciclo del grafo de predecesores (si existe es de peso negativo), o None"""
+    marca = [0] * len(pred)
+    for inicio in range(len(pred)):
+        v = inicio
+        while v != -1 and not marca[v]:
+            marca[v] = inicio + 1
+            v = pred[v]
+        if v != -1 and marca[v] == inicio + 1:
+            ciclo = [v]
+            u = pred[v]
+            while u != v:
+                ciclo.append(u)
+                u = pred[u]
+            ciclo.append(v)
+            ciclo.reverse()
+            return ciclo
+    return None
+
+
+def bellman_ford_csr(csr, origen, modo="cola"):
+    """
+    Bellman-Ford desde el id origen sobre el CSR, en Python puro.
+    modo 'cola' (SPFA): solo se vuelven a revisar los nodos cuya distancia bajó; cuando algún
+    camino llega a tener n arcos (y cada n más) se busca un ciclo en los predecesores.
+    modo 'pasadas': el clásico de hasta n - 1 pasadas sobre todos los arcos, que termina en
+    cuanto una pasada no cambia nada; si la n-ésima todavía mejora algo, hay ciclo negativo.
+    :return: ResultadoBellman (con ciclo en ids)
+    """
+    n = csr.n
+    offsets, destinos, distancia, _ = csr.listas()
+    dist = [INF] * n
+    pred = [-1] * n
+    arco = [-1] * n
+    dist[origen] = 0.0
+    relajaciones = 0
+
+    if modo == "cola":
+        largo = [0] * n
+        en_cola = [False] * n
+        cola = deque([origen])
+        en_cola[origen] = True
+        while cola:
+            u = cola.popleft()
+            en_cola[u] = False
+            du = dist[u]
+            for i in range(offsets[u], offsets[u + 1]):
+                v = destinos[i]
+                nd = du + distancia[i]
+                if nd < dist[v]:
+                    relajaciones += 1
+                    dist[v] = nd
+                    pred[v] = u
+                    arco[v] = i
+                    largo[v] = largo[u] + 1
+                    if largo[v] % n == 0:
+                        ciclo = _ciclo_en_predecesores(pred)
+                        if ciclo is not None:
+                            return ResultadoBellman(ciclo=ciclo, relajaciones=relajaciones)
+                    if not en_cola[v]:
+                        en_cola[v] = True
+                        cola.append(v)
+    elif modo == "pasadas":
+        for pasada in range(n):
+            cambio = False
+            for u in range(n):
+                du = dist[u]
+                if du == INF:
+                    continue
+                for i in range(offsets[u], offsets[u + 1]):
+                    v = destinos[i]
+                    nd = du + distancia[i]
+                    if nd < dist[v]:
+                        relajaciones += 1
+                        dist[v] = nd
+                        pred[v] = u
+                        arco[v] = i
+                        cambio = True
+            if not cambio:
+                break
+            if pasada == n - 1:
+                return ResultadoBellman(ciclo=_ciclo_en_predecesores(pred), relajaciones=relajaciones)
+    else:
+        raise ValueError(f"Modo de Bellman-Ford desconocido: {modo}")
+
+    arbol = ArbolCaminos.desde_predecesores(csr, origen, dist, pred, arco)
+    return ResultadoBellman(arbol=arbol, relajaciones=relajaciones)
+
+
+def bellman_ford(G, origen, modo="cola"):
+    """Bellman-Ford desde origen; el ciclo negativo, si lo hay, se devuelve con nombres de nodos"""
+    csr = obtener_csr(G)
+    s, = ids_de(csr, origen)
+    resultado = bellman_ford_csr(csr, s, modo)
+    if resultado.ciclo is not None:
+        resultado.ciclo = [csr.nodos[v] for v in resultado.ciclo]
+    return resultado
+
+
+def shortest_paths_from_source_bellman(G, origen, modo="cola"):
     """Caminos más cortos desde un nodo origen usando Bellman-Ford"""
     try:
-        length, paths = nx.single_source_bellman_ford(G, origen, weight='distancia')
-        tiempos = {}
-        for destino in paths:
-            if destino == origen:
-                tiempos[destino] = 0
-            else:
-                tiempo = sum(G[paths[destino][i]][paths[destino][i+1]]['eta'] for i in range(len(paths[destino])-1))
-                tiempos[destino] = tiempo
+        resultado = bellman_ford(G, origen, modo)
+        if resultado.ciclo is not None:
+            print("⚠️ Error: El grafo contiene un ciclo negativo:", " → ".join(resultado.ciclo))
+        length, paths, tiempos = resultado.vistas()
         return length, paths, tiempos, "Bellman-Ford"
-    
-    except nx.NetworkXUnbounded:
-        print("⚠️ Error: El grafo contiene un ciclo negativo. Bellman-Ford no puede continuar.")
-        messagebox.showerror(
-            "Ciclo negativo detectado",
-            "El grafo contiene un ciclo con peso negativo. El algoritmo Bellman-Ford no puede continuar."
-        )
-        return {}, {}, {}, "Bellman-Ford"
-    
+
     except Exception as e:
         print(f"❌ Ocurrió un error inesperado: {e}")
-        messagebox.showerror(
-            "Error inesperado",
-            f"Ocurrió un error al ejecutar Bellman-Ford:\n\n{e}"
-        )
         return {}, {}, {}, "Bellman-Ford"
@@ -0,0 +1,405 @@
+import hashlib
+import os
+import weakref
+import zipfile
+from heapq import heapify, heappop, heappush
+
+import numpy as np
+
+from algorithms.grafo_csr import obtener_csr
+from algorithms.caminocorto.dijkstra import ids_de
+
+INF = float('inf')
+VERSION_JERARQUIA = 1
+
+
+def huella_csr(csr):
+    """Identifica el contenido del grafo para saber si una jerarquía guardada le corresponde"""
+    h = hashlib.blake2b(digest_size=20)
+    for arreglo in (csr.offsets, csr.destinos, csr.distancia, csr.eta):
+        h.update(np.ascontiguousarray(arreglo).tobytes())
+    h.update('\x00'.join(map(str, csr.nodos)).encode('utf-8'))
+    return h.hexdigest()
+
+
+def _a_csr(listas, n):
+    """Convierte listas de adyacencia [(vecino, distancia, eta, medio)] a arreglos CSR"""
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum([len(l) for l in listas], out=offsets[1:])
+    arcos = [a for l in listas for a in l]
+    destinos = np.array([a[0] for a in arcos], dtype=np.int32)
+    distancia = np.array([a[1] for a in arcos], dtype=np.float64)
+    eta = np.array([a[2] for a in arcos], dtype=np.float64)
+    medio = np.array([a[3] for a in arcos], dtype=np.int32)
+    return offsets, destinos, distancia, eta, medio
+
+
+class JerarquiaContraccion:
+    """
+    Contraction Hierarchies: se contraen los nodos de menos a más importante agregando atajos
+    que preservan las distancias, y cada consulta es un Dijkstra bidireccional que solo sube
+    de rango. Los atajos guardan el nodo intermedio para desempaquetar el camino original.
+
+    arriba[u]: arcos u->v del grafo con atajos con rango[v] > rango[u] (búsqueda hacia adelante)
+    abajo[u]:  arcos v->u con rango[v] > rango[u], guardados invertidos (búsqueda hacia atrás)
+    """
+    def __init__(self, nodos, rango, arriba, abajo, huella):
+        self.nodos = list(nodos)
+        self.indice = {n: i for i, n in enumerate(self.nodos)}
+        self.rango = rango
+        self.arriba = arriba
+        self.abajo = abajo
+        self.huella = huella
+        self.asentados = 0
+        self._listas = None
+
+    # ------------------------------------------------------------------ preproceso
+    @classmethod
+    def construir(cls, G, limite_testigo=500, limite_estimacion=15):
+        """
+        Preprocesa el grafo (nx o GrafoCSR). limite_testigo acota los nodos que asienta cada
+        búsqueda de testigos al contraer y limite_estimacion los de las búsquedas que solo
+        estiman la prioridad; límites menores agregan más atajos pero nunca afectan la exactitud.
+        """
+        csr = obtener_csr(G)
+        n = csr.n
+        offsets, destinos, distancia, eta = csr.listas()
+        salida = [dict() for _ in range(n)]
+        entrada = [dict() for _ in range(n)]
+        for u in range(n):
+            for i in range(offsets[u], offsets[u + 1]):
+                v = destinos[i]
+                if v == u:
+                    continue
+                actual = salida[u].get(v)
+                if actual is None or distancia[i] < actual[0]:
+                    salida[u][v] = entrada[v][u] = (distancia[i], eta[i], -1)
+
+        contraido = [False] * n
+        vecinos_contraidos = [0] * n
+        nivel = [0] * n
+
+        def testigos(u, excluido, limite, objetivos, maximo):
+            """Distancias desde u sin pasar por excluido, hasta limite o hasta asentar los objetivos"""
+            dist = {u: 0.0}
+            heap = [(0.0, u)]
+            pendientes = len(objetivos)
+            asentados = 0
+            cerrados = set()
+            while heap and pendientes and asentados < maximo:
+                d, x = heappop(heap)
+                if x in cerrados:
+                    continue
+                if d > limite:
+                    break
+                cerrados.add(x)
+                asentados += 1
+                if x in objetivos:
+                    pendientes -= 1
+                for y, (w, _, _) in salida[x].items():
+                    if y == excluido:
+                        continue
+                    nd = d + w
+                    if nd < dist.get(y, INF):
+                        dist[y] = nd
+                        heappush(heap, (nd, y))
+            return dist
+
+        def atajos(v, maximo=limite_testigo):
+            """Atajos (u, w, distancia, eta) necesarios para contraer v"""
+            if not entrada[v] or not salida[v]:
+                return []
+            max_salida = max(a[0] for a in salida[v].values())
+            nuevos = []
+            for u, (du, eu, _) in entrada[v].items():
+                objetivos = {w for w in salida[v] if w != u}
+                if not objetivos:
+                    continue
+                dist = testigos(u, v, du + max_salida, objetivos, maximo)
+                for w in objetivos:
+                    dw, ew, _ = salida[v][w]
+                    if dist.get(w, INF) > du + dw:
+                        nuevos.append((u, w, du + dw, eu + ew))
+            return nuevos
+
+        def prioridad(v, maximo=limite_estimacion):
+            """
+            Diferencia de aristas (atajos que agrega menos aristas que quita), vecinos ya
+            contraídos y nivel en la jerarquía. Los atajos se estiman con búsquedas de testigos
+            cortas; los definitivos se calculan al contraer.
+            """
+            grado = len(entrada[v]) + len(salida[v])
+            return 2 * (len(atajos(v, maximo)) - grado) + vecinos_contraidos[v] + nivel[v]
+
+        actual = [prioridad(v) for v in range(n)]
+        heap = [(p, v) for v, p in enumerate(actual)]
+        heapify(heap)
+        rango = np.empty(n, dtype=np.int32)
+        arriba = [[] for _ in range(n)]
+        abajo = [[] for _ in range(n)]
+        siguiente = 0
+        while heap:
+            p, v = heappop(heap)
+            if contraido[v] or p != actual[v]:
+                continue  # entrada vieja de la cola
+            nuevos = atajos(v)
+            vecinos = set(salida[v]) | set(entrada[v])
+            # Al contraer v sus vecinos restantes son todos de rango mayor
+            for w, (d, e, medio) in salida[v].items():
+                arriba[v].append((w, d, e, medio))
+                del entrada[w][v]
+            for u, (d, e, medio) in entrada[v].items():
+                abajo[v].append((u, d, e, medio))
+                del salida[u][v]
+            for u, w, d, e in nuevos:
+                previo = salida[u].get(w)
+                if previo is None or d < previo[0]:
+                    salida[u][w] = entrada[w][u] = (d, e, v)
+            salida[v] = {}
+            entrada[v] = {}
+            contraido[v] = True
+            rango[v] = siguiente
+            siguiente += 1
+            # Los vecinos cambian de grado y de atajos necesarios: se recalcula su prioridad
+            for w in vecinos:
+                vecinos_contraidos[w] += 1
+                nivel[w] = max(nivel[w], nivel[v] + 1)
+                actual[w] = prioridad(w)
+                heappush(heap, (actual[w], w))
+
+        return cls(csr.nodos, rango, _a_csr(arriba, n), _a_csr(abajo, n), huella_csr(csr))
+
+    # ------------------------------------------------------------------ consultas
+    def listas(self):
+        if self._listas is None:
+            self._listas = tuple(tuple(a.tolist() for a in lado) for lado in (self.arriba, self.abajo))
+        return self._listas
+
+    def consultar(self, origen, destino):
+        """
+        Consulta por ids. :return: (distancia, tiempo, camino en ids del grafo original)
+        o (INF, INF, None) si no hay camino.
+        """
+        if origen == destino:
+            self.asentados = 0
+            return 0.0, 0.0, [origen]
+        lados = self.listas()
+        dist = ({origen: 0.0}, {destino: 0.0})
+        tiempo = ({origen: 0.0}, {destino: 0.0})
+        pred = ({origen: -1}, {destino: -1})
+        cerrados = (set(), set())
+        heaps = ([(0.0, origen)], [(0.0, destino)])
+        mejor = INF
+        encuentro = -1
+        asentados = 0
+        while heaps[0] or heaps[1]:
+            # Cada lado solo avanza mientras su frente no supere la mejor distancia
+            lado = 0 if heaps[0] and (not heaps[1] or heaps[0][0][0] <= heaps[1][0][0]) else 1
+            d, u = heappop(heaps[lado])
+            if d >= mejor:
+                heaps[lado].clear()
+                continue
+            if u in cerrados[lado]:
+                continue
+            cerrados[lado].add(u)
+            asentados += 1
+            otro = dist[1 - lado].get(u)
+            if otro is not None and d + otro < mejor:
+                mejor = d + otro
+                encuentro = u
+            dl, tl, pl = dist[lado], tiempo[lado], pred[lado]
+            # Stall-on-demand: si un vecino de rango mayor ya ofrece un camino más corto a u,
+            # la distancia de u no es la definitiva y no vale la pena expandirlo
+            offsets, destinos, distancia, _, _ = lados[1 - lado]
+            if any(destinos[i] in dl and dl[destinos[i]] + distancia[i] < d
+                   for i in range(offsets[u], offsets[u + 1])):
+                continue
+            offsets, destinos, distancia, eta, _ = lados[lado]
+            tu = tl[u]
+            for i in range(offsets[u], offsets[u + 1]):
+                v = destinos[i]
+                nd = d + distancia[i]
+                if nd < dl.get(v, INF):
+                    dl[v] = nd
+                    tl[v] = tu + eta[i]
+                    pl[v] = u
+                    heappush(heaps[lado], (nd, v))
+        self.asentados = asentados
+        if encuentro == -1:
+            return INF, INF, None
+
+        # Camino en el grafo con atajos: origen ... encuentro ... destino
+        subida = []
+        v = encuentro
+        while v != -1:
+            subida.append(v)
+            v = pred[0][v]
+        subida.reverse()
+        v = pred[1][encuentro]
+        while v != -1:
+            subida.append(v)
+            v = pred[1][v]
+        camino = [subida[0]]
+        for a, b in zip(subida, subida[1:]):
+            self._desempaquetar(a, b, camino)
+        return mejor, tiempo[0][encuentro] + tiempo[1][encuentro], camino
+
+    def busqueda_ascendente(self, inicio, lado):
+        """
+        Búsqueda completa que solo sube de rango desde inicio, hacia adelante (lado 0) o hacia
+        atrás (lado 1), con stall-on-demand. :return: {nodo: (distancia, tiempo)} de los nodos
+        asentados sin estancar, que son los únicos por donde puede pasar un camino óptimo.
+        """
+        lados = self.listas()
+        offsets, destinos, distancia, eta, _ = lados[lado]
+        offsets_o, destinos_o, distancia_o, _, _ = lados[1 - lado]
+        dist = {inicio: 0.0}
+        tiempo = {inicio: 0.0}
+        cerrados = set()
+        alcanzados = {}
+        heap = [(0.0, inicio)]
+        while heap:
+            d, u = heappop(heap)
+            if u in cerrados:
+                continue
+            cerrados.add(u)
+            if any(destinos_o[i] in dist and dist[destinos_o[i]] + distancia_o[i] < d
+                   for i in range(offsets_o[u], offsets_o[u + 1])):
+                continue
+            tu = tiempo[u]
+            alcanzados[u] = (d, tu)
+            for i in range(offsets[u], offsets[u + 1]):
+                v = destinos[i]
+                nd = d + distancia[i]
+                if nd < dist.get(v, INF):
+                    dist[v] = nd
+                    tiempo[v] = tu + eta[i]
+                    heappush(heap, (nd, v))
+        return alcanzados
+
+    def filas_muchos_a_muchos(self, origenes, destinos):
+        """
+        Matriz origen/destino por cubetas: una búsqueda hacia atrás desde cada destino deja en
+        cada nodo que asienta una cubeta con (columna, distancia, tiempo); después una búsqueda
+        hacia adelante por origen combina las cubetas de los nodos que alcanza.
+        Genera (fila, distancias, tiempos) por origen, en orden.
+        """
+        cubetas = {}
+        for j, t in enumerate(destinos):
+            for u, (d, tiempo) in self.busqueda_ascendente(t, 1).items():
+                cubetas.setdefault(u, []).append((j, d, tiempo))
+        for fila, s in enumerate(origenes):
+            dist = [INF] * len(destinos)
+            tiempos = [INF] * len(destinos)
+            for u, (d, tiempo) in self.busqueda_ascendente(s, 0).items():
+                for j, dj, tj in cubetas.get(u, ()):
+                    if d + dj < dist[j]:
+                        dist[j] = d + dj
+                        tiempos[j] = tiempo + tj
+            yield fila, dist, tiempos
+
+    def _medio(self, a, b):
+        """Nodo intermedio del arco a->b del grafo con atajos (-1 si es una arista original)"""
+        lados = self.listas()
+        if self.rango[a] < self.rango[b]:
+            offsets, destinos, _, _, medio = lados[0]
+            x, y = a, b
+        else:
+            offsets, destinos, _, _, medio = lados[1]
+            x, y = b, a
+        for i in range(offsets[x], offsets[x + 1]):
+            if destinos[i] == y:
+                return medio[i]
+        raise KeyError((a, b))
+
+    def _desempaquetar(self, a, b, camino):
+        """Agrega a camino los nodos originales del arco a->b, sin repetir a"""
+        pila = [(a, b)]
+        while pila:
+            x, y = pila.pop()
+            m = self._medio(x, y)
+            if m == -1:
+                camino.append(y)
+            else:
+                pila.append((m, y))
+                pila.append((x, m))
+
+    # ------------------------------------------------------------------ persistencia
+    def guardar(self, path):
+        """Guarda la jerarquía en ruta_jerarquia(path) (se escribe aparte y se reemplaza al final)"""
+        path = ruta_jerarquia(path)
+        arreglos = {'version': np.array(VERSION_JERARQUIA), 'huella': np.array(self.huella),
+                    'nodos': np.array([str(n) for n in self.nodos]), 'rango': self.rango}
+        for nombre, lado in (('arriba', self.arriba), ('abajo', self.abajo)):
+            for campo, arreglo in zip(('offsets', 'destinos', 'distancia', 'eta', 'medio'), lado):
+                arreglos[f'{nombre}_{campo}'] = arreglo
+        carpeta = os.path.dirname(os.path.abspath(path))
+        os.makedirs(carpeta, exist_ok=True)
+        temporal = path + '.tmp'
+        # Por archivo abierto: np.savez no agrega otra extensión
+        with open(temporal, 'wb') as archivo:
+            np.savez(archivo, **arreglos)
+        os.replace(temporal, path)
+
+    @classmethod
+    def cargar(cls, path, G=None):
+        """
+        Carga una jerarquía guardada; si se pasa G, devuelve None cuando no corresponde a ese grafo.
+        También devuelve None si el archivo no se puede leer (por ejemplo, si quedó dañado).
+        """
+        try:
+            with np.load(ruta_jerarquia(path), allow_pickle=False) as datos:
+                if int(datos['version']) != VERSION_JERARQUIA:
+                    return None
+                huella = str(datos['huella'])
+                if G is not None and huella != huella_csr(obtener_csr(G)):
+                    return None
+                lados = [tuple(datos[f'{nombre}_{campo}'] for campo in ('offsets', 'destinos', 'distancia', 'eta', 'medio'))
+                         for nombre in ('arriba', 'abajo')]
+                nodos = obtener_csr(G).nodos if G is not None else datos['nodos'].tolist()
+                return cls(nodos, datos['rango'], lados[0], lados[1], huella)
+        except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile) as e:
+            print("Jerarquía guardada inválida, se vuelve a construir:", e)
+            return None
+
+
+def ruta_jerarquia(path):
+    """Ruta con la que se guarda y se busca la jerarquía: siempre termina en .npz"""
+    return path if path.endswith('.npz') else path + '.npz'
+
+
+# Jerarquía ya preprocesada por CSR (se descarta sola cuando el grafo cambia y se reconstruye el CSR)
+_CACHE_JERARQUIAS = weakref.WeakKeyDictionary()
+
+
+def jerarquia_preprocesada(G):
+    """True si ya hay una jerarquía en memoria para la versión actual del grafo"""
+    return obtener_csr(G) in _CACHE_JERARQUIAS
+
+
+def obtener_jerarquia(G, path=None):
+    """
+    Jerarquía del grafo: la de memoria si ya se preprocesó, la del archivo path si corresponde
+    al grafo actual, o una nueva (que se guarda en path si se indicó). Se agrega .npz a path si
+    no lo tiene.
+    """
+    csr = obtener_csr(G)
+    jerarquia = _CACHE_JERARQUIAS.get(csr)
+    if jerarquia is None and path and os.path.exists(ruta_jerarquia(path)):
+        jerarquia = JerarquiaContraccion.cargar(path, csr)
+    if jerarquia is None:
+        jerarquia = JerarquiaContraccion.construir(csr)
+        if path:
+            jerarquia.guardar(path)
+    _CACHE_JERARQUIAS[csr] = jerarquia
+    return jerarquia
+
+
+def shortest_path_ch(G, origen, destino, path=None):
+    """Camino más corto de origen a destino con Contraction Hierarchies"""
+    jerarquia = obtener_jerarquia(G, path)
+    s, t = ids_de(obtener_csr(G), origen, destino)
+    distancia, tiempo, ids = jerarquia.consultar(s, t)
+    if ids is None:
+        return None, float('inf'), float('inf'), "Contraction Hierarchies"
+    return [jerarquia.nodos[i] for i in ids], distancia, tiempo, "Contraction Hierarchies"
@@ -1,29 +1,318 @@
+import threading
+from collections import deque
+from collections.abc import Mapping
+from heapq import heappop, heappush
+
 import networkx as nx
 
-def shortest_path_dijkstra(G, origen, destino):
-    """Camino más corto de origen a destino usando Dijkstra"""
+from algorithms.grafo_csr import obtener_csr
+
+INF = float('inf')
+
+
+class MotorDijkstra:
+    """
+    Dijkstra sobre un GrafoCSR. En una sola búsqueda lleva juntos la distancia, el
+    predecesor y el ETA acumulado de cada nodo. Los buffers se reutilizan entre
+    consultas: solo se limpian los nodos que tocó la búsqueda anterior.
+    """
+    def __init__(self, csr):
+        self.csr = csr
+        n = csr.n
+        self.dist = [INF] * n
+        self.pred = [-1] * n
+        self.arco = [-1] * n  # arco del CSR por el que se llegó (-1 en el origen y sin alcanzar)
+        self.tiempo = [0.0] * n
+        self.cerrado = [False] * n
+        self.tocados = []
+        self.orden = []  # nodos en el orden en que se asentaron
+        self.asentados = 0
+
+    def _limpiar(self):
+        dist, pred, arco, tiempo, cerrado = self.dist, self.pred, self.arco, self.tiempo, self.cerrado
+        for v in self.tocados:
+            dist[v] = INF
+            pred[v] = -1
+            arco[v] = -1
+            tiempo[v] = 0.0
+            cerrado[v] = False
+        self.tocados = []
+        self.orden = []
+
+    def buscar(self, origen, destino=-1, objetivos=None):
+        """
+        Búsqueda desde el id origen; termina al asentar destino (o al agotar el grafo si es -1)
+        o, si se da un conjunto de ids objetivos, en cuanto estén todos asentados.
+        El resultado queda en dist, pred y tiempo hasta la siguiente consulta.
+        """
+        self._limpiar()
+        faltan = len(objetivos) if objetivos else 0
+        offsets, destinos, distancia, eta = self.csr.listas()
+        dist, pred, tiempo, cerrado = self.dist, self.pred, self.tiempo, self.cerrado
+        arco, tocados, orden = self.arco, self.tocados, self.orden
+        dist[origen] = 0.0
+        tocados.append(origen)
+        heap = [(0.0, origen)]
+        asentados = 0
+        while heap:
+            d, u = heappop(heap)
+            if cerrado[u]:
+                continue
+            cerrado[u] = True
+            orden.append(u)
+            asentados += 1
+            if u == destino:
+                break
+            if faltan and u in objetivos:
+                faltan -= 1
+                if not faltan:
+                    break
+            tu = tiempo[u]
+            for i in range(offsets[u], offsets[u + 1]):
+                v = destinos[i]
+                if cerrado[v]:
+                    continue
+                nd = d + distancia[i]
+                if nd < dist[v]:
+                    if dist[v] == INF:
+                        tocados.append(v)
+                    dist[v] = nd
+                    pred[v] = u
+                    arco[v] = i
+                    tiempo[v] = tu + eta[i]
+                    heappush(heap, (nd, v))
+        self.asentados = asentados
+
+    def arbol(self):
+        """Copia del árbol de caminos de la última búsqueda (los buffers se reutilizan)"""
+        return ArbolCaminos(self.csr, list(self.orden), list(self.dist), list(self.pred),
+                            list(self.arco), list(self.tiempo))
+
+    def camino(self, destino):
+        """Ids del camino desde el origen de la última búsqueda hasta destino"""
+        if self.dist[destino] == INF:
+            return None
+        path = []
+        pred = self.pred
+        v = destino
+        while v != -1:
+            path.append(v)
+            v = pred[v]
+        path.reverse()
+        return path
+
+
+class MotorDijkstraBidireccional:
+    """
+    Dijkstra bidireccional punto a punto: una búsqueda hacia adelante desde el origen y otra
+    sobre el grafo invertido desde el destino, que se encuentran en el medio. Siempre avanza
+    el lado con la menor distancia en su cola y se detiene cuando la suma de ambos frentes
+    alcanza la mejor distancia encontrada.
+    """
+    def __init__(self, csr):
+        self.adelante = MotorDijkstra(csr)
+        self.atras = MotorDijkstra(csr.invertido())
+        self.asentados = 0
+
+    def buscar(self, origen, destino):
+        """:return: (distancia, tiempo, camino en ids) o (INF, INF, None) si no hay camino"""
+        motores = (self.adelante, self.atras)
+        for motor, inicio in zip(motores, (origen, destino)):
+            motor._limpiar()
+            motor.dist[inicio] = 0.0
+            motor.tocados.append(inicio)
+        self.asentados = 0
+        if origen == destino:
+            return 0.0, 0.0, [origen]
+        heaps = ([(0.0, origen)], [(0.0, destino)])
+        mejor = INF
+        encuentro = None
+        asentados = 0
+        while heaps[0] and heaps[1]:
+            if heaps[0][0][0] + heaps[1][0][0] >= mejor:
+                break
+            lado = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            motor, otro, heap = motores[lado], motores[1 - lado], heaps[lado]
+            d, u = heappop(heap)
+            if motor.cerrado[u]:
+                continue
+            motor.cerrado[u] = True
+            asentados += 1
+            offsets, destinos, distancia, eta = motor.csr.listas()
+            dist, pred, tiempo, cerrado = motor.dist, motor.pred, motor.tiempo, motor.cerrado
+            dist_otro = otro.dist
+            tu = tiempo[u]
+            for i in range(offsets[u], offsets[u + 1]):
+                v = destinos[i]
+                nd = d + distancia[i]
+                if dist_otro[v] < INF and nd + dist_otro[v] < mejor:
+                    mejor = nd + dist_otro[v]
+                    encuentro = (lado, u, v, eta[i])
+                if cerrado[v]:
+                    continue
+                if nd < dist[v]:
+                    if dist[v] == INF:
+                        motor.tocados.append(v)
+                    dist[v] = nd
+                    pred[v] = u
+                    tiempo[v] = tu + eta[i]
+                    heappush(heap, (nd, v))
+        self.asentados = asentados
+        if encuentro is None:
+            return INF, INF, None
+        lado, u, v, eta_arco = encuentro
+        if lado == 1:
+            u, v = v, u  # el arco u->v del grafo invertido es v->u en el original
+        f, b = self.adelante, self.atras
+        camino = f.camino(u) + b.camino(v)[::-1]
+        return mejor, f.tiempo[u] + eta_arco + b.tiempo[v], camino
+
+
+class ArbolCaminos:
+    """
+    Árbol de caminos más cortos desde un origen, por ids del CSR: distancia, predecesor y arco
+    de llegada de cada nodo, y los nodos alcanzados en un orden en que cada uno va después de
+    su predecesor. Cualquier métrica de arco se acumula en una sola pasada en ese orden y los
+    caminos se reconstruyen solo cuando se piden.
+    """
+    def __init__(self, csr, orden, dist, pred, arco, tiempo=None):
+        self.csr = csr
+        self.orden = orden
+        self.dist = dist
+        self.pred = pred
+        self.arco = arco
+        self.tiempo = tiempo if tiempo is not None else self.acumular(csr.eta)
+
+    @classmethod
+    def desde_predecesores(cls, csr, origen, dist, pred, arco=None):
+        """
+        Árbol a partir de distancias y predecesores por id (-1 sin predecesor). Si no se da el
+        arco de llegada de cada nodo se toma el de menor distancia entre el predecesor y el nodo.
+        """
+        offsets, destinos, distancia, _ = csr.listas()
+        hijos = {}
+        buscar_arco = arco is None
+        if buscar_arco:
+            arco = [-1] * csr.n
+        for v, u in enumerate(pred):
+            if u == -1 or v == origen:
+                continue
+            hijos.setdefault(u, []).append(v)
+            if buscar_arco:
+                arco[v] = min((i for i in range(offsets[u], offsets[u + 1]) if destinos[i] == v),
+                              key=distancia.__getitem__)
+        orden = [origen]
+        pendientes = deque(orden)
+        while pendientes:
+            for v in hijos.get(pendientes.popleft(), ()):
+                orden.append(v)
+                pendientes.append(v)
+        return cls(csr, orden, dist, pred, arco)
+
+    @property
+    def origen(self):
+        return self.orden[0]
+
+    def acumular(self, valor_arco):
+        """Suma valor_arco (un valor por arco del CSR) desde el origen hasta cada nodo"""
+        valor_arco = list(valor_arco)
+        total = [0.0] * len(self.dist)
+        pred, arco = self.pred, self.arco
+        for v in self.orden[1:]:
+            total[v] = total[pred[v]] + valor_arco[arco[v]]
+        return total
+
+    def camino_ids(self, destino):
+        if self.dist[destino] == INF:
+            return None
+        path = [destino]
+        origen, pred = self.origen, self.pred
+        while path[-1] != origen:
+            path.append(pred[path[-1]])
+        path.reverse()
+        return path
+
+    def camino(self, destino):
+        ids = self.camino_ids(self.csr.indice[destino])
+        return None if ids is None else [self.csr.nodos[i] for i in ids]
+
+    def vistas(self):
+        """(distancias, rutas, tiempos) por nombre, solo con los nodos alcanzados; rutas es perezosa"""
+        nodos = self.csr.nodos
+        distancias = {nodos[v]: self.dist[v] for v in self.orden}
+        tiempos = {nodos[v]: self.tiempo[v] for v in self.orden}
+        return distancias, _RutasArbol(self), tiempos
+
+
+class _RutasArbol(Mapping):
+    """rutas[destino] arma el camino al consultarlo; rutas.arbol da acceso al arreglo de predecesores"""
+    def __init__(self, arbol):
+        self.arbol = arbol
+        self._alcanzados = {arbol.csr.nodos[v] for v in arbol.orden}
+
+    def __getitem__(self, destino):
+        if destino not in self._alcanzados:
+            raise KeyError(destino)
+        return self.arbol.camino(destino)
+
+    def __contains__(self, destino):
+        return destino in self._alcanzados
+
+    def __iter__(self):
+        nodos = self.arbol.csr.nodos
+        return (nodos[v] for v in self.arbol.orden)
+
+    def __len__(self):
+        return len(self.arbol.orden)
+
+
+def obtener_motor(csr, clase=MotorDijkstra):
+    """Motor reutilizable por grafo y por hilo (los buffers no se pueden compartir entre hilos)"""
+    motores = csr.motores
+    clave = (clase, threading.get_ident())
+    if clave not in motores:
+        motores[clave] = clase(csr)
+    return motores[clave]
+
+
+def ids_de(csr, *nodos):
+    """Traduce nombres de nodos a ids del CSR, con el mismo error que networkx si no existen"""
     try:
-        path = nx.dijkstra_path(G, origen, destino, weight='distancia')
-        distancia = nx.dijkstra_path_length(G, origen, destino, weight='distancia')
-        tiempo = sum(G[path[i]][path[i+1]]['eta'] for i in range(len(path)-1))
-        return path, distancia, tiempo, "Dijkstra"
-    except nx.NetworkXNoPath:
+        return [csr.indice[n] for n in nodos]
+    except KeyError as e:
+        raise nx.NodeNotFound(f"Node {e.args[0]} not in G")
+
+
+def shortest_path_dijkstra(G, origen, destino, bidireccional=False):
+    """Camino más corto de origen a destino usando Dijkstra (opcionalmente bidireccional)"""
+    csr = obtener_csr(G)
+    s, t = ids_de(csr, origen, destino)
+    if bidireccional:
+        distancia, tiempo, ids = obtener_motor(csr, MotorDijkstraBidireccional).buscar(s, t)
+    else:
+        motor = obtener_motor(csr)
+        motor.buscar(s, t)
+        ids = motor.camino(t)
+        distancia, tiempo = motor.dist[t], motor.tiempo[t]
+    if ids is None:
         return None, float('inf'), float('inf'), "Dijkstra"
+    path = [csr.nodos[i] for i in ids]
+    return path, distancia, tiempo, "Dijkstra"
+
+def arbol_caminos_dijkstra(G, origen):
+    """ArbolCaminos desde origen con una búsqueda completa de Dijkstra"""
+    csr = obtener_csr(G)
+    s, = ids_de(csr, origen)
+    motor = obtener_motor(csr)
+    motor.buscar(s)
+    return motor.arbol()
 
 def shortest_paths_from_source_dijkstra(G, origen):
     """Caminos más cortos desde origen a todos los nodos usando Dijkstra"""
     try:
-        length, paths = nx.single_source_dijkstra(G, origen, weight='distancia')
-        tiempos = {}
-        for destino in paths:
-            if destino == origen:
-                tiempos[destino] = 0
-            else:
-                tiempo = sum(G[paths[destino][i]][paths[destino][i+1]]['eta'] for i in range(len(paths[destino])-1))
-                tiempos[destino] = tiempo
+        # El ETA se acumula durante la búsqueda; los caminos se arman solo al consultarlos
+        length, paths, tiempos = arbol_caminos_dijkstra(G, origen).vistas()
         return length, paths, tiempos, "Dijkstra"
     except Exception as e:
         print(e)
         return {}, {}, {}, "Dijkstra"
-
-    
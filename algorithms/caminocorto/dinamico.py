@@ -0,0 +1,306 @@
+from heapq import heappop, heappush
+
+import networkx as nx
+import numpy as np
+
+from algorithms.grafo_csr import marcar_modificado, obtener_csr, registrar_csr
+from algorithms.caminocorto.dijkstra import INF, ArbolCaminos
+from algorithms.caminocorto.todos_pares import TablaTodosPares, trasladar_resultados
+
+
+class Edicion:
+    """
+    Cambios de una edición del grafo a nivel de arcos del CSR: el CSR anterior y el nuevo,
+    mapa[arco anterior] = arco nuevo (-1 si se quitó) y, por arco cambiado,
+    (arco anterior, u, v, (distancia, eta) antes, (distancia, eta) después o None si se quitó).
+    """
+    def __init__(self, csr_anterior, csr, mapa, arcos):
+        self.csr_anterior = csr_anterior
+        self.csr = csr
+        self.mapa = mapa
+        self.arcos = arcos
+
+
+def editar_aristas(G, cambios):
+    """
+    Aplica a G cambios de pesos o cierres de aristas y deja listo el CSR de la nueva versión
+    sin reconstruirlo desde networkx. Los resultados memorizados (árboles de un origen y tablas
+    de todos los pares) se reparan y pasan a la nueva versión en vez de descartarse.
+    cambios: {(u, v): {'distancia': ..., 'eta': ...}} (se puede dar solo uno de los dos)
+    o {(u, v): None} para quitar la arista.
+    :return: Edicion, para reparar con ella árboles de caminos ya calculados (reparar_arbol)
+    """
+    csr_anterior = obtener_csr(G)
+    por_arco = {}
+    arcos = []
+    for (u, v), pesos in cambios.items():
+        if not G.has_edge(u, v):
+            raise nx.NetworkXError(f"The edge {u}-{v} is not in the graph.")
+        datos = G[u][v]
+        antes = (datos.get('distancia', 1), datos.get('eta', 0))
+        despues = None if pesos is None else (pesos.get('distancia', antes[0]), pesos.get('eta', antes[1]))
+        a, b = csr_anterior.indice[u], csr_anterior.indice[v]
+        sentidos = [(a, b)] if csr_anterior.dirigido else [(a, b), (b, a)]
+        for x, y in sentidos:
+            for i in csr_anterior.arcos_entre(x, y):
+                por_arco[i] = despues
+                arcos.append((i, x, y, antes, despues))
+        if pesos is None:
+            G.remove_edge(u, v)
+        else:
+            datos.update({'distancia': despues[0], 'eta': despues[1]})
+    marcar_modificado(G)
+    csr, mapa = csr_anterior.con_cambios(por_arco)
+    registrar_csr(G, csr)
+    edicion = Edicion(csr_anterior, csr, mapa, arcos)
+    trasladar_resultados(csr_anterior, csr, lambda valor: _reparar_memorizado(valor, edicion))
+    return edicion
+
+
+def editar_arista(G, u, v, distancia=None, eta=None):
+    pesos = {k: w for k, w in (('distancia', distancia), ('eta', eta)) if w is not None}
+    return editar_aristas(G, {(u, v): pesos})
+
+
+def cerrar_arista(G, u, v):
+    return editar_aristas(G, {(u, v): None})
+
+
+def _reparar_memorizado(valor, edicion):
+    """
+    Los resultados memorizados son una TablaTodosPares o un ArbolCaminos. :return: el valor
+    reparado o None
+    """
+    if not _sin_negativos(edicion.csr):
+        return None
+    if isinstance(valor, TablaTodosPares):
+        return valor if reparar_tabla(valor, edicion) else None
+    if isinstance(valor, ArbolCaminos):
+        return reparar_arbol(valor, edicion)
+    return None
+
+
+def _reparar(csr, dist, pred, invalidos, bajadas, tolerancia=0.0):
+    """
+    Núcleo común de la reparación de un árbol de caminos (dist y pred por id, en su lugar).
+    invalidos: nodos cuyo camino usaba un arco que se cerró o subió; se vuelven a conectar
+    desde los vecinos que no cambiaron. bajadas: (arco nuevo, u, v, distancia) de los arcos
+    que bajaron; si mejoran a v la mejora se propaga desde ahí. Luego una cola de prioridad
+    asienta solo los nodos cuya distancia cambió. tolerancia: mejora relativa mínima para
+    contar como cambio (las tablas en float32 tienen error de redondeo).
+    :return: ({nodo: arco de llegada o -1 si hay que buscarlo}, nodos asentados en orden)
+    """
+    offsets, destinos, distancia, _ = csr.listas()
+    factor = 1.0 - tolerancia
+    cambiados = {}
+    for x in invalidos:
+        dist[x] = INF
+        pred[x] = -1
+        cambiados[x] = -1
+    heap = []
+    # Los arcos de entrada de x son los de salida de x en el CSR invertido
+    inv_offsets, inv_destinos, inv_distancia, _ = csr.invertido().listas()
+    for x in invalidos:
+        for j in range(inv_offsets[x], inv_offsets[x + 1]):
+            y = inv_destinos[j]
+            nd = dist[y] + inv_distancia[j]
+            if nd < dist[x] and y not in invalidos:
+                dist[x] = nd
+                pred[x] = y
+        if dist[x] < INF:
+            heappush(heap, (dist[x], x))
+    for i, u, v, w in bajadas:
+        nd = dist[u] + w
+        if nd < dist[v] * factor:
+            dist[v] = nd
+            pred[v] = u
+            cambiados[v] = i
+            heappush(heap, (nd, v))
+
+    asentados = []
+    while heap:
+        d, u = heappop(heap)
+        if d > dist[u]:
+            continue
+        asentados.append(u)
+        for i in range(offsets[u], offsets[u + 1]):
+            v = destinos[i]
+            nd = d + distancia[i]
+            if nd < dist[v] * factor:
+                dist[v] = nd
+                pred[v] = u
+                cambiados[v] = i
+                heappush(heap, (nd, v))
+    return cambiados, asentados
+
+
+def _bajadas(edicion):
+    return [(int(edicion.mapa[i]), u, v, despues[0]) for i, u, v, antes, despues in edicion.arcos
+            if despues is not None and despues[0] < antes[0]]
+
+
+def _sin_negativos(csr):
+    return not csr.m or csr.distancia.min() >= 0
+
+
+def _eta_por_par(csr):
+    """{u * n + v: eta del arco u->v de menor distancia}"""
+    claves = csr.origenes().astype(np.int64) * csr.n + csr.destinos
+    orden = np.lexsort((csr.distancia, claves))
+    primero = np.ones(len(orden), dtype=bool)
+    primero[1:] = claves[orden][1:] != claves[orden][:-1]
+    elegidos = orden[primero]
+    return dict(zip(claves[elegidos].tolist(), csr.eta[elegidos].tolist()))
+
+
+def _pasan_por(pred, filas, arcos):
+    """
+    marca[r, x]: el camino de filas[r] a x en el árbol pred[r] usa alguno de los arcos (u, v).
+    Se marca la cabeza v de cada arco del árbol y la marca baja a los descendientes con
+    duplicación de punteros, como en acumular_por_predecesores.
+    """
+    k, n = pred.shape
+    marca = np.zeros((k, n), dtype=bool)
+    for u, v in arcos:
+        marca[:, v] |= pred[:, v] == u
+    # Índices planos: el salto de (r, x) es r * n + pred[r, x] (el origen apunta a sí mismo)
+    base = (np.arange(k, dtype=np.int64) * n)[:, None]
+    salto = (np.where(pred >= 0, pred, np.asarray(filas)[:, None]) + base).ravel()
+    marca = marca.ravel()
+    while True:
+        marca |= marca[salto]
+        siguiente = salto[salto]
+        if np.array_equal(siguiente, salto):
+            return marca.reshape(k, n)
+        salto = siguiente
+
+
+def reparar_tabla(tabla, edicion):
+    """
+    Actualiza en su lugar una TablaTodosPares de la versión anterior del grafo. En cada fila
+    (árbol de caminos desde un origen) solo se repara lo afectado: el subárbol que colgaba de un
+    arco cerrado o más largo y lo que mejora a través de un arco más corto; el ETA se vuelve a
+    acumular solo en esos nodos. Con distancias negativas devuelve False (hay que recalcular).
+    """
+    csr = edicion.csr
+    if not _sin_negativos(csr):
+        return False
+    n = csr.n
+    bajadas = _bajadas(edicion)
+    tolerancia = 16 * float(np.finfo(tabla.tipo_valores).eps)
+    usados, subieron = [], []
+    en_arbol, mejoran = set(), set()
+    for _, u, v, antes, despues in edicion.arcos:
+        usados.append((u, v))
+        if despues is None or despues[0] > antes[0]:
+            subieron.append((u, v))
+        en_arbol.update(np.flatnonzero(tabla.pred[:, v] == u).tolist())
+    for _, u, v, w in bajadas:
+        mejora = tabla.columna_distancias(u) + w < tabla.columna_distancias(v) * (1 - tolerancia)
+        mejoran.update(np.flatnonzero(mejora).tolist())
+    filas = sorted(en_arbol | mejoran)
+    if not filas:
+        return True
+
+    # Todas las filas se leen antes de escribir: en la forma triangular cada fila ve columnas de otras
+    D, T, P = tabla.filas(filas)
+    con_arco = [r for r, i in enumerate(filas) if i in en_arbol]
+    usan = invalidan = None
+    if con_arco:
+        usan = _pasan_por(P[con_arco].astype(np.int64), [filas[r] for r in con_arco], usados)
+        invalidan = _pasan_por(P[con_arco].astype(np.int64), [filas[r] for r in con_arco], subieron) \
+            if subieron != usados else usan
+    posicion = {r: k for k, r in enumerate(con_arco)}
+    eta = _eta_por_par(csr)
+    cambios = []
+    for r, i in enumerate(filas):
+        dist, tiempo, pred = D[r].tolist(), T[r].tolist(), P[r].tolist()
+        invalidos, con_eta = set(), []
+        if r in posicion:
+            invalidos = set(np.flatnonzero(invalidan[posicion[r]]).tolist())
+            con_eta = np.flatnonzero(usan[posicion[r]]).tolist()
+        cambiados, _ = _reparar(csr, dist, pred, invalidos, bajadas, tolerancia)
+        cambiados = set(cambiados).union(con_eta)
+        if not cambiados:
+            continue
+        listos = _acumular_tiempos(tiempo, pred, cambiados, eta, n, i if tabla.triangular else 0)
+        columnas = sorted(listos)
+        cambios.append((i, columnas, [dist[x] for x in columnas], [tiempo[x] for x in columnas],
+                        [pred[x] for x in columnas]))
+    for cambio in cambios:
+        tabla.actualizar_fila(*cambio)
+    return True
+
+
+def _acumular_tiempos(tiempo, pred, cambiados, eta, n, ajenos=0):
+    """
+    ETA de los nodos cambiados, siguiendo su predecesor hasta uno que no cambió.
+    eta: {u * n + v: eta del arco}. ajenos: los nodos x < ajenos tienen el ETA de otro camino
+    (la fila de x en una tabla triangular, quizás otro de igual distancia) y también se recalculan.
+    :return: los nodos recalculados
+    """
+    listos = set()
+    for x in cambiados:
+        cadena = []
+        while x != -1 and x not in listos and (x in cambiados or x < ajenos):
+            cadena.append(x)
+            x = pred[x]
+        for y in reversed(cadena):
+            u = pred[y]
+            tiempo[y] = tiempo[u] + eta[u * n + y] if u != -1 else 0.0
+            listos.add(y)
+    return listos
+
+
+def reparar_arbol(arbol, edicion):
+    """
+    Árbol de caminos del mismo origen sobre el CSR nuevo, sin repetir la búsqueda completa:
+    si un arco del árbol se cerró o subió de distancia su subárbol se vuelve a conectar, y si
+    un arco bajó y mejora a su destino la mejora se propaga desde ahí. El orden del árbol es el
+    anterior sin los nodos que cambiaron, seguido de estos en el orden en que se asentaron.
+    """
+    csr = edicion.csr
+    if not _sin_negativos(csr):
+        raise ValueError("El árbol no se puede reparar con distancias negativas; hay que recalcularlo")
+    offsets, destinos, distancia, eta = csr.listas()
+    dist = list(arbol.dist)
+    pred = list(arbol.pred)
+    tiempo = list(arbol.tiempo)
+    anteriores = np.asarray(arbol.arco, dtype=np.int64)
+    arco = np.full(len(anteriores), -1, dtype=np.int64)
+    if len(edicion.mapa):
+        # Solo se traducen los arcos válidos (-1 en el origen y en los nodos sin alcanzar)
+        validos = anteriores >= 0
+        arco[validos] = edicion.mapa[anteriores[validos]]
+    arco = arco.tolist()
+
+    # Arcos del árbol que cambiaron: su subárbol se invalida (si se cerraron o subieron) o solo cambia de ETA
+    raices = [(v, despues is None or despues[0] > antes[0])
+              for i, _, v, antes, despues in edicion.arcos if arbol.pred[v] != -1 and arbol.arco[v] == i]
+    invalidos, con_eta = set(), set()
+    if raices:
+        hijos = {}
+        for v in arbol.orden[1:]:
+            hijos.setdefault(pred[v], []).append(v)
+        for v, invalida in raices:
+            marcados = invalidos if invalida else con_eta
+            pendientes = [v]
+            while pendientes:
+                x = pendientes.pop()
+                if x not in marcados:
+                    marcados.add(x)
+                    pendientes.extend(hijos.get(x, ()))
+    cambiados, asentados = _reparar(csr, dist, pred, invalidos, _bajadas(edicion))
+    for x, i in cambiados.items():
+        if i == -1 and pred[x] != -1:
+            u = pred[x]
+            i = min((j for j in range(offsets[u], offsets[u + 1]) if destinos[j] == x), key=distancia.__getitem__)
+        arco[x] = i
+    orden = [v for v in arbol.orden if v not in cambiados] + asentados
+    for v in orden if con_eta or cambiados else ():
+        if v in cambiados or v in con_eta:
+            tiempo[v] = tiempo[pred[v]] + eta[arco[v]] if pred[v] != -1 else 0.0
+    for x in cambiados:
+        if dist[x] == INF:
+            tiempo[x] = 0.0
+    return ArbolCaminos(csr, orden, dist, pred, arco, tiempo)
@@ -1,38 +1,51 @@
-import networkx as nx
+import numpy as np
+
+from algorithms.grafo_csr import obtener_csr
+from algorithms.caminocorto.todos_pares import TablaTodosPares, acumular_por_predecesores, matriz_adyacencia
 
-def shortest_paths_floyd_warshall(G):
-    """Calcula todos los caminos más cortos usando Floyd-Warshall"""
-    try:
-        # Diccionario de diccionarios con distancias mínimas
-        distancias = dict(nx.floyd_warshall(G, weight='distancia'))
-        # Diccionario con caminos más cortos
-        caminos = dict(nx.floyd_warshall_predecessor_and_distance(G, weight='distancia')[0])
 
-        # Reconstruir caminos
-        rutas = {}
-        for u in distancias:
-            rutas[u] = {}
-            for v in distancias[u]:
-                if u == v:
-                    rutas[u][v] = [u]
-                elif v in caminos[u]:
-                    path = []
-                    actual = v
-                    while actual != u:
-                        path.insert(0, actual)
-                        actual = caminos[u][actual]
-                    path.insert(0, u)
-                    rutas[u][v] = path
+def floyd_warshall_matrices(G, bloque=64, compacta=False):
+    """
+    Floyd-Warshall sobre matrices de numpy. Por cada pivote k se relaja toda la matriz con
+    D[i, j] = min(D[i, j], D[i, k] + D[k, j]) y P[i, j] = P[k, j] donde mejora.
+    bloque: filas por bloque en cada pivote, para que los temporales quepan en caché y se
+    salten los bloques sin camino hacia k (None actualiza la matriz completa de una vez).
+    El ETA se calcula al final siguiendo la matriz de predecesores.
+    compacta: resultado en float32 (y triangular si el grafo no es dirigido), ver TablaTodosPares.compactar.
+    :return: TablaTodosPares
+    """
+    csr = obtener_csr(G)
+    n = csr.n
+    D, eta, P = matriz_adyacencia(csr)
+    bloque = bloque or max(n, 1)
+    inicios = np.arange(0, n, bloque)
+    for k in range(n):
+        fila_k = D[k]
+        columna_k = D[:, k]
+        alcanza_k = columna_k < np.inf
+        alcanza_k[k] = False
+        if not alcanza_k.any() or not (fila_k < np.inf).any():
+            continue
+        bloques_activos = np.add.reduceat(alcanza_k, inicios) > 0
+        pred_k = P[k]
+        for b in np.flatnonzero(bloques_activos):
+            i0 = inicios[b]
+            i1 = min(i0 + bloque, n)
+            candidato = columna_k[i0:i1, None] + fila_k[None, :]
+            mejora = candidato < D[i0:i1]
+            if mejora.any():
+                np.copyto(D[i0:i1], candidato, where=mejora)
+                np.copyto(P[i0:i1], np.broadcast_to(pred_k, mejora.shape), where=mejora)
+    T = acumular_por_predecesores(P, eta)
+    tabla = TablaTodosPares(csr.nodos, D, T, P, "Floyd-Warshall")
+    return tabla.compactar(triangular=not csr.dirigido) if compacta else tabla
 
-        # Calcular tiempos
-        tiempos = {}
-        for u in rutas:
-            tiempos[u] = {}
-            for v in rutas[u]:
-                path = rutas[u][v]
-                tiempo = sum(G[path[i]][path[i+1]]['eta'] for i in range(len(path)-1)) if len(path) > 1 else 0
-                tiempos[u][v] = tiempo
 
+def shortest_paths_floyd_warshall(G, compacta=False):
+    """Calcula todos los caminos más cortos usando Floyd-Warshall"""
+    try:
+        # Vistas de diccionario de diccionarios sobre las matrices; los caminos se arman al consultarlos
+        distancias, rutas, tiempos = floyd_warshall_matrices(G, compacta=compacta).vistas()
         return distancias, rutas, tiempos, "Floyd-Warshall"
     except Exception as e:
         print("Error en Floyd-Warshall:", e)
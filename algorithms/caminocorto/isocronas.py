@@ -0,0 +1,97 @@
+from heapq import heappop, heappush
+
+from algorithms.grafo_csr import obtener_csr
+from algorithms.caminocorto.dijkstra import INF, ids_de, obtener_motor
+
+PESOS = ("eta", "distancia")
+
+
+class MotorIsocrona:
+    """
+    Dijkstra acotado para isócronas: minimiza el peso elegido ('eta' o 'distancia') y no
+    encola ningún nodo cuyo costo supere el límite, así que solo recorre la vecindad que se
+    alcanza dentro del presupuesto. Lleva también el acumulado de la otra métrica.
+    Los buffers se reutilizan entre consultas como en MotorDijkstra.
+    """
+    def __init__(self, csr):
+        self.csr = csr
+        n = csr.n
+        self.costo = [INF] * n
+        self.otro = [0.0] * n
+        self.pred = [-1] * n
+        self.cerrado = [False] * n
+        self.tocados = []
+        self.alcanzados = []
+
+    def _limpiar(self):
+        costo, otro, pred, cerrado = self.costo, self.otro, self.pred, self.cerrado
+        for v in self.tocados:
+            costo[v] = INF
+            otro[v] = 0.0
+            pred[v] = -1
+            cerrado[v] = False
+        self.tocados = []
+        self.alcanzados = []
+
+    def buscar(self, origen, limite, peso="eta"):
+        """Deja en alcanzados los ids con costo <= limite, en orden de llegada"""
+        if peso not in PESOS:
+            raise ValueError(f"Peso de isócrona desconocido: {peso}")
+        self._limpiar()
+        offsets, destinos, distancia, eta = self.csr.listas()
+        principal, secundario = (eta, distancia) if peso == "eta" else (distancia, eta)
+        costo, otro, pred, cerrado = self.costo, self.otro, self.pred, self.cerrado
+        tocados, alcanzados = self.tocados, self.alcanzados
+        costo[origen] = 0.0
+        tocados.append(origen)
+        heap = [(0.0, origen)]
+        while heap:
+            c, u = heappop(heap)
+            if cerrado[u]:
+                continue
+            cerrado[u] = True
+            alcanzados.append(u)
+            ou = otro[u]
+            for i in range(offsets[u], offsets[u + 1]):
+                v = destinos[i]
+                nc = c + principal[i]
+                if nc > limite or cerrado[v]:
+                    continue
+                if nc < costo[v]:
+                    if costo[v] == INF:
+                        tocados.append(v)
+                    costo[v] = nc
+                    otro[v] = ou + secundario[i]
+                    pred[v] = u
+                    heappush(heap, (nc, v))
+
+    def resultado(self, peso="eta"):
+        """{nodo: {'distancia', 'eta', 'pred'}} de la última búsqueda, por nombre y en orden de llegada"""
+        nodos = self.csr.nodos
+        resultado = {}
+        for v in self.alcanzados:
+            c, o = self.costo[v], self.otro[v]
+            distancia, eta = (o, c) if peso == "eta" else (c, o)
+            p = self.pred[v]
+            resultado[nodos[v]] = {'distancia': distancia, 'eta': eta, 'pred': nodos[p] if p != -1 else None}
+        return resultado
+
+
+def isocronas(G, origenes, limite, peso="eta"):
+    """
+    Nodos alcanzables desde cada origen sin pasar el límite de peso ('eta' en minutos o
+    'distancia' en km). :return: {origen: {nodo: {'distancia', 'eta', 'pred'}}}
+    """
+    csr = obtener_csr(G)
+    ids = ids_de(csr, *origenes)
+    motor = obtener_motor(csr, MotorIsocrona)
+    resultados = {}
+    for origen, s in zip(origenes, ids):
+        motor.buscar(s, limite, peso)
+        resultados[origen] = motor.resultado(peso)
+    return resultados
+
+
+def isocrona(G, origen, limite, peso="eta"):
+    """Isócrona de un solo origen: {nodo: {'distancia', 'eta', 'pred'}}"""
+    return isocronas(G, [origen], limite, peso)[origen]
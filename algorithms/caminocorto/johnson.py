@@ -1,30 +1,142 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
 import networkx as nx
+import numpy as np
 
-def shortest_paths_johnson(G):
-    """Devuelve los caminos más cortos entre todos los pares usando el algoritmo de Johnson."""
+from algorithms.grafo_csr import GrafoCSR, obtener_csr
+from algorithms.caminocorto.dijkstra import MotorDijkstra
+from algorithms.caminocorto.todos_pares import INF, TablaTodosPares
+
+
+def potenciales_johnson(csr):
+    """
+    Potenciales h de Johnson: Bellman-Ford desde un nodo virtual unido a todos con peso 0,
+    relajando todos los arcos a la vez. Con pesos no negativos termina en una pasada con h = 0.
+    """
+    u, v, w = csr.origenes(), csr.destinos, csr.distancia
+    h = np.zeros(csr.n)
+    for _ in range(csr.n + 1):
+        nuevo = h.copy()
+        np.minimum.at(nuevo, v, h[u] + w)
+        if np.array_equal(nuevo, h):
+            return h
+        h = nuevo
+    raise nx.NetworkXUnbounded("Negative cycle detected.")
+
+
+def _compartir(arreglo, memorias):
+    """Copia el arreglo a memoria compartida; devuelve cómo abrirlo en otro proceso y la vista local"""
+    memoria = shared_memory.SharedMemory(create=True, size=max(arreglo.nbytes, 1))
+    memorias.append(memoria)
+    vista = np.ndarray(arreglo.shape, arreglo.dtype, buffer=memoria.buf)
+    vista[...] = arreglo
+    return (memoria.name, arreglo.shape, arreglo.dtype.str), vista
+
+
+def _abrir(descriptor, memorias):
+    nombre, forma, tipo = descriptor
+    memoria = shared_memory.SharedMemory(name=nombre)
+    memorias.append(memoria)
+    return np.ndarray(forma, np.dtype(tipo), buffer=memoria.buf)
+
+
+def _preparar(offsets, destinos, distancia, eta, h, D, T, P, dirigido):
+    """Motor de Dijkstra sobre el CSR repesado y las matrices donde escribir cada fila"""
+    csr = GrafoCSR(range(len(offsets) - 1), offsets, destinos, distancia, eta, None, dirigido)
+    return dict(motor=MotorDijkstra(csr), h=h, D=D, T=T, P=P)
+
+
+# Por debajo de esta cantidad de nodos el arranque del pool cuesta más que los Dijkstra
+# repartidos, así que por defecto se calcula en el mismo proceso
+MIN_NODOS_PROCESOS = 2000
+
+# Estado de cada proceso trabajador, armado una vez sobre la memoria compartida
+_TRABAJADOR = {}
+
+
+def _iniciar_trabajador(arreglos, dirigido):
+    memorias = []
+    _TRABAJADOR.update(_preparar(*(_abrir(d, memorias) for d in arreglos), dirigido))
+    _TRABAJADOR['memorias'] = memorias
+
+
+def _resolver_fuentes(fuentes, estado=None):
+    """Dijkstra repesado desde cada fuente; escribe su fila de distancia, ETA y predecesores"""
+    estado = estado or _TRABAJADOR
+    motor, h = estado['motor'], estado['h']
+    D, T, P = estado['D'], estado['T'], estado['P']
+    repesar = h.any()
+    for s in fuentes:
+        motor.buscar(s)
+        D[s] = motor.dist
+        T[s] = motor.tiempo
+        P[s] = motor.pred
+        if repesar:
+            D[s] += h - h[s]
+    return len(fuentes)
+
+
+def johnson_matrices(G, procesos=None, compacta=False):
+    """
+    Johnson de todos los pares: se repesa una sola vez con los potenciales y se corre un
+    Dijkstra por fuente, repartiendo las fuentes entre procesos. El CSR repesado y las
+    matrices de resultado viven en memoria compartida, así que no se copian por pickle.
+    procesos: cantidad de procesos (1 calcula en este proceso). Por defecto os.cpu_count(), o 1
+        si el grafo tiene menos de MIN_NODOS_PROCESOS nodos.
+    compacta: resultado en float32 (y triangular si el grafo no es dirigido), ver TablaTodosPares.compactar.
+    :return: TablaTodosPares
+    """
+    csr = obtener_csr(G)
+    n = csr.n
+    h = potenciales_johnson(csr)
+    repesado = csr.distancia + h[csr.origenes()] - h[csr.destinos]
+    if procesos is None:
+        procesos = (os.cpu_count() or 1) if n >= MIN_NODOS_PROCESOS else 1
+    procesos = min(procesos, max(n, 1))
+    entradas = [csr.offsets, csr.destinos, repesado, csr.eta, h,
+                np.full((n, n), INF), np.zeros((n, n)), np.full((n, n), -1, dtype=np.int32)]
+
+    if procesos == 1:
+        estado = _preparar(*entradas, csr.dirigido)
+        _resolver_fuentes(range(n), estado)
+        D, T, P = estado['D'], estado['T'], estado['P']
+    else:
+        D, T, P = _resolver_en_procesos(entradas, csr.dirigido, procesos)
+    tabla = TablaTodosPares(csr.nodos, D, T, P, "Johnson")
+    return tabla.compactar(triangular=not csr.dirigido) if compacta else tabla
+
+
+def _resolver_en_procesos(entradas, dirigido, procesos):
+    """Reparte las fuentes entre procesos que escriben en las matrices compartidas"""
+    n = len(entradas[0]) - 1
+    memorias, compartidos = [], []
     try:
-        # Aplicar el algoritmo de Johnson
-        paths = dict(nx.johnson(G, weight='distancia'))
-
-        distancias = {}
-        tiempos = {}
-
-        for origen in paths:
-            distancias[origen] = {}
-            tiempos[origen] = {}
-            for destino in paths[origen]:
-                path = paths[origen][destino]
-                if len(path) <= 1:
-                    distancias[origen][destino] = 0
-                    tiempos[origen][destino] = 0
-                else:
-                    distancia = sum(G[path[i]][path[i+1]]['distancia']
-                                    for i in range(len(path) - 1))
-                    tiempo = sum(G[path[i]][path[i+1]]['eta']
-                                 for i in range(len(path) - 1))
-                    distancias[origen][destino] = distancia
-                    tiempos[origen][destino] = tiempo
+        compartidos.extend(_compartir(a, memorias) for a in entradas)
+        # Bloques intercalados para que cada proceso reciba trabajo parecido
+        bloques = [range(i, n, procesos * 4) for i in range(min(procesos * 4, n))]
+        # spawn y no fork: quien llama puede tener hilos (la interfaz calcula en segundo plano)
+        # y un fork copiaría sus candados en cualquier estado
+        with ProcessPoolExecutor(procesos, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_iniciar_trabajador,
+                                 initargs=([d for d, _ in compartidos], dirigido)) as pool:
+            list(pool.map(_resolver_fuentes, bloques))
+        D, T, P = [vista.copy() for _, vista in compartidos[-3:]]
+    finally:
+        compartidos.clear()  # sin vistas vivas para poder cerrar la memoria
+        for memoria in memorias:
+            memoria.close()
+            memoria.unlink()
+    return D, T, P
 
+
+def shortest_paths_johnson(G, procesos=None, compacta=False):
+    """Devuelve los caminos más cortos entre todos los pares usando el algoritmo de Johnson."""
+    try:
+        # Mismas vistas que antes: solo los destinos alcanzables de cada origen
+        distancias, paths, tiempos = johnson_matrices(G, procesos, compacta).vistas(solo_alcanzables=True)
         return distancias, paths, tiempos, "Johnson"
 
     except nx.NetworkXError as e:
@@ -0,0 +1,65 @@
+import os
+
+import numpy as np
+
+from algorithms.grafo_csr import obtener_csr
+from algorithms.caminocorto.contraction_hierarchies import jerarquia_preprocesada, obtener_jerarquia
+from algorithms.caminocorto.dijkstra import INF, ids_de, obtener_motor
+
+
+def filas_od_dijkstra(csr, origenes, destinos):
+    """
+    Una búsqueda de Dijkstra por origen que termina en cuanto asentó todos los destinos.
+    Genera (fila, distancias, tiempos) por origen, con INF donde no hay camino.
+    """
+    motor = obtener_motor(csr)
+    objetivos = set(destinos)
+    for fila, s in enumerate(origenes):
+        motor.buscar(s, objetivos=objetivos)
+        dist, tiempo = motor.dist, motor.tiempo
+        yield fila, [dist[t] for t in destinos], [tiempo[t] if dist[t] < INF else INF for t in destinos]
+
+
+def _matriz_salida(salida, sufijo, forma):
+    if salida is None:
+        return np.full(forma, INF)
+    carpeta = os.path.dirname(os.path.abspath(salida))
+    os.makedirs(carpeta, exist_ok=True)
+    matriz = np.lib.format.open_memmap(f"{salida}_{sufijo}.npy", mode='w+', dtype=np.float64, shape=forma)
+    matriz[:] = INF
+    return matriz
+
+
+def matriz_od(G, origenes, destinos, metodo="auto", salida=None, path_jerarquia=None):
+    """
+    Matrices densas de distancia y ETA entre cada origen (filas) y cada destino (columnas).
+    metodo 'ch': cubetas sobre la jerarquía de contracción (se preprocesa una vez por grafo).
+    metodo 'dijkstra': un Dijkstra por origen con terminación al asentar todos los destinos.
+    metodo 'auto': 'ch' si la jerarquía ya está preprocesada, si no 'dijkstra' (el preproceso
+    solo se paga cuando se pide 'ch' explícitamente).
+    salida: prefijo de archivo; las matrices se escriben fila por fila en <salida>_distancia.npy
+    y <salida>_eta.npy (arreglos en disco con np.load(..., mmap_mode='r')) en vez de en memoria.
+    :return: (distancias, tiempos)
+    """
+    csr = obtener_csr(G)
+    s_ids = ids_de(csr, *origenes)
+    t_ids = ids_de(csr, *destinos)
+    if metodo == "auto":
+        metodo = "ch" if jerarquia_preprocesada(csr) else "dijkstra"
+    if metodo == "ch":
+        filas = obtener_jerarquia(G, path_jerarquia).filas_muchos_a_muchos(s_ids, t_ids)
+    elif metodo == "dijkstra":
+        filas = filas_od_dijkstra(csr, s_ids, t_ids)
+    else:
+        raise ValueError(f"Método de matriz OD desconocido: {metodo}")
+
+    forma = (len(s_ids), len(t_ids))
+    distancias = _matriz_salida(salida, "distancia", forma)
+    tiempos = _matriz_salida(salida, "eta", forma)
+    for fila, dist, tiempo in filas:
+        distancias[fila] = dist
+        tiempos[fila] = tiempo
+    if salida is not None:
+        distancias.flush()
+        tiempos.flush()
+    return distancias, tiempos
@@ -0,0 +1,356 @@
+import threading
+from collections.abc import Mapping
+
+import numpy as np
+
+from algorithms.grafo_csr import obtener_csr
+
+INF = float('inf')
+
+
+def matriz_adyacencia(csr, peso='distancia'):
+    """
+    Matriz densa de pesos (inf sin arista, 0 en la diagonal) con el ETA del arco elegido y
+    la matriz de predecesores inicial. Si hay arcos paralelos se queda el de menor peso.
+    """
+    n = csr.n
+    u, v = csr.origenes(), csr.destinos
+    w = getattr(csr, peso)
+    # Un arco por par (u, v): el de menor peso
+    claves = u.astype(np.int64) * n + v
+    orden = np.lexsort((w, claves))
+    primero = np.ones(len(orden), dtype=bool)
+    primero[1:] = claves[orden][1:] != claves[orden][:-1]
+    elegidos = orden[primero]
+    elegidos = elegidos[u[elegidos] != v[elegidos]]
+
+    dist = np.full((n, n), INF)
+    np.fill_diagonal(dist, 0.0)
+    eta = np.zeros((n, n))
+    pred = np.full((n, n), -1, dtype=np.int32)
+    dist[u[elegidos], v[elegidos]] = w[elegidos]
+    eta[u[elegidos], v[elegidos]] = csr.eta[elegidos]
+    pred[u[elegidos], v[elegidos]] = u[elegidos]
+    return dist, eta, pred
+
+
+def acumular_por_predecesores(pred, valor_arco, filas=None):
+    """
+    Suma valor_arco a lo largo del camino de cada par (i, j) descrito por la matriz de
+    predecesores, con duplicación de punteros: en cada paso cada par salta al inicio de su
+    segmento ya sumado, así que bastan log2(largo del camino) pasadas vectorizadas.
+    filas: ids de origen de cada fila de pred (por defecto 0..n-1).
+    """
+    k, n = pred.shape
+    filas = np.arange(k) if filas is None else np.asarray(filas)
+    origen = filas[:, None]
+    columnas = np.arange(n)[None, :]
+    renglon = np.arange(k)[:, None]
+    inicio = np.where(pred >= 0, pred, origen)
+    total = np.where(pred >= 0, valor_arco[inicio, columnas], 0.0)
+    while True:
+        activos = inicio != origen
+        if not activos.any():
+            return total
+        total = total + np.where(activos, total[renglon, inicio], 0.0)
+        inicio = np.where(activos, inicio[renglon, inicio], inicio)
+
+
+class MatrizTriangular:
+    """
+    Matriz simétrica n x n guardada como su triángulo superior empaquetado por filas:
+    n(n+1)/2 valores en vez de n². Se indexa igual que la matriz, m[i, j], y m.fila(i).
+    """
+    def __init__(self, n, datos):
+        self.n = n
+        self.datos = datos
+
+    @classmethod
+    def desde_matriz(cls, matriz, dtype=np.float32):
+        n = len(matriz)
+        datos = np.empty(n * (n + 1) // 2, dtype=dtype)
+        inicio = 0
+        for i in range(n):
+            datos[inicio:inicio + n - i] = matriz[i, i:]
+            inicio += n - i
+        return cls(n, datos)
+
+    def _posicion(self, i, j):
+        a = np.minimum(i, j)
+        b = np.maximum(i, j)
+        return a * (2 * self.n - a + 1) // 2 + b - a
+
+    def __getitem__(self, ij):
+        return self.datos[self._posicion(*ij)]
+
+    def fila(self, i):
+        return self.datos[self._posicion(i, np.arange(self.n))]
+
+    def filas(self, ids):
+        """Matriz len(ids) x n con las filas pedidas"""
+        return self.datos[self._posicion(np.asarray(ids)[:, None], np.arange(self.n)[None, :])]
+
+    def __setitem__(self, ij, valores):
+        self.datos[self._posicion(*ij)] = valores
+
+    @property
+    def nbytes(self):
+        return self.datos.nbytes
+
+
+def _fila(matriz, i):
+    return matriz.fila(i) if isinstance(matriz, MatrizTriangular) else matriz[i]
+
+
+def _filas(matriz, ids):
+    return matriz.filas(ids) if isinstance(matriz, MatrizTriangular) else matriz[ids]
+
+
+def _columna(matriz, j):
+    return matriz.fila(j) if isinstance(matriz, MatrizTriangular) else matriz[:, j]
+
+
+class TablaTodosPares:
+    """
+    Resultado de todos los pares indexado por ids: matriz de distancias, de ETA y de
+    predecesores. Los caminos se reconstruyen solo cuando se piden.
+    """
+    def __init__(self, nodos, dist, tiempo, pred, algoritmo):
+        self.nodos = list(nodos)
+        self.indice = {n: i for i, n in enumerate(self.nodos)}
+        self.dist = dist
+        self.tiempo = tiempo
+        self.pred = pred
+        self.algoritmo = algoritmo
+
+    @property
+    def triangular(self):
+        return isinstance(self.dist, MatrizTriangular)
+
+    def compactar(self, float32=True, triangular=False):
+        """
+        Reduce la memoria: distancias y ETA en float32 y, para grafos no dirigidos, solo el
+        triángulo superior; los predecesores con el entero más chico que alcance para n.
+        En la forma triangular el camino j -> i (j > i) es el de i -> j al revés, así la
+        distancia y el ETA guardados siempre corresponden al camino que se devuelve.
+        """
+        tipo = np.float32 if float32 else np.float64
+        if triangular:
+            self.dist = MatrizTriangular.desde_matriz(self.dist, tipo)
+            self.tiempo = MatrizTriangular.desde_matriz(self.tiempo, tipo)
+        else:
+            self.dist = self.dist.astype(tipo, copy=False)
+            self.tiempo = self.tiempo.astype(tipo, copy=False)
+        entero = np.int16 if len(self.nodos) < np.iinfo(np.int16).max else np.int32
+        self.pred = self.pred.astype(entero, copy=False)
+        return self
+
+    def nbytes(self):
+        return self.dist.nbytes + self.tiempo.nbytes + self.pred.nbytes
+
+    def distancia_ids(self, i, j):
+        return float(self.dist[i, j])
+
+    def tiempo_ids(self, i, j):
+        return float(self.tiempo[i, j])
+
+    def fila_distancias(self, i):
+        return _fila(self.dist, i)
+
+    def columna_distancias(self, j):
+        return _columna(self.dist, j)
+
+    @property
+    def tipo_valores(self):
+        """dtype de las distancias (float32 si la tabla se compactó)"""
+        return self.dist.datos.dtype if self.triangular else self.dist.dtype
+
+    def filas(self, ids):
+        """(distancias, tiempos, predecesores) de las filas ids, como matrices len(ids) x n"""
+        return _filas(self.dist, ids), _filas(self.tiempo, ids), self.pred[ids]
+
+    def actualizar_fila(self, i, columnas, dist, tiempo, pred):
+        """
+        Cambia algunas columnas del árbol de caminos desde i (por ejemplo tras editar el grafo).
+        En la forma triangular solo se escriben las columnas j >= i, que son las de esta fila.
+        """
+        columnas = np.asarray(columnas, dtype=np.int64)
+        self.pred[i, columnas] = pred
+        if self.triangular:
+            propias = columnas >= i
+            columnas = columnas[propias]
+            dist, tiempo = np.asarray(dist)[propias], np.asarray(tiempo)[propias]
+        self.dist[i, columnas] = dist
+        self.tiempo[i, columnas] = tiempo
+
+    def camino_ids(self, i, j):
+        if self.dist[i, j] == INF:
+            return None
+        if self.triangular and i > j:
+            return self.camino_ids(j, i)[::-1]
+        path = [j]
+        fila = self.pred[i]
+        while path[-1] != i:
+            path.append(int(fila[path[-1]]))
+        path.reverse()
+        return path
+
+    def camino(self, origen, destino):
+        ids = self.camino_ids(self.indice[origen], self.indice[destino])
+        return None if ids is None else [self.nodos[k] for k in ids]
+
+    def distancia(self, origen, destino):
+        return self.distancia_ids(self.indice[origen], self.indice[destino])
+
+    def tiempo_entre(self, origen, destino):
+        return self.tiempo_ids(self.indice[origen], self.indice[destino])
+
+    def vistas(self, solo_alcanzables=False):
+        """
+        (distancias, rutas, tiempos) con la interfaz de diccionario de diccionarios de antes.
+        rutas y tiempos solo tienen los destinos alcanzables; distancias tiene todos (inf si no
+        hay camino) salvo con solo_alcanzables.
+        """
+        tipo = 'distancia_alcanzable' if solo_alcanzables else 'distancia'
+        return _Vista(self, tipo), _Vista(self, 'ruta'), _Vista(self, 'tiempo')
+
+
+class _Vista(Mapping):
+    """vista[origen][destino] sobre la tabla, sin materializar diccionarios ni caminos"""
+    def __init__(self, tabla, tipo):
+        self.tabla = tabla
+        self.tipo = tipo
+
+    def __getitem__(self, origen):
+        return _FilaVista(self.tabla, self.tipo, self.tabla.indice[origen])
+
+    def __iter__(self):
+        return iter(self.tabla.nodos)
+
+    def __len__(self):
+        return len(self.tabla.nodos)
+
+
+class _FilaVista(Mapping):
+    def __init__(self, tabla, tipo, i):
+        self.tabla = tabla
+        self.tipo = tipo
+        self.i = i
+
+    def __getitem__(self, destino):
+        j = self.tabla.indice[destino]
+        distancia = self.tabla.distancia_ids(self.i, j)
+        if self.tipo == 'distancia':
+            return distancia
+        if distancia == INF:
+            raise KeyError(destino)
+        if self.tipo == 'distancia_alcanzable':
+            return distancia
+        if self.tipo == 'tiempo':
+            return self.tabla.tiempo_ids(self.i, j)
+        return [self.tabla.nodos[k] for k in self.tabla.camino_ids(self.i, j)]
+
+    def __iter__(self):
+        if self.tipo == 'distancia':
+            return iter(self.tabla.nodos)
+        alcanzables = np.flatnonzero(self.tabla.fila_distancias(self.i) < INF)
+        return (self.tabla.nodos[j] for j in alcanzables)
+
+    def __len__(self):
+        if self.tipo == 'distancia':
+            return len(self.tabla.nodos)
+        return int(np.count_nonzero(self.tabla.fila_distancias(self.i) < INF))
+
+
+class _Pendiente:
+    """Resultado en cálculo o ya calculado; los demás hilos esperan el evento"""
+    def __init__(self):
+        self.listo = threading.Event()
+        self.valor = None
+        self.error = None  # excepción del cálculo, para los hilos que lo esperaban
+
+
+# Los resultados se guardan en csr.resultados, por clave: editar el grafo (marcar_modificado) o
+# recargarlo da otro CSR y lo guardado se libera junto con el CSR anterior.
+_CANDADO = threading.Lock()
+
+
+def resultado_memorizado(G, clave, calcular, limite=None):
+    """
+    calcular(G) una sola vez por versión del grafo y clave. Si otro hilo ya lo está
+    calculando se espera ese resultado en vez de repetir el cálculo. Si calcular lanza una
+    excepción no se memoriza: se relanza aquí y en los hilos que esperaban.
+    limite: con claves (grupo, ...), cuántos resultados del mismo grupo se guardan como
+    máximo; se descartan los usados hace más tiempo.
+    """
+    csr = obtener_csr(G)
+    with _CANDADO:
+        resultados = csr.resultados
+        # Se vuelve a insertar al final: el orden del dict es el de uso más reciente
+        pendiente = resultados.pop(clave, None)
+        propio = pendiente is None
+        if propio:
+            pendiente = _Pendiente()
+        resultados[clave] = pendiente
+    if not propio:
+        pendiente.listo.wait()
+        if pendiente.error is not None:
+            raise pendiente.error
+        return pendiente.valor
+    try:
+        pendiente.valor = calcular(G)
+    except Exception as e:
+        pendiente.error = e
+        with _CANDADO:
+            resultados.pop(clave, None)
+        raise
+    finally:
+        pendiente.listo.set()
+    if limite is not None:
+        with _CANDADO:
+            _recortar(resultados, clave[0], limite)
+    return pendiente.valor
+
+
+def _recortar(resultados, grupo, limite):
+    """Deja a lo sumo limite resultados del grupo; los que aún se calculan no se descartan"""
+    del_grupo = [k for k in resultados if isinstance(k, tuple) and k[0] == grupo]
+    for k in del_grupo[:max(len(del_grupo) - limite, 0)]:
+        if resultados[k].listo.is_set():
+            del resultados[k]
+
+
+def resultado_listo(G, clave):
+    """True si el resultado ya está calculado para la versión actual del grafo"""
+    pendiente = obtener_csr(G).resultados.get(clave)
+    return pendiente is not None and pendiente.listo.is_set()
+
+
+def trasladar_resultados(csr_anterior, csr, reparar):
+    """
+    Pasa los resultados ya calculados de csr_anterior a csr (la versión siguiente del mismo
+    grafo): reparar(valor) devuelve el valor actualizado, o None si hay que descartarlo.
+    """
+    with _CANDADO:
+        anteriores, csr_anterior.resultados = csr_anterior.resultados, {}
+    trasladados = {}
+    for clave, pendiente in anteriores.items():
+        if not pendiente.listo.is_set():
+            continue
+        valor = reparar(pendiente.valor)
+        if valor is not None:
+            nuevo = trasladados[clave] = _Pendiente()
+            nuevo.valor = valor
+            nuevo.listo.set()
+    if trasladados:
+        with _CANDADO:
+            csr.resultados.update(trasladados)
+    return list(trasladados)
+
+
+def calcular_en_segundo_plano(G, clave, calcular):
+    """Lanza resultado_memorizado en un hilo para que la primera consulta lo encuentre listo"""
+    obtener_csr(G)  # el CSR se arma aquí para que el hilo y las consultas usen el mismo
+    hilo = threading.Thread(target=resultado_memorizado, args=(G, clave, calcular), daemon=True)
+    hilo.start()
+    return hilo
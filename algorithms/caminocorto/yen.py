@@ -0,0 +1,126 @@
+from heapq import heappop, heappush
+
+from algorithms.grafo_csr import obtener_csr
+from algorithms.caminocorto.dijkstra import INF, MotorDijkstra, ids_de
+
+
+class KCaminosYen:
+    """
+    K caminos más cortos sin ciclos (Yen) entre dos ids, con dos ahorros sobre el algoritmo
+    de libro:
+    - El árbol de caminos más cortos hacia el destino se calcula una sola vez. Su distancia
+      es una cota inferior exacta para las búsquedas de desvío (A*), y si el camino del árbol
+      desde el nodo de desvío no toca nada bloqueado, ese es directamente el desvío óptimo.
+    - Regla de Lawler: un camino solo genera desvíos desde el punto donde se separó de su
+      camino padre; los anteriores darían los mismos candidatos que ya generó el padre.
+    """
+    def __init__(self, csr, origen, destino):
+        self.csr = csr
+        self.origen = origen
+        self.destino = destino
+        atras = MotorDijkstra(csr.invertido())
+        atras.buscar(destino)
+        self.hasta_destino = list(atras.dist)
+        self.siguiente = list(atras.pred)  # siguiente nodo hacia el destino en el árbol
+        self.busquedas = 0
+        self.atajos = 0
+
+    def _arco(self, u, v):
+        """Arco u->v de menor distancia"""
+        offsets, destinos, distancia, _ = self.csr.listas()
+        return min((i for i in range(offsets[u], offsets[u + 1]) if destinos[i] == v),
+                   key=distancia.__getitem__)
+
+    def _medir(self, path):
+        """(distancia, tiempo, distancias acumuladas por posición) del camino en ids"""
+        _, _, distancia, eta = self.csr.listas()
+        acumulada = [0.0]
+        tiempo = 0.0
+        for u, v in zip(path, path[1:]):
+            i = self._arco(u, v)
+            acumulada.append(acumulada[-1] + distancia[i])
+            tiempo += eta[i]
+        return acumulada[-1], tiempo, acumulada
+
+    def _desvio(self, spur, prohibidos, arcos_bloqueados):
+        """Camino más corto spur -> destino sin pasar por prohibidos ni por spur->v con v en arcos_bloqueados"""
+        # Atajo: el camino del árbol ya es óptimo si es factible
+        v = self.siguiente[spur]
+        if self.hasta_destino[spur] < INF and v not in arcos_bloqueados:
+            path = [spur]
+            while v != -1 and v not in prohibidos:
+                path.append(v)
+                v = self.siguiente[v]
+            if path[-1] == self.destino:
+                self.atajos += 1
+                return path
+        self.busquedas += 1
+        offsets, destinos, distancia, _ = self.csr.listas()
+        h = self.hasta_destino
+        dist = {spur: 0.0}
+        pred = {spur: -1}
+        cerrados = set()
+        heap = [(h[spur], 0.0, spur)]
+        while heap:
+            _, d, u = heappop(heap)
+            if u in cerrados:
+                continue
+            cerrados.add(u)
+            if u == self.destino:
+                path = []
+                while u != -1:
+                    path.append(u)
+                    u = pred[u]
+                return path[::-1]
+            for i in range(offsets[u], offsets[u + 1]):
+                v = destinos[i]
+                if v in prohibidos or v in cerrados or (u == spur and v in arcos_bloqueados):
+                    continue
+                nd = d + distancia[i]
+                if nd < dist.get(v, INF) and h[v] < INF:
+                    dist[v] = nd
+                    pred[v] = u
+                    heappush(heap, (nd + h[v], nd, v))
+        return None
+
+    def caminos(self, k):
+        """Genera hasta k tuplas (camino en ids, distancia, tiempo) en orden de distancia"""
+        if self.hasta_destino[self.origen] == INF:
+            return
+        primero = self._desvio(self.origen, set(), set())
+        aceptados = []
+        vistos = {tuple(primero)}
+        candidatos = [(0.0, 0, primero, 0)]  # (distancia, desempate, camino, índice de desvío)
+        contador = 1
+        while candidatos and len(aceptados) < k:
+            _, _, path, desvio = heappop(candidatos)
+            distancia, tiempo, acumulada = self._medir(path)
+            aceptados.append(path)
+            yield path, distancia, tiempo
+            if len(aceptados) == k:
+                return
+            for i in range(desvio, len(path) - 1):
+                spur = path[i]
+                raiz = path[:i + 1]
+                bloqueados = {p[i + 1] for p in aceptados if len(p) > i + 1 and p[:i + 1] == raiz}
+                resto = self._desvio(spur, set(raiz[:-1]), bloqueados)
+                if resto is None:
+                    continue
+                nuevo = raiz[:-1] + resto
+                if tuple(nuevo) in vistos:
+                    continue
+                vistos.add(tuple(nuevo))
+                costo = acumulada[i] + self._medir(resto)[0]
+                heappush(candidatos, (costo, contador, nuevo, i))
+                contador += 1
+
+
+def k_shortest_paths_yen(G, origen, destino, k=10):
+    """
+    Hasta k caminos sin ciclos de origen a destino, del más corto al más largo.
+    :return: lista de (camino, distancia, tiempo)
+    """
+    csr = obtener_csr(G)
+    s, t = ids_de(csr, origen, destino)
+    yen = KCaminosYen(csr, s, t)
+    return [([csr.nodos[i] for i in path], distancia, tiempo) for path, distancia, tiempo in yen.caminos(k)]
@@ -1,72 +1,100 @@
-import networkx as nx
 from collections import deque
 
+from algorithms.flujomaximo.red_residual import obtener_red
+
+def niveles_bfs(red, s, t, level):
+    """
+    Niveles de la red de capas desde s (en level, -1 sin nivel). La BFS se detiene al terminar
+    el nivel de t: los nodos más lejanos no pueden estar en un camino más corto hacia t.
+    :return: True si t es alcanzable
+    """
+    offsets, destinos, _ = red.listas()
+    residual = red.residual
+    for i in range(len(level)):
+        level[i] = -1
+    level[s] = 0
+    queue = deque([s])
+    while queue:
+        u = queue.popleft()
+        siguiente = level[u] + 1
+        if level[t] != -1 and siguiente > level[t]:
+            break
+        for a in range(offsets[u], offsets[u + 1]):
+            v = destinos[a]
+            if level[v] == -1 and residual[a] > 0:
+                level[v] = siguiente
+                queue.append(v)
+    return level[t] != -1
+
+
+def flujo_bloqueante(red, s, t, level, al_aumentar):
+    """
+    Flujo bloqueante de una fase con DFS iterativa sobre la red de capas. actual[u] es el arco
+    actual de u: solo avanza, así que cada arco se descarta una vez por fase. Un nodo sin
+    salida se saca de la red de capas (level = -1) para que nadie vuelva a intentarlo.
+    al_aumentar(arcos, flujo) se llama por cada camino de aumento.
+    :return: flujo enviado en la fase
+    """
+    offsets, destinos, par = red.listas()
+    residual = red.residual
+    actual = offsets[:-1]
+    camino = []  # arcos desde s hasta u
+    u = s
+    total = 0
+    while True:
+        if u == t:
+            flujo = min(residual[a] for a in camino)
+            for a in camino:
+                residual[a] -= flujo
+                residual[par[a]] += flujo
+            total += flujo
+            al_aumentar(camino, flujo)
+            # Se retrocede hasta la cola del primer arco saturado
+            k = next(i for i, a in enumerate(camino) if residual[a] == 0)
+            del camino[k:]
+            u = destinos[camino[-1]] if camino else s
+            continue
+        a, fin = actual[u], offsets[u + 1]
+        nivel = level[u] + 1
+        while a < fin and (residual[a] <= 0 or level[destinos[a]] != nivel):
+            a += 1
+        actual[u] = a
+        if a < fin:
+            camino.append(a)
+            u = destinos[a]
+        elif u == s:
+            return total
+        else:
+            level[u] = -1
+            a = camino.pop()
+            u = destinos[par[a]]
+            actual[u] += 1
+
+
 def dinic(G, source, sink):
-    residual = nx.DiGraph()
-    for u, v, data in G.edges(data=True):
-        cap = data.get('capacity', data.get('flujo', 0))
-        residual.add_edge(u, v, capacity=cap)
-        if not residual.has_edge(v, u):
-            residual.add_edge(v, u, capacity=0)
+    red = obtener_red(G)
+    s, t = red.ids(source, sink)
+    destinos = red.listas()[1]
 
     max_flow = 0
     flow_paths = []
+    fase = 0
 
-    def bfs_level():
-        level = {source: 0}
-        queue = deque([source])
-        while queue:
-            u = queue.popleft()
-            for v in residual.successors(u):
-                if residual[u][v]['capacity'] > 0 and v not in level:
-                    level[v] = level[u] + 1
-                    queue.append(v)
-        return level if sink in level else None
-
-    def dfs_flow(u, flow, level, next_edge):
-        if u == sink:
-            return flow
-        n = len(list(residual.successors(u)))
-        while next_edge[u] < n:
-            v = list(residual.successors(u))[next_edge[u]]
-            if residual[u][v]['capacity'] > 0 and level.get(v, -1) == level[u] + 1:
-                pushed = dfs_flow(v, min(flow, residual[u][v]['capacity']), level, next_edge)
-                if pushed > 0:
-                    residual[u][v]['capacity'] -= pushed
-                    residual[v][u]['capacity'] += pushed
-                    return pushed
-            next_edge[u] += 1
-        return 0
-
-    while True:
-        level = bfs_level()
-        if not level:
-            break
-        next_edge = {u: 0 for u in residual.nodes}
-        while True:
-            pushed = dfs_flow(source, float('inf'), level, next_edge)
-            if pushed == 0:
-                break
-            max_flow += pushed
-            # Opcional: reconstruir el camino de aumento (no trivial en Dinic)
-            # Aquí solo guardamos el flujo total tras cada aumento
-            flow_paths.append({'path': [], 'flow': pushed, 'total_flow': max_flow})
+    def registrar(camino, flujo):
+        nonlocal max_flow
+        max_flow += flujo
+        path = red.nombres([s] + [destinos[a] for a in camino])
+        flow_paths.append({'path': path, 'flow': flujo, 'total_flow': max_flow, 'phase': fase})
 
-    # Calcular flujo por arista original
-    edge_flows = {}
-    for u, v, data in G.edges(data=True):
-        cap = data.get('capacity', data.get('flujo', 0))
-        flow = cap - residual[u][v]['capacity']
-        utilization = (flow / cap * 100) if cap else 0
-        edge_flows[(u, v)] = {
-            'flow': flow,
-            'capacity': cap,
-            'utilization': utilization
-        }
+    level = [-1] * red.n
+    while s != t and niveles_bfs(red, s, t, level):
+        fase += 1
+        flujo_bloqueante(red, s, t, level, registrar)
 
     return {
         'max_flow': max_flow,
         'flow_paths': flow_paths,
-        'edge_flows': edge_flows,
+        'phases': fase,
+        'edge_flows': red.flujos_por_arista(),
         'algorithm': 'Dinic'
-    }
\ No newline at end of file
+    }
@@ -1,67 +1,53 @@
-import networkx as nx
 from collections import deque
 
+from algorithms.flujomaximo.red_residual import obtener_red
+
 def edmonds_karp(G, source, sink):
-    residual = nx.DiGraph()
-    for u, v, data in G.edges(data=True):
-        cap = data.get('capacity', data.get('flujo', 0))
-        residual.add_edge(u, v, capacity=cap)
-        if not residual.has_edge(v, u):
-            residual.add_edge(v, u, capacity=0)
+    red = obtener_red(G)
+    s, t = red.ids(source, sink)
+    offsets, destinos, par = red.listas()
+    residual = red.residual
 
     max_flow = 0
     flow_paths = []
 
     while True:
-        # BFS para encontrar camino de aumento
-        parent = {source: None}
-        queue = deque([source])
-        while queue and sink not in parent:
+        # BFS para encontrar camino de aumento; llegada[v] es el arco por el que se alcanzó v
+        llegada = [-1] * red.n
+        llegada[s] = -2
+        queue = deque([s])
+        while queue and llegada[t] == -1:
             u = queue.popleft()
-            for v in residual.successors(u):
-                if v not in parent and residual[u][v]['capacity'] > 0:
-                    parent[v] = u
+            for a in range(offsets[u], offsets[u + 1]):
+                v = destinos[a]
+                if llegada[v] == -1 and residual[a] > 0:
+                    llegada[v] = a
                     queue.append(v)
-        if sink not in parent:
+        if llegada[t] == -1:
             break
 
         # Encontrar el cuello de botella
-        path = []
-        v = sink
-        bottleneck = float('inf')
-        while v != source:
-            u = parent[v]
-            path.append((u, v))
-            bottleneck = min(bottleneck, residual[u][v]['capacity'])
-            v = u
-        path = [source] + [v for u, v in reversed(path)]
+        arcos = []
+        v = t
+        while v != s:
+            a = llegada[v]
+            arcos.append(a)
+            v = destinos[par[a]]
+        arcos.reverse()
+        bottleneck = min(residual[a] for a in arcos)
 
         # Actualizar capacidades residuales
-        v = sink
-        while v != source:
-            u = parent[v]
-            residual[u][v]['capacity'] -= bottleneck
-            residual[v][u]['capacity'] += bottleneck
-            v = u
+        for a in arcos:
+            residual[a] -= bottleneck
+            residual[par[a]] += bottleneck
 
         max_flow += bottleneck
+        path = red.nombres([s] + [destinos[a] for a in arcos])
         flow_paths.append({'path': path, 'flow': bottleneck, 'total_flow': max_flow})
 
-    # Calcular flujo por arista original
-    edge_flows = {}
-    for u, v, data in G.edges(data=True):
-        cap = data.get('capacity', data.get('flujo', 0))
-        flow = cap - residual[u][v]['capacity']
-        utilization = (flow / cap * 100) if cap else 0
-        edge_flows[(u, v)] = {
-            'flow': flow,
-            'capacity': cap,
-            'utilization': utilization
-        }
-
     return {
         'max_flow': max_flow,
         'flow_paths': flow_paths,
-        'edge_flows': edge_flows,
+        'edge_flows': red.flujos_por_arista(),
         'algorithm': 'Edmonds-Karp'
-    }
\ No newline at end of file
+    }
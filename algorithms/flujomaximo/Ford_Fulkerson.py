@@ -1,100 +1,122 @@
-import networkx as nx
-from collections import deque
+from algorithms.flujomaximo.red_residual import obtener_red
 
 class FordFulkerson:
-    def __init__(self, graph):
+    def __init__(self, graph, escalado=False):
         """
         Inicializa el algoritmo con un grafo dirigido.
-        :param graph: nx.DiGraph con atributo 'flujo' en las aristas (capacidad)
+        :param graph: nx.DiGraph con atributo 'capacity' (o 'flujo') en las aristas
+        :param escalado: escalamiento de capacidad; cada fase solo aumenta por arcos con
+            residual >= delta y luego delta se reduce a la mitad (O(E log U) aumentos)
         """
         self.G = graph
-        self.residual_graph = None
+        self.escalado = escalado
+        self.red = None
         self.flow_paths = []
         self.max_flow = 0
         self.edge_flows = {}
+        # Buffers de la BFS, reutilizados entre llamadas
+        self._llegada = []
+        self._visitados = []
 
-    def find_augmenting_path(self, source, sink):
-        """Encuentra un camino de aumento usando BFS en el grafo residual."""
-        visited = {node: False for node in self.residual_graph.nodes()}
-        parent = {}
-        queue = deque([source])
-        visited[source] = True
+    def _arcos_aumento(self, s, t, delta=0):
+        """Arcos de la red residual de un camino de aumento de s a t (BFS) con residual >= delta, o None"""
+        offsets, destinos, par = self.red.listas()
+        residual = self.red.residual
+        if len(self._llegada) != self.red.n:
+            self._llegada = [-1] * self.red.n
+        llegada = self._llegada
+        # visitados hace de cola; al terminar solo se limpian sus marcas
+        visitados = self._visitados
+        visitados.append(s)
+        llegada[s] = -2
+        arcos = None
+        i = 0
 
-        while queue:
-            u = queue.popleft()
-            for v in self.residual_graph.neighbors(u):
-                if not visited[v] and self.residual_graph[u][v]['capacity'] > 0:
-                    parent[v] = u
-                    visited[v] = True
-                    if v == sink:
+        while i < len(visitados) and arcos is None:
+            u = visitados[i]
+            i += 1
+            for a in range(offsets[u], offsets[u + 1]):
+                v = destinos[a]
+                if llegada[v] == -1 and residual[a] > 0 and residual[a] >= delta:
+                    llegada[v] = a
+                    visitados.append(v)
+                    if v == t:
                         # Reconstruir el camino
-                        path = []
-                        current = sink
-                        while current != source:
-                            path.append(current)
-                            current = parent[current]
-                        path.append(source)
-                        path.reverse()
-                        return path
-                    queue.append(v)
-        return None
-
-    def compute_max_flow(self, source, sink):
-        """Calcula el flujo máximo desde source hasta sink."""
-        # Inicializar grafo residual 
-        self.residual_graph = nx.DiGraph()
-        for u, v, data in self.G.edges(data=True):
+                        arcos = []
+                        while v != s:
+                            arcos.append(llegada[v])
+                            v = destinos[par[llegada[v]]]
+                        arcos.reverse()
+                        break
 
-            self.residual_graph.add_edge(u, v, capacity=data['capacity'])
-            if not self.residual_graph.has_edge(v, u):
-                self.residual_graph.add_edge(v, u, capacity=0)
+        for v in visitados:
+            llegada[v] = -1
+        visitados.clear()
+        return arcos
 
+    def find_augmenting_path(self, source, sink):
+        """Encuentra un camino de aumento usando BFS en el grafo residual."""
+        if self.red is None:
+            self.red = obtener_red(self.G)
+        s, t = self.red.ids(source, sink)
+        arcos = self._arcos_aumento(s, t)
+        if arcos is None:
+            return None
+        destinos = self.red.listas()[1]
+        return self.red.nombres([s] + [destinos[a] for a in arcos])
 
+    def compute_max_flow(self, source, sink):
+        """Calcula el flujo máximo desde source hasta sink."""
+        # Red residual de arcos en pareja: se arma una vez por grafo y aquí solo se reinicia
+        self.red = obtener_red(self.G)
+        s, t = self.red.ids(source, sink)
+        _, destinos, par = self.red.listas()
+        residual = self.red.residual
 
         self.max_flow = 0
         self.flow_paths = []
         self.edge_flows = {}
 
-        while True:
-            path = self.find_augmenting_path(source, sink)
-            if not path:
-                break
+        for delta in self._deltas():
+            while True:
+                arcos = self._arcos_aumento(s, t, delta)
+                if not arcos:
+                    break
 
-            # Calcular cuello de botella
-            bottleneck = float('Inf')
-            for i in range(len(path)-1):
-                u, v = path[i], path[i+1]
-                bottleneck = min(bottleneck, self.residual_graph[u][v]['capacity'])
+                # Calcular cuello de botella
+                bottleneck = min(residual[a] for a in arcos)
 
-            # Actualizar grafo residual
-            for i in range(len(path)-1):
-                u, v = path[i], path[i+1]
-                self.residual_graph[u][v]['capacity'] -= bottleneck
-                self.residual_graph[v][u]['capacity'] += bottleneck
+                # Actualizar grafo residual
+                for a in arcos:
+                    residual[a] -= bottleneck
+                    residual[par[a]] += bottleneck
 
-            # Guardar información del camino
-            self.flow_paths.append({
-                'path': path,
-                'flow': bottleneck,
-                'total_flow': self.max_flow + bottleneck
-            })
-            self.max_flow += bottleneck
+                # Guardar información del camino
+                self.flow_paths.append({
+                    'path': self.red.nombres([s] + [destinos[a] for a in arcos]),
+                    'flow': bottleneck,
+                    'total_flow': self.max_flow + bottleneck,
+                    'delta': delta
+                })
+                self.max_flow += bottleneck
         # Calcular flujos en las aristas originales (solo las utilizadas)
-        for u, v, data in self.G.edges(data=True):
-            original_capacity = data['capacity'] 
-            residual_capacity = self.residual_graph[u][v]['capacity'] if self.residual_graph.has_edge(u, v) else original_capacity
-            flow = original_capacity - residual_capacity
-            if flow > 0:
-                utilization = (flow / original_capacity) * 100 if original_capacity > 0 else 0
-                self.edge_flows[(u, v)] = {
-                    'flow': flow,
-                    'capacity': original_capacity,
-                    'utilization': utilization
-                }
-
+        self.edge_flows = self.red.flujos_por_arista(solo_con_flujo=True)
 
         return {
             'max_flow': self.max_flow,
             'flow_paths': self.flow_paths,
             'edge_flows': self.edge_flows
-        }
\ No newline at end of file
+        }
+
+    def _deltas(self):
+        """Umbrales de las fases: potencias de 2 desde la mayor capacidad hasta 1 y al final 0
+        (cualquier residual positivo, para capacidades no enteras). Sin escalado, solo 0."""
+        if self.escalado and len(self.red.capacidad):
+            tope = self.red.capacidad.max()
+            delta = 1
+            while delta * 2 <= tope:
+                delta *= 2
+            while delta >= 1:
+                yield delta
+                delta //= 2
+        yield 0
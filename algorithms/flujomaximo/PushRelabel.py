@@ -1,80 +1,254 @@
-import networkx as nx
-
-def push_relabel(G, source, sink):
-    # Construir grafo residual
-    residual = nx.DiGraph()
-    for u, v, data in G.edges(data=True):
-        cap = data.get('capacity', data.get('flujo', 0))
-        residual.add_edge(u, v, capacity=cap)
-        if not residual.has_edge(v, u):
-            residual.add_edge(v, u, capacity=0)
-
-    # Inicializar preflujo
-    n = len(residual.nodes)
-    height = {u: 0 for u in residual.nodes}
-    excess = {u: 0 for u in residual.nodes}
-    height[source] = n
-    for v in residual.successors(source):
-        cap = residual[source][v]['capacity']
+from collections import deque
+
+from algorithms.flujomaximo.red_residual import obtener_red
+
+
+def alturas_exactas(red, s, t, height):
+    """
+    Reetiquetado global: height[v] = distancia residual de v a t (BFS hacia atrás desde t); los
+    nodos que ya no llegan a t quedan en n + distancia a s, para devolver su exceso a la fuente.
+    """
+    offsets, destinos, par = red.listas()
+    residual = red.residual
+    n = len(height)
+    for i in range(n):
+        height[i] = 2 * n
+    for raiz, base in ((t, 0), (s, n)):
+        height[raiz] = base
+        queue = deque([raiz])
+        while queue:
+            v = queue.popleft()
+            siguiente = height[v] + 1
+            for a in range(offsets[v], offsets[v + 1]):
+                w = destinos[a]
+                # w -> v es el compañero de v -> w
+                if height[w] == 2 * n and residual[par[a]] > 0:
+                    height[w] = siguiente
+                    queue.append(w)
+
+
+def preflujo_maximo(red, s, t, al_descargar=None, frecuencia_global=1.0):
+    """
+    Push-relabel de etiqueta más alta sobre la red residual (red.residual queda con el flujo).
+    - Los nodos activos están en cubetas por altura y se descarga siempre uno de la más alta;
+      en_activo da la pertenencia en O(1) y las entradas viejas de las cubetas se descartan al sacarlas.
+    - Gap: si una altura h < n se queda sin nodos, los de altura entre h y n ya no llegan a t
+      y suben de una vez a n, desde donde solo devuelven su exceso a la fuente.
+    - Reetiquetado global (alturas_exactas) al inicio y cada frecuencia_global * n reetiquetados.
+    al_descargar(u, excess, tocados) se llama después de descargar cada nodo (la fuente primero),
+    con los nodos que recibieron flujo en esa descarga.
+    :return: valor del flujo máximo
+    """
+    offsets, destinos, par = red.listas()
+    residual = red.residual
+    n = red.n
+    height = [0] * n
+    excess = [0] * n
+    actual = offsets[:-1]  # arco actual de cada nodo
+
+    # Preflujo inicial: se saturan los arcos que salen de la fuente
+    for a in range(offsets[s], offsets[s + 1]):
+        cap = residual[a]
         if cap > 0:
-            residual[source][v]['capacity'] = 0
-            residual[v][source]['capacity'] += cap
-            excess[v] += cap
-            excess[source] -= cap
-
-    def push(u, v):
-        send = min(excess[u], residual[u][v]['capacity'])
-        residual[u][v]['capacity'] -= send
-        residual[v][u]['capacity'] += send
-        excess[u] -= send
-        excess[v] += send
-
-    def relabel(u):
-        min_height = float('inf')
-        for v in residual.successors(u):
-            if residual[u][v]['capacity'] > 0:
-                min_height = min(min_height, height[v])
-        if min_height < float('inf'):
-            height[u] = min_height + 1
-
-    active = [u for u in residual.nodes if u != source and u != sink and excess[u] > 0]
-    flow_steps = []
-
-    while active:
-        u = active.pop(0)
-        pushed = False
-        for v in residual.successors(u):
-            if residual[u][v]['capacity'] > 0 and height[u] == height[v] + 1:
-                push(u, v)
-                pushed = True
-                if v != source and v != sink and v not in active and excess[v] > 0:
-                    active.append(v)
-                if excess[u] == 0:
-                    break
-        if not pushed:
-            relabel(u)
-            if excess[u] > 0 and u not in active:
-                active.append(u)
-        # Guardar el estado del exceso para mostrar etapas (opcional)
-        flow_steps.append({'node': u, 'excess': dict(excess)})
-
-    max_flow = sum(residual[v][source]['capacity'] for v in residual.successors(source))
-
-    # Calcular flujo por arista original
-    edge_flows = {}
-    for u, v, data in G.edges(data=True):
-        cap = data.get('capacity', data.get('flujo', 0))
-        flow = cap - residual[u][v]['capacity']
-        utilization = (flow / cap * 100) if cap else 0
-        edge_flows[(u, v)] = {
-            'flow': flow,
-            'capacity': cap,
-            'utilization': utilization
-        }
-
-    return {
+            residual[a] = 0
+            residual[par[a]] += cap
+            excess[destinos[a]] += cap
+            excess[s] -= cap
+    if al_descargar is not None:
+        # La saturación inicial cuenta como la primera descarga (la de la fuente)
+        al_descargar(s, excess, [destinos[a] for a in range(offsets[s], offsets[s + 1])])
+
+    en_activo = [False] * n
+    activos = [[] for _ in range(2 * n + 1)]  # cubetas de activos por altura
+    todos = [[] for _ in range(n)]            # cubetas de todos los nodos por altura < n (para el gap)
+    cuenta = [0] * n                          # nodos por altura < n
+
+    def reetiquetar_todo():
+        alturas_exactas(red, s, t, height)
+        for h in range(n):
+            todos[h] = []
+            cuenta[h] = 0
+        for cubeta in activos:
+            cubeta.clear()
+        maxima = 0
+        for v in range(n):
+            h = height[v]
+            if h < n:
+                todos[h].append(v)
+                cuenta[h] += 1
+            en_activo[v] = excess[v] > 0 and v != s and v != t
+            if en_activo[v]:
+                activos[h].append(v)
+                maxima = max(maxima, h)
+            actual[v] = offsets[v]
+        return maxima
+
+    tocados = [] if al_descargar is not None else None
+    maxima = reetiquetar_todo()
+    limite = frecuencia_global * n if frecuencia_global else float('inf')
+    reetiquetados = 0
+    while maxima >= 0:
+        cubeta = activos[maxima]
+        if not cubeta:
+            maxima -= 1
+            continue
+        u = cubeta.pop()
+        if not en_activo[u] or height[u] != maxima:
+            continue
+        en_activo[u] = False
+
+        # Descarga de u
+        h = height[u]
+        a, fin = actual[u], offsets[u + 1]
+        while excess[u] > 0:
+            if a == fin:
+                # Reetiquetar: una más que el vecino residual más bajo
+                nueva = 2 * n
+                for b in range(offsets[u], fin):
+                    if residual[b] > 0 and height[destinos[b]] < nueva:
+                        nueva = height[destinos[b]]
+                nueva += 1
+                reetiquetados += 1
+                if h < n:
+                    cuenta[h] -= 1
+                    if cuenta[h] == 0:
+                        # Gap: nadie por encima de h (y por debajo de n) puede llegar a t
+                        for hh in range(h + 1, n):
+                            if not cuenta[hh]:
+                                continue
+                            for v in todos[hh]:
+                                if height[v] == hh:
+                                    height[v] = n
+                                    if en_activo[v]:
+                                        activos[n].append(v)
+                            todos[hh] = []
+                            cuenta[hh] = 0
+                        nueva = max(nueva, n)
+                        maxima = max(maxima, n)
+                height[u] = h = nueva
+                if h < n:
+                    todos[h].append(u)
+                    cuenta[h] += 1
+                a = offsets[u]
+                continue
+            v = destinos[a]
+            if residual[a] > 0 and h == height[v] + 1:
+                envio = min(excess[u], residual[a])
+                residual[a] -= envio
+                residual[par[a]] += envio
+                excess[u] -= envio
+                excess[v] += envio
+                if tocados is not None:
+                    tocados.append(v)
+                if not en_activo[v] and v != s and v != t:
+                    en_activo[v] = True
+                    activos[h - 1].append(v)
+                    # u pudo subir por encima de la cubeta más alta mientras se descargaba
+                    if h - 1 > maxima:
+                        maxima = h - 1
+                if residual[a] == 0:
+                    a += 1
+            else:
+                a += 1
+        actual[u] = a
+        if al_descargar is not None:
+            al_descargar(u, excess, tocados)
+            tocados.clear()
+        if reetiquetados >= limite:
+            maxima = reetiquetar_todo()
+            reetiquetados = 0
+    return excess[t]
+
+
+class TrazaFlujo:
+    """
+    Registro acotado de las descargas de push-relabel. Cada entrada guarda solo los excesos
+    que cambiaron desde la entrada anterior (deltas), no una copia de todos los excesos.
+    - cada: se registra una de cada `cada` descargas (los cambios intermedios se acumulan).
+    - capacidad: máximo de entradas (anillo); las que salen se aplican al estado base, así la
+      reproducción desde la base sigue siendo exacta.
+    Al terminar el cálculo hay que llamar a terminar() para que la traza llegue al estado final.
+    """
+    def __init__(self, cada=1, capacidad=None):
+        self.cada = max(1, cada)
+        self.capacidad = capacidad
+        self.base = {}           # exceso (no nulo) antes de la primera entrada guardada
+        self.entradas = deque()  # (paso, nodo, ((v, exceso), ...))
+        self.paso = 0
+        self._pendientes = set()
+        self._ultimo = None      # (nodo, excess) de la última descarga
+
+    def __call__(self, u, excess, tocados):
+        self.paso += 1
+        self._pendientes.add(u)
+        self._pendientes.update(tocados)
+        self._ultimo = (u, excess)
+        if self.paso % self.cada == 0:
+            self._registrar(u, excess)
+
+    def terminar(self):
+        """Registra como último paso los cambios que quedaron entre muestras (estado final)"""
+        if self._pendientes:
+            self._registrar(*self._ultimo)
+
+    def _registrar(self, u, excess):
+        if self.capacidad is not None and len(self.entradas) >= self.capacidad:
+            for v, e in self.entradas.popleft()[2]:
+                if e:
+                    self.base[v] = e
+                else:
+                    self.base.pop(v, None)
+        self.entradas.append((self.paso, u, tuple((v, excess[v]) for v in self._pendientes)))
+        self._pendientes.clear()
+
+    def pasos(self, nodos):
+        """Entradas con nombres de nodo: {'step', 'node', 'changes'}"""
+        return [{'step': paso, 'node': nodos[u], 'changes': {nodos[v]: e for v, e in cambios}}
+                for paso, u, cambios in self.entradas]
+
+
+def reproducir_traza(resultado):
+    """
+    Reconstruye los excesos de cada paso registrado en resultado['flow_steps'] aplicando los
+    deltas sobre resultado['trace_start']. Produce (paso, exceso); exceso es el mismo dict
+    actualizado en cada paso (copiarlo si se quiere conservar).
+    """
+    exceso = dict(resultado.get('trace_start', {}))
+    for paso in resultado['flow_steps']:
+        exceso.update(paso['changes'])
+        yield paso, exceso
+
+
+def push_relabel(G, source, sink, traza=None, cada=100, capacidad=1000):
+    """
+    Flujo máximo con push-relabel de etiqueta más alta.
+    traza: None (sin registro, por defecto), 'muestreo' (una de cada `cada` descargas) o
+    'anillo' (todas las descargas, solo las últimas `capacidad`). Los pasos se devuelven como
+    deltas en flow_steps; reproducir_traza arma los excesos de cada uno.
+    """
+    # Red residual de arcos en pareja (se arma una vez por grafo)
+    red = obtener_red(G)
+    s, t = red.ids(source, sink)
+    nodos = red.csr.nodos
+    if traza == 'muestreo':
+        registro = TrazaFlujo(cada=cada)
+    elif traza == 'anillo':
+        registro = TrazaFlujo(capacidad=capacidad)
+    elif traza is None:
+        registro = None
+    else:
+        raise ValueError(f"Modo de traza desconocido: {traza}")
+
+    max_flow = preflujo_maximo(red, s, t, registro) if s != t else 0
+    if registro is not None:
+        registro.terminar()
+
+    resultado = {
         'max_flow': max_flow,
-        'flow_steps': flow_steps,
-        'edge_flows': edge_flows,
+        'flow_steps': registro.pasos(nodos) if registro is not None else [],
+        'edge_flows': red.flujos_por_arista(),
         'algorithm': 'Push-Relabel'
-    }
\ No newline at end of file
+    }
+    if registro is not None:
+        resultado['trace_start'] = {nodos[v]: e for v, e in registro.base.items()}
+    return resultado
@@ -0,0 +1,83 @@
+import numpy as np
+
+from algorithms.grafo_csr import obtener_csr
+from algorithms.caminocorto.dijkstra import ids_de, obtener_motor
+
+
+class RedResidual:
+    """
+    Red residual de arcos en pareja sobre el CSR del grafo: cada arco y su inverso (con
+    capacidad 0) están en la lista de salida de su nodo de partida, y par[a] es el índice del
+    compañero del arco a. Empujar f unidades por a es residual[a] -= f y residual[par[a]] += f.
+    Los arreglos se arman una sola vez por grafo; entre consultas solo se restablece residual.
+    """
+    def __init__(self, csr):
+        self.csr = csr
+        n, m = csr.n, csr.m
+        origenes = csr.origenes()
+        colas = np.concatenate([origenes, csr.destinos])
+        cabezas = np.concatenate([csr.destinos, origenes])
+        orden = np.argsort(colas, kind='stable')
+        posicion = np.empty(2 * m, dtype=np.int64)
+        posicion[orden] = np.arange(2 * m)
+        self.offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(colas, minlength=n), out=self.offsets[1:])
+        self.destinos = cabezas[orden]
+        companero = np.concatenate([np.arange(m, 2 * m), np.arange(m)])
+        self.par = posicion[companero[orden]]
+        self.capacidad = np.concatenate([csr.capacidad, np.zeros(m)])[orden]
+        self.arco_de = posicion[:m]  # posición en la red del arco i del CSR
+        self.residual = None
+        self._listas = None
+
+    @property
+    def n(self):
+        return self.csr.n
+
+    def listas(self):
+        """(offsets, destinos, par) como listas de Python para los ciclos internos"""
+        if self._listas is None:
+            self._listas = (self.offsets.tolist(), self.destinos.tolist(), self.par.tolist())
+        return self._listas
+
+    def reiniciar(self):
+        """Capacidad residual inicial (sin flujo) para una nueva consulta"""
+        self.residual = self.capacidad.tolist()
+        return self.residual
+
+    def ids(self, fuente, sumidero):
+        return ids_de(self.csr, fuente, sumidero)
+
+    def nombres(self, ids):
+        nodos = self.csr.nodos
+        return [nodos[i] for i in ids]
+
+    def flujos(self):
+        """Flujo de cada arco del CSR: lo que tiene su arco inverso en la red"""
+        return np.asarray(self.residual)[self.par[self.arco_de]]
+
+    def flujos_por_arista(self, solo_con_flujo=False):
+        """
+        {(u, v): {'flow', 'capacity', 'utilization'}} por arco del grafo, como lo muestran las
+        interfaces. En un grafo no dirigido aparecen los dos sentidos de cada arista.
+        """
+        csr = self.csr
+        nodos = csr.nodos
+        edge_flows = {}
+        for u, v, cap, flow in zip(csr.origenes().tolist(), csr.destinos.tolist(),
+                                   csr.capacidad.tolist(), self.flujos().tolist()):
+            if solo_con_flujo and flow <= 0:
+                continue
+            edge_flows[(nodos[u], nodos[v])] = {
+                'flow': flow,
+                'capacity': cap,
+                'utilization': (flow / cap * 100) if cap else 0
+            }
+        return edge_flows
+
+
+def obtener_red(G):
+    """Red residual del grafo (una por versión del grafo y por hilo), lista para una consulta"""
+    red = obtener_motor(obtener_csr(G), RedResidual)
+    red.reiniciar()
+    return red
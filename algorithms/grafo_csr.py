@@ -0,0 +1,150 @@
+import weakref
+
+import numpy as np
+
+
+class GrafoCSR:
+    """
+    Representación compacta de un grafo con ids enteros. Las aristas que salen del nodo u
+    ocupan las posiciones offsets[u]:offsets[u+1] de los arreglos destinos, distancia, eta
+    y capacidad. Un grafo no dirigido se guarda con las dos direcciones de cada arista.
+    """
+    def __init__(self, nodos, offsets, destinos, distancia, eta, capacidad, dirigido, pos=None):
+        self.nodos = list(nodos)
+        self.indice = {n: i for i, n in enumerate(self.nodos)}
+        self.offsets = offsets
+        self.destinos = destinos
+        self.distancia = distancia
+        self.eta = eta
+        self.capacidad = capacidad
+        self.dirigido = dirigido
+        self.pos = pos if pos is not None else np.zeros((len(self.nodos), 2))
+        self._listas = None
+        self._invertido = None
+        # Buffers de trabajo de los algoritmos, por clase de motor e hilo
+        self.motores = {}
+        # Resultados memorizados de esta versión del grafo (ver todos_pares.resultado_memorizado);
+        # viven en el CSR porque guardan referencias a él y así se liberan con él
+        self.resultados = {}
+
+    @classmethod
+    def desde_networkx(cls, G):
+        """Construye el CSR a partir de un nx.Graph / nx.DiGraph con atributos distancia, eta, capacity/flujo"""
+        nodos = list(G.nodes)
+        indice = {n: i for i, n in enumerate(nodos)}
+        m = G.number_of_edges()
+        origen = np.empty(m, dtype=np.int32)
+        destino = np.empty(m, dtype=np.int32)
+        distancia = np.empty(m, dtype=np.float64)
+        eta = np.empty(m, dtype=np.float64)
+        capacidad = np.empty(m, dtype=np.float64)
+        for i, (u, v, d) in enumerate(G.edges(data=True)):
+            origen[i] = indice[u]
+            destino[i] = indice[v]
+            distancia[i] = d.get('distancia', 1)
+            eta[i] = d.get('eta', 0)
+            capacidad[i] = d.get('capacity', d.get('flujo', 0))
+        dirigido = G.is_directed()
+        if not dirigido:
+            origen, destino = np.concatenate([origen, destino]), np.concatenate([destino, origen])
+            distancia = np.concatenate([distancia, distancia])
+            eta = np.concatenate([eta, eta])
+            capacidad = np.concatenate([capacidad, capacidad])
+        pos = np.array([G.nodes[n].get('pos', (0, 0)) for n in nodos], dtype=np.float64).reshape(-1, 2)
+        return cls._desde_arcos(nodos, origen, destino, distancia, eta, capacidad, dirigido, pos)
+
+    @classmethod
+    def _desde_arcos(cls, nodos, origen, destino, distancia, eta, capacidad, dirigido, pos):
+        orden = np.argsort(origen, kind='stable')
+        offsets = np.zeros(len(nodos) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(origen, minlength=len(nodos)), out=offsets[1:])
+        return cls(nodos, offsets, destino[orden], distancia[orden], eta[orden], capacidad[orden], dirigido, pos)
+
+    @property
+    def n(self):
+        return len(self.nodos)
+
+    @property
+    def m(self):
+        """Cantidad de arcos (el doble de aristas si el grafo no es dirigido)"""
+        return len(self.destinos)
+
+    def origenes(self):
+        """Nodo de salida de cada arco"""
+        return np.repeat(np.arange(self.n, dtype=np.int32), np.diff(self.offsets))
+
+    def invertido(self):
+        """CSR con los arcos en sentido contrario (el mismo grafo si no es dirigido)"""
+        if not self.dirigido:
+            return self
+        if self._invertido is None:
+            self._invertido = self._desde_arcos(self.nodos, self.destinos, self.origenes(), self.distancia,
+                                                self.eta, self.capacidad, True, self.pos)
+            self._invertido._invertido = self
+        return self._invertido
+
+    def listas(self):
+        """(offsets, destinos, distancia, eta) como listas de Python para los ciclos internos en Python puro"""
+        if self._listas is None:
+            self._listas = (self.offsets.tolist(), self.destinos.tolist(),
+                            self.distancia.tolist(), self.eta.tolist())
+        return self._listas
+
+    def arcos_entre(self, u, v):
+        """Ids de los arcos u->v"""
+        inicio, fin = self.offsets[u], self.offsets[u + 1]
+        return (inicio + np.flatnonzero(self.destinos[inicio:fin] == v)).tolist()
+
+    def con_cambios(self, cambios):
+        """
+        Copia del CSR con otros pesos en algunos arcos, sin recorrer el grafo de networkx.
+        cambios: {arco: (distancia, eta)} o {arco: None} para quitarlo.
+        :return: (nuevo CSR, mapa) con mapa[arco viejo] = arco nuevo (-1 si se quitó)
+        """
+        distancia, eta = self.distancia.copy(), self.eta.copy()
+        quedan = np.ones(self.m, dtype=bool)
+        for i, pesos in cambios.items():
+            if pesos is None:
+                quedan[i] = False
+            else:
+                distancia[i], eta[i] = pesos
+        mapa = np.where(quedan, np.cumsum(quedan) - 1, -1)
+        offsets = np.zeros_like(self.offsets)
+        np.cumsum(np.bincount(self.origenes()[quedan], minlength=self.n), out=offsets[1:])
+        nuevo = GrafoCSR(self.nodos, offsets, self.destinos[quedan], distancia[quedan], eta[quedan],
+                         self.capacidad[quedan], self.dirigido, self.pos)
+        return nuevo, mapa
+
+    def nbytes(self):
+        """Memoria ocupada por los arreglos numéricos"""
+        return sum(a.nbytes for a in (self.offsets, self.destinos, self.distancia, self.eta, self.capacidad, self.pos))
+
+
+# CSR ya construido por grafo de networkx, junto con la versión del grafo con que se construyó
+_CACHE_CSR = weakref.WeakKeyDictionary()
+
+
+def version_grafo(G):
+    return G.graph.get('version', 0)
+
+
+def marcar_modificado(G):
+    """Se debe llamar después de editar aristas o pesos del grafo para invalidar lo precalculado"""
+    G.graph['version'] = version_grafo(G) + 1
+
+
+def registrar_csr(G, csr):
+    """Deja csr como el CSR de la versión actual de G (cuando se armó sin recorrer G)"""
+    _CACHE_CSR[G] = ((version_grafo(G), G.number_of_nodes(), G.number_of_edges()), csr)
+
+
+def obtener_csr(G):
+    """CSR del grafo, construido una sola vez por versión del grafo; acepta también un GrafoCSR"""
+    if isinstance(G, GrafoCSR):
+        return G
+    guardado = _CACHE_CSR.get(G)
+    firma = (version_grafo(G), G.number_of_nodes(), G.number_of_edges())
+    if guardado is None or guardado[0] != firma:
+        guardado = (firma, GrafoCSR.desde_networkx(G))
+        _CACHE_CSR[G] = guardado
+    return guardado[1]
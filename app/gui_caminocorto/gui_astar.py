@@ -51,6 +51,8 @@ class GrafoAStarApp(tk.Tk):
         self.combo_destino = ttk.Combobox(self.left, values=self.nodos, state="readonly")
         self.combo_destino.pack(fill=tk.X)
 
+        self.usar_alt = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.left, text="Heurística de landmarks (ALT)", variable=self.usar_alt).pack(pady=(12,0), anchor="w")
         ttk.Button(self.left, text="Mostrar camino más corto (A*)", command=self.mostrar_camino).pack(pady=20, fill=tk.X)
         self.resultado = tk.Text(self.left, height=26, width=43, state="disabled")
         self.resultado.pack(pady=10, fill=tk.BOTH, expand=True)
@@ -83,7 +85,8 @@ class GrafoAStarApp(tk.Tk):
             messagebox.showwarning("Advertencia", "Selecciona nodos distintos como origen y destino.")
             return
 
-        path, dist, tpo, nombre = calcular_camino_astar(self.G, origen, destino)
+        modo = "alt" if self.usar_alt.get() else "euclidea"
+        path, dist, tpo, nombre = calcular_camino_astar(self.G, origen, destino, modo)
 
         self.resultado.configure(state="normal")
         self.resultado.delete(1.0, tk.END)
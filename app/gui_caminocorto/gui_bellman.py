@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from models.graph_logic import calcular_todos_caminos_bellman
+from models.graph_logic import calcular_bellman_ford
 
 import matplotlib
 matplotlib.use('TkAgg')
@@ -75,7 +75,16 @@ class GrafoBellmanApp(tk.Tk):
             messagebox.showwarning("Advertencia", "Debes seleccionar un nodo de origen.")
             return
 
-        distancias, caminos, tiempos, algoname = calcular_todos_caminos_bellman(self.G, origen)
+        try:
+            resultado = calcular_bellman_ford(self.G, origen)
+        except Exception as e:
+            messagebox.showerror("Error inesperado", f"Ocurrió un error al ejecutar Bellman-Ford:\n\n{e}")
+            return
+        if resultado.ciclo is not None:
+            self.mostrar_ciclo_negativo(origen, resultado.ciclo)
+            return
+
+        distancias, caminos, tiempos = resultado.vistas()
         self.resultado.configure(state="normal")
         self.resultado.delete(1.0, tk.END)
         self.resultado.insert(tk.END, f"{'Destino':<25} {'Distancia (km)':>18} {'Tiempo (min)':>15}\n")
@@ -92,7 +101,19 @@ class GrafoBellmanApp(tk.Tk):
         self.resultado.configure(state="disabled")
         self.visualizar_grafo_camino(origen, caminos)
 
-    def visualizar_grafo_camino(self, origen, caminos):
+    def mostrar_ciclo_negativo(self, origen, ciclo):
+        self.resultado.configure(state="normal")
+        self.resultado.delete(1.0, tk.END)
+        self.resultado.insert(tk.END, "Ciclo de peso negativo alcanzable desde el origen:\n")
+        self.resultado.insert(tk.END, " → ".join(ciclo) + "\n")
+        self.resultado.configure(state="disabled")
+        self.visualizar_grafo_camino(origen, {"ciclo": ciclo}, titulo=f"Ciclo negativo alcanzable desde {origen}")
+        messagebox.showerror(
+            "Ciclo negativo detectado",
+            "El grafo contiene un ciclo con peso negativo. El algoritmo Bellman-Ford no puede continuar."
+        )
+
+    def visualizar_grafo_camino(self, origen, caminos, titulo=None):
         self.ax.clear()
         edges_en_camino = set()
         for path in caminos.values():
@@ -128,7 +149,8 @@ class GrafoBellmanApp(tk.Tk):
             font_size=6,
             font_family="DejaVu Sans"
         )
-        self.ax.set_title(f"Caminos más cortos desde {origen} (Bellman-Ford)", fontsize=18, fontfamily="DejaVu Sans")
+        titulo = titulo or f"Caminos más cortos desde {origen} (Bellman-Ford)"
+        self.ax.set_title(titulo, fontsize=18, fontfamily="DejaVu Sans")
         self.ax.axis('off')
         self.fig.tight_layout()
         self.canvas.draw()
@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from models.graph_logic import calcular_caminos_a_todos
+from models.graph_logic import calcular_caminos_a_todos, calcular_camino_mas_corto, calcular_isocrona, calcular_k_caminos
 
 import matplotlib
 matplotlib.use('TkAgg')
@@ -46,6 +46,29 @@ class GrafoDijkstraApp(tk.Tk):
         self.combo_origen = ttk.Combobox(self.left, values=self.nodos, state="readonly")
         self.combo_origen.pack(fill=tk.X)
         ttk.Button(self.left, text="Mostrar caminos más cortos (Dijkstra)", command=self.mostrar_caminos).pack(pady=20, fill=tk.X)
+        ttk.Label(self.left, text="Selecciona Destino (camino punto a punto):").pack(pady=(0,5), fill=tk.X)
+        self.combo_destino = ttk.Combobox(self.left, values=self.nodos, state="readonly")
+        self.combo_destino.pack(fill=tk.X)
+        self.bidireccional = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.left, text="Búsqueda bidireccional", variable=self.bidireccional).pack(pady=(8,0), anchor="w")
+        ttk.Button(self.left, text="Mostrar camino origen → destino", command=self.mostrar_camino).pack(pady=(8,0), fill=tk.X)
+        fila_alternativas = tk.Frame(self.left)
+        fila_alternativas.pack(pady=(8,20), fill=tk.X)
+        ttk.Label(fila_alternativas, text="Rutas:").pack(side=tk.LEFT)
+        self.cantidad_alternativas = ttk.Spinbox(fila_alternativas, from_=2, to=20, width=4)
+        self.cantidad_alternativas.set(3)
+        self.cantidad_alternativas.pack(side=tk.LEFT, padx=(4,8))
+        ttk.Button(fila_alternativas, text="Mostrar rutas alternativas", command=self.mostrar_alternativas).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        ttk.Label(self.left, text="Isócrona: alcanzables desde el origen con un límite de").pack(pady=(0,5), fill=tk.X)
+        fila_isocrona = tk.Frame(self.left)
+        fila_isocrona.pack(fill=tk.X)
+        self.limite_isocrona = ttk.Entry(fila_isocrona, width=10)
+        self.limite_isocrona.insert(0, "90")
+        self.limite_isocrona.pack(side=tk.LEFT)
+        self.peso_isocrona = ttk.Combobox(fila_isocrona, values=["minutos (eta)", "km (distancia)"], state="readonly")
+        self.peso_isocrona.current(0)
+        self.peso_isocrona.pack(side=tk.LEFT, padx=(8,0), fill=tk.X, expand=True)
+        ttk.Button(self.left, text="Mostrar isócrona", command=self.mostrar_isocrona).pack(pady=(8,20), fill=tk.X)
         self.resultado = tk.Text(self.left, height=28, width=43, state="disabled")
         self.resultado.pack(pady=10, fill=tk.BOTH, expand=True)
 
@@ -92,7 +115,82 @@ class GrafoDijkstraApp(tk.Tk):
         self.resultado.configure(state="disabled")
         self.visualizar_grafo_dijkstra(origen, caminos)
 
-    def visualizar_grafo_dijkstra(self, origen, caminos):
+    def mostrar_camino(self):
+        origen = self.combo_origen.get()
+        destino = self.combo_destino.get()
+        if not origen or not destino:
+            messagebox.showwarning("Advertencia", "Debes seleccionar tanto el nodo de origen como el de destino.")
+            return
+
+        modo = "bidireccional" if self.bidireccional.get() else "unidireccional"
+        path, dist, tpo, algoname = calcular_camino_mas_corto(self.G, origen, destino, bidireccional=self.bidireccional.get())
+        self.resultado.configure(state="normal")
+        self.resultado.delete(1.0, tk.END)
+        if path:
+            self.resultado.insert(tk.END, f"Camino encontrado usando {algoname} ({modo}):\n")
+            self.resultado.insert(tk.END, " → ".join(path) + "\n\n")
+            self.resultado.insert(tk.END, f"Distancia total: {dist:.1f} km\n")
+            self.resultado.insert(tk.END, f"Tiempo estimado: {tpo:.1f} min\n")
+        else:
+            self.resultado.insert(tk.END, f"No hay camino entre {origen} y {destino}.\n")
+        self.resultado.configure(state="disabled")
+        self.visualizar_grafo_dijkstra(origen, {destino: path} if path else {}, destino)
+
+    def mostrar_alternativas(self):
+        origen = self.combo_origen.get()
+        destino = self.combo_destino.get()
+        if not origen or not destino:
+            messagebox.showwarning("Advertencia", "Debes seleccionar tanto el nodo de origen como el de destino.")
+            return
+        try:
+            k = int(self.cantidad_alternativas.get())
+        except ValueError:
+            messagebox.showwarning("Advertencia", "La cantidad de rutas debe ser un número entero.")
+            return
+
+        rutas = calcular_k_caminos(self.G, origen, destino, k)
+        self.resultado.configure(state="normal")
+        self.resultado.delete(1.0, tk.END)
+        if not rutas:
+            self.resultado.insert(tk.END, f"No hay camino entre {origen} y {destino}.\n")
+        for i, (path, dist, tpo) in enumerate(rutas, start=1):
+            self.resultado.insert(tk.END, f"Ruta {i}: {dist:.1f} km, {tpo:.1f} min\n")
+            self.resultado.insert(tk.END, " → ".join(path) + "\n\n")
+        self.resultado.configure(state="disabled")
+        self.visualizar_grafo_dijkstra(origen, {i: path for i, (path, _, _) in enumerate(rutas)}, destino,
+                                       titulo=f"{len(rutas)} rutas de {origen} a {destino} (Yen)")
+
+    def mostrar_isocrona(self):
+        origen = self.combo_origen.get()
+        if not origen:
+            messagebox.showwarning("Advertencia", "Debes seleccionar un nodo de origen.")
+            return
+        try:
+            limite = float(self.limite_isocrona.get().replace(",", "."))
+        except ValueError:
+            messagebox.showwarning("Advertencia", "El límite de la isócrona debe ser un número.")
+            return
+
+        peso = "eta" if self.peso_isocrona.current() == 0 else "distancia"
+        unidad = "min" if peso == "eta" else "km"
+        alcanzables = calcular_isocrona(self.G, origen, limite, peso)
+        self.resultado.configure(state="normal")
+        self.resultado.delete(1.0, tk.END)
+        self.resultado.insert(tk.END, f"{len(alcanzables) - 1} municipios a {limite:g} {unidad} o menos de {origen}:\n\n")
+        self.resultado.insert(tk.END, f"{'Destino':<25} {'Distancia (km)':>18} {'Tiempo (min)':>15}\n")
+        self.resultado.insert(tk.END, "-"*58 + "\n")
+        for destino, datos in alcanzables.items():
+            if destino == origen: continue
+            self.resultado.insert(
+                tk.END,
+                f"{destino:<25} {datos['distancia']:>13.1f} km {datos['eta']:>14.1f} min\n"
+            )
+        self.resultado.configure(state="disabled")
+        arbol = {v: [datos['pred'], v] for v, datos in alcanzables.items() if datos['pred'] is not None}
+        self.visualizar_grafo_dijkstra(origen, arbol, alcanzados=set(alcanzables),
+                                       titulo=f"Isócrona de {limite:g} {unidad} desde {origen}")
+
+    def visualizar_grafo_dijkstra(self, origen, caminos, destino=None, alcanzados=None, titulo=None):
         self.ax.clear()
         edges_en_camino = set()
         for path in caminos.values():
@@ -115,7 +213,8 @@ class GrafoDijkstraApp(tk.Tk):
 
         nx.draw_networkx_nodes(
             self.G, pos, ax=self.ax,
-            node_color=["orange" if n == origen else "skyblue" for n in self.G.nodes()],
+            node_color=["orange" if n == origen else ("green" if n == destino or (alcanzados and n in alcanzados) else "skyblue")
+                        for n in self.G.nodes()],
             node_size=650
         )
         nx.draw_networkx_labels(self.G, pos, ax=self.ax, font_size=10, font_family="DejaVu Sans")
@@ -131,7 +230,9 @@ class GrafoDijkstraApp(tk.Tk):
             font_size=6,
             font_family="DejaVu Sans"
         )
-        self.ax.set_title(f"Caminos más cortos desde {origen} (Dijkstra)", fontsize=18, fontfamily="DejaVu Sans")
+        if titulo is None:
+            titulo = f"Camino más corto de {origen} a {destino} (Dijkstra)" if destino else f"Caminos más cortos desde {origen} (Dijkstra)"
+        self.ax.set_title(titulo, fontsize=18, fontfamily="DejaVu Sans")
         self.ax.axis('off')
         self.fig.tight_layout()
         self.canvas.draw()
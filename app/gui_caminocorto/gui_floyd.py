@@ -5,7 +5,7 @@ matplotlib.use('TkAgg')
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 import networkx as nx
-from models.graph_logic import calcular_todos_caminos_floyd
+from models.graph_logic import calcular_todos_caminos_floyd, precalcular_todos_caminos, todos_caminos_listos
 
 class GrafoFloydApp(tk.Tk):
     def __init__(self, G, nodos):
@@ -19,6 +19,8 @@ class GrafoFloydApp(tk.Tk):
         self.nodos = nodos
         self._crear_layout()
         self._make_responsive()
+        # Todos los pares se calculan una vez en segundo plano mientras se eligen los nodos
+        self._calculo = precalcular_todos_caminos(self.G, "Floyd-Warshall") if self.G.number_of_nodes() else None
 
     def center_window(self, ancho, alto):
         ws = self.winfo_screenwidth()
@@ -75,6 +77,27 @@ class GrafoFloydApp(tk.Tk):
         self.rowconfigure(0, weight=1)
         self.columnconfigure(0, weight=1)
 
+    def _mostrar_calculando(self):
+        self.resultado.configure(state="normal")
+        self.resultado.delete(1.0, tk.END)
+        self.resultado.insert(tk.END, "Calculando caminos entre todos los pares...\n")
+        self.resultado.configure(state="disabled")
+        self.update_idletasks()
+
+    def _esperar_calculo(self, continuar, lanzado=False):
+        """Llama a continuar() cuando los caminos estén calculados, sin bloquear la interfaz"""
+        if todos_caminos_listos(self.G, "Floyd-Warshall"):
+            continuar()
+        elif self._calculo is not None and self._calculo.is_alive():
+            self.after(100, self._esperar_calculo, continuar, lanzado)
+        elif lanzado:
+            # El cálculo terminó sin resultado: la consulta muestra el error
+            continuar()
+        else:
+            self._mostrar_calculando()
+            self._calculo = precalcular_todos_caminos(self.G, "Floyd-Warshall")
+            self.after(100, self._esperar_calculo, continuar, True)
+
     def mostrar_camino(self):
         origen = self.combo_origen.get()
         destino = self.combo_destino.get()
@@ -87,6 +110,11 @@ class GrafoFloydApp(tk.Tk):
             messagebox.showwarning("Advertencia", "El nodo de origen y destino deben ser diferentes.")
             return
 
+        if not todos_caminos_listos(self.G, "Floyd-Warshall"):
+            self._mostrar_calculando()
+        self._esperar_calculo(lambda: self._mostrar_camino(origen, destino))
+
+    def _mostrar_camino(self, origen, destino):
         distancias, caminos, tiempos, nombre = calcular_todos_caminos_floyd(self.G)
 
         self.resultado.configure(state="normal")
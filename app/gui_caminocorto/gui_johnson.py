@@ -5,7 +5,7 @@ matplotlib.use('TkAgg')
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 import networkx as nx
-from models.graph_logic import calcular_todos_caminos_johnson
+from models.graph_logic import calcular_todos_caminos_johnson, precalcular_todos_caminos, todos_caminos_listos
 
 class GrafoJohnsonApp(tk.Tk):
     def __init__(self, G, nodos):
@@ -19,6 +19,8 @@ class GrafoJohnsonApp(tk.Tk):
         self.nodos = nodos
         self._crear_layout()
         self._make_responsive()
+        # Todos los pares se calculan una vez en segundo plano mientras se eligen los nodos
+        self._calculo = precalcular_todos_caminos(self.G, "Johnson") if self.G.number_of_nodes() else None
 
     def center_window(self, ancho, alto):
         ws = self.winfo_screenwidth()
@@ -67,12 +69,38 @@ class GrafoJohnsonApp(tk.Tk):
         self.rowconfigure(0, weight=1)
         self.columnconfigure(0, weight=1)
 
+    def _mostrar_calculando(self):
+        self.resultado.configure(state="normal")
+        self.resultado.delete(1.0, tk.END)
+        self.resultado.insert(tk.END, "Calculando caminos entre todos los pares...\n")
+        self.resultado.configure(state="disabled")
+        self.update_idletasks()
+
+    def _esperar_calculo(self, continuar, lanzado=False):
+        """Llama a continuar() cuando los caminos estén calculados, sin bloquear la interfaz"""
+        if todos_caminos_listos(self.G, "Johnson"):
+            continuar()
+        elif self._calculo is not None and self._calculo.is_alive():
+            self.after(100, self._esperar_calculo, continuar, lanzado)
+        elif lanzado:
+            # El cálculo terminó sin resultado: la consulta muestra el error
+            continuar()
+        else:
+            self._mostrar_calculando()
+            self._calculo = precalcular_todos_caminos(self.G, "Johnson")
+            self.after(100, self._esperar_calculo, continuar, True)
+
     def mostrar_caminos(self):
         origen = self.combo_origen.get()
         if not origen:
             messagebox.showwarning("Advertencia", "Debes seleccionar un nodo de origen.")
             return
 
+        if not todos_caminos_listos(self.G, "Johnson"):
+            self._mostrar_calculando()
+        self._esperar_calculo(lambda: self._mostrar_caminos(origen))
+
+    def _mostrar_caminos(self, origen):
         distancias, caminos, tiempos, algoname = calcular_todos_caminos_johnson(self.G)
         if origen not in distancias:
             messagebox.showerror("Error", f"No hay caminos desde {origen}.")
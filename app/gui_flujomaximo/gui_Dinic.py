@@ -105,12 +105,14 @@ class GrafoDinicApp(tk.Tk):
         self.resultado.insert(tk.END, "=" * 58 + "\n\n")
         flujo_maximo = self.resultado_flujo['max_flow']
         self.resultado.insert(tk.END, f"Flujo Máximo Total: {flujo_maximo:.2f} unidades\n")
-        self.resultado.insert(tk.END, f"Etapas de aumento encontradas: {len(self.resultado_flujo['flow_paths'])}\n\n")
+        self.resultado.insert(tk.END, f"Fases (flujos bloqueantes): {self.resultado_flujo['phases']}\n")
+        self.resultado.insert(tk.END, f"Caminos de aumento encontrados: {len(self.resultado_flujo['flow_paths'])}\n\n")
         self.resultado.insert(tk.END, "AUMENTOS DE FLUJO:\n")
         self.resultado.insert(tk.END, "-" * 58 + "\n")
         for i, path_info in enumerate(self.resultado_flujo['flow_paths'], 1):
             flow = path_info['flow']
-            self.resultado.insert(tk.END, f"{i}. Flujo aumentado: {flow:.2f} unidades\n")
+            self.resultado.insert(tk.END, f"{i}. [Fase {path_info['phase']}] {' → '.join(path_info['path'])}\n")
+            self.resultado.insert(tk.END, f"   Flujo aumentado: {flow:.2f} unidades\n\n")
 
         self.resultado.insert(tk.END, "\nUTILIZACIÓN DE ARISTAS:\n")
         self.resultado.insert(tk.END, "-" * 58 + "\n")
@@ -141,7 +141,8 @@ class GrafoFordFulkersonApp(tk.Toplevel):
             self.result_text.insert(tk.END, "No existe ningún camino entre los nodos seleccionados.")
             self.result_text.config(state=tk.DISABLED)
             return
-        ff = FordFulkerson(G_redirigido)
+        # Escalamiento de capacidad: pocos caminos grandes en vez de muchos aumentos pequeños
+        ff = FordFulkerson(G_redirigido, escalado=True)
 
         self.resultado = ff.compute_max_flow(fuente, sumidero)
 
@@ -170,7 +171,10 @@ class GrafoFordFulkersonApp(tk.Toplevel):
                     flow_val = path.get('flow', None) if isinstance(path, dict) else None
                     if flow_val is not None:
                         self.result_text.insert(tk.END, f"{i}. {path_str}\n")
-                        self.result_text.insert(tk.END, f"   Flujo: {flow_val:.2f}\n\n")
+                        self.result_text.insert(tk.END, f"   Flujo: {flow_val:.2f}")
+                        if path.get('delta'):
+                            self.result_text.insert(tk.END, f" (fase Δ = {path['delta']})")
+                        self.result_text.insert(tk.END, "\n\n")
                     else:
                         self.result_text.insert(tk.END, f"{i}. {path_str}\n")
                         self.result_text.insert(tk.END, f"   Flujo: No disponible\n\n")
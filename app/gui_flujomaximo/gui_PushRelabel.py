@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from algorithms.flujomaximo.PushRelabel import push_relabel
+from algorithms.flujomaximo.PushRelabel import push_relabel, reproducir_traza
 import matplotlib
 matplotlib.use('TkAgg')
 import matplotlib.pyplot as plt
@@ -90,7 +90,8 @@ class GrafoPushRelabelApp(tk.Tk):
         G_redirigido = redireccionar_grafo_favor_flujo(self.G, fuente, sumidero)
 
         try:
-            self.resultado_flujo = push_relabel(G_redirigido, fuente, sumidero)
+            # Solo las últimas descargas, guardadas como cambios de exceso
+            self.resultado_flujo = push_relabel(G_redirigido, fuente, sumidero, traza='anillo', capacidad=500)
         except Exception as e:
             messagebox.showerror("Error", f"Error en el cálculo: {e}")
             return
@@ -106,13 +107,16 @@ class GrafoPushRelabelApp(tk.Tk):
         self.resultado.insert(tk.END, "=" * 58 + "\n\n")
         flujo_maximo = self.resultado_flujo['max_flow']
         self.resultado.insert(tk.END, f"Flujo Máximo Total: {flujo_maximo:.2f} unidades\n")
-        self.resultado.insert(tk.END, f"Etapas de preflujo: {len(self.resultado_flujo['flow_steps'])}\n\n")
+        pasos = self.resultado_flujo['flow_steps']
+        total = pasos[-1]['step'] if pasos else 0
+        self.resultado.insert(tk.END, f"Etapas de preflujo: {total} (se muestran las últimas {len(pasos)})\n\n")
         self.resultado.insert(tk.END, "ETAPAS DE EXCESO:\n")
         self.resultado.insert(tk.END, "-" * 58 + "\n")
-        for i, step in enumerate(self.resultado_flujo['flow_steps'], 1):
+        for step, excess in reproducir_traza(self.resultado_flujo):
             node = step['node']
-            excess = step['excess']
-            self.resultado.insert(tk.END, f"{i}. Nodo: {node}, Exceso: {excess[node]:.2f}\n")
+            activos = sum(1 for n, e in excess.items() if e > 0 and n not in (fuente, sumidero))
+            self.resultado.insert(tk.END, f"{step['step']}. Nodo: {node}, En sumidero: "
+                                          f"{excess.get(sumidero, 0):.2f}, Activos: {activos}\n")
 
         self.resultado.insert(tk.END, "\nUTILIZACIÓN DE ARISTAS:\n")
         self.resultado.insert(tk.END, "-" * 58 + "\n")
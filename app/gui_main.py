@@ -1,14 +1,12 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from models.graph_logic import cargar_grafo
-from models.graph_logic import cargar_grafo_flujo
+from models.graph_logic import cargar_red
 import matplotlib
 matplotlib.use('TkAgg')
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.backends._backend_tk import NavigationToolbar2Tk
 import networkx as nx
-import pandas as pd
 
 class MainApp(tk.Tk):
     def __init__(self):
@@ -162,20 +160,8 @@ class MainApp(tk.Tk):
                     foreground="blue"
                 )
                 
-                # Primero verificar si el archivo tiene la columna de flujo
-                with open(file_path, encoding='latin1') as f:
-                    primer_linea = f.readline()
-                    sep = '\t' if '\t' in primer_linea else ';'
-                
-                df = pd.read_csv(file_path, sep=sep, encoding='latin1')
-                df.columns = df.columns.str.strip()
-                
-                # Verificar si tiene la columna de flujo
-                self.tiene_flujo = 'flujo (und)' in df.columns
-                
-                # Cargar los grafos
-                self.G = cargar_grafo(file_path)
-                self.GD = cargar_grafo_flujo(file_path)
+                # Un solo análisis del archivo para ambos grafos y el indicador de flujo
+                self.G, self.GD, self.tiene_flujo = cargar_red(file_path)
                 self.nodos = sorted(list(self.G.nodes()))
                 self.nodos_flujo = sorted(list(self.GD.nodes()))
                 self.visualizar_grafo_completo()
@@ -0,0 +1,57 @@
+"""
+A* de networkx (astar_path + astar_path_length con la heurística euclídea) contra A* de una
+sola búsqueda sobre el CSR, con heurística euclídea y con landmarks (ALT).
+
+Uso: python -m benchmarks.bench_astar [lado] [consultas]
+"""
+import sys
+import time
+
+import networkx as nx
+
+from algorithms.caminocorto.astar import MotorAStar, heuristica, heuristica_euclidea, obtener_landmarks
+from algorithms.grafo_csr import obtener_csr
+from benchmarks.redes import pares_aleatorios, red_vial
+
+
+def astar_networkx(G, s, t):
+    h = lambda u, v: heuristica(u, v, G)
+    nx.astar_path(G, s, t, heuristic=h, weight='distancia')
+    return nx.astar_path_length(G, s, t, heuristic=h, weight='distancia'), None
+
+
+def main(lado, consultas):
+    G = red_vial(lado)
+    csr = obtener_csr(G)
+    pares = pares_aleatorios(G, consultas)
+    inicio = time.perf_counter()
+    alt = obtener_landmarks(csr)
+    print(f"{csr.n} nodos; {len(alt.landmarks)} landmarks en {time.perf_counter() - inicio:.1f} s")
+    motor = MotorAStar(csr)
+
+    def astar_csr(s, t, heuristica_de):
+        s, t = csr.indice[s], csr.indice[t]
+        motor.buscar(s, t, heuristica_de(t))
+        return motor.dist[t], motor.asentados
+
+    metodos = [
+        ("networkx (2 búsquedas)", lambda s, t: astar_networkx(G, s, t)),
+        ("CSR euclídea", lambda s, t: astar_csr(s, t, lambda t: heuristica_euclidea(csr, t))),
+        ("CSR sin heurística", lambda s, t: astar_csr(s, t, lambda t: lambda v: 0.0)),
+        ("CSR ALT", lambda s, t: astar_csr(s, t, alt.heuristica)),
+    ]
+    referencia = None
+    for nombre, consulta in metodos:
+        inicio = time.perf_counter()
+        resultados = [consulta(s, t) for s, t in pares]
+        segundos = (time.perf_counter() - inicio) / consultas
+        distancias = [d for d, _ in resultados]
+        referencia = referencia or distancias
+        assert all(abs(a - b) < 1e-6 for a, b in zip(referencia, distancias))
+        asentados = "-" if resultados[0][1] is None else f"{sum(a for _, a in resultados) / consultas:.0f}"
+        print(f"{nombre:<24} {segundos * 1e3:>8.1f} ms/consulta {asentados:>9} nodos asentados")
+
+
+if __name__ == "__main__":
+    argumentos = [int(x) for x in sys.argv[1:]]
+    main(*(argumentos + [200, 30][len(argumentos):]))
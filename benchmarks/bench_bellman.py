@@ -0,0 +1,42 @@
+"""
+Bellman-Ford de networkx (caminos completos + suma del ETA por camino) contra el Bellman-Ford
+en Python puro sobre el CSR, en modo cola (SPFA) y en modo de pasadas con salida temprana.
+
+Uso: python -m benchmarks.bench_bellman [lado] [origenes]
+"""
+import sys
+import time
+
+import networkx as nx
+
+from algorithms.caminocorto.bellman_ford import bellman_ford_csr
+from algorithms.grafo_csr import obtener_csr
+from benchmarks.redes import pares_aleatorios, red_vial
+
+
+def bellman_networkx(G, origen):
+    _, paths = nx.single_source_bellman_ford(G, origen, weight='distancia')
+    for path in paths.values():
+        sum(G[a][b]['eta'] for a, b in zip(path, path[1:]))
+
+
+def main(lado, origenes):
+    G = red_vial(lado)
+    csr = obtener_csr(G)
+    fuentes = [s for s, _ in pares_aleatorios(G, origenes)]
+    print(f"{csr.n} nodos, {csr.m} arcos")
+    metodos = [
+        ("networkx", lambda s: bellman_networkx(G, s)),
+        ("CSR cola (SPFA)", lambda s: bellman_ford_csr(csr, csr.indice[s], "cola")),
+        ("CSR pasadas", lambda s: bellman_ford_csr(csr, csr.indice[s], "pasadas")),
+    ]
+    for nombre, calcular in metodos:
+        inicio = time.perf_counter()
+        for s in fuentes:
+            calcular(s)
+        print(f"{nombre:<20} {(time.perf_counter() - inicio) / origenes * 1e3:>8.1f} ms/origen")
+
+
+if __name__ == "__main__":
+    argumentos = [int(x) for x in sys.argv[1:]]
+    main(*(argumentos + [60, 5][len(argumentos):]))
@@ -0,0 +1,44 @@
+"""
+Nodos asentados y latencia de Dijkstra unidireccional contra bidireccional en
+consultas punto a punto.
+
+Uso: python -m benchmarks.bench_bidireccional [lado] [consultas]
+"""
+import sys
+import time
+
+from algorithms.caminocorto.dijkstra import MotorDijkstra, MotorDijkstraBidireccional, obtener_motor
+from algorithms.grafo_csr import obtener_csr
+from benchmarks.redes import pares_aleatorios, red_vial
+
+
+def main(lado, consultas):
+    G = red_vial(lado)
+    csr = obtener_csr(G)
+    pares = [(csr.indice[s], csr.indice[t]) for s, t in pares_aleatorios(G, consultas)]
+    print(f"{csr.n} nodos, {G.number_of_edges()} aristas, {consultas} consultas")
+
+    uni = obtener_motor(csr, MotorDijkstra)
+    bi = obtener_motor(csr, MotorDijkstraBidireccional)
+    totales = {}
+    for nombre, consulta in [
+        ("unidireccional", lambda s, t: (uni.buscar(s, t), uni.dist[t], uni.asentados)),
+        ("bidireccional", lambda s, t: (None, bi.buscar(s, t)[0], bi.asentados)),
+    ]:
+        inicio = time.perf_counter()
+        asentados = 0
+        distancias = []
+        for s, t in pares:
+            _, d, a = consulta(s, t)
+            asentados += a
+            distancias.append(d)
+        segundos = time.perf_counter() - inicio
+        totales[nombre] = distancias
+        print(f"{nombre:<15} {asentados / consultas:>10.0f} nodos asentados/consulta"
+              f" {segundos / consultas * 1e3:>9.1f} ms/consulta")
+    assert all(abs(a - b) < 1e-6 for a, b in zip(totales["unidireccional"], totales["bidireccional"]))
+
+
+if __name__ == "__main__":
+    argumentos = [int(x) for x in sys.argv[1:]]
+    main(*(argumentos + [320, 30][len(argumentos):]))
@@ -0,0 +1,68 @@
+"""
+Compara la carga fila por fila (iterrows + add_edge) contra la carga columnar
+de models/graph_logic.py y contra la lectura desde el snapshot binario, a medida
+que crece el número de filas del CSV.
+
+Uso: python -m benchmarks.bench_carga [filas ...]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+import networkx as nx
+import pandas as pd
+
+from models.graph_logic import COORDS, _leer_tabla, cargar_grafo, normaliza
+
+
+def generar_csv(path, filas, semilla=0):
+    """Escribe un CSV sintético con el mismo formato que data/rutas_norte_sur_flujo.csv"""
+    rnd = random.Random(semilla)
+    municipios = [k.lower() for k in COORDS] + [f"municipio {i}" for i in range(max(50, filas // 20))]
+    with open(path, 'w', encoding='latin1') as f:
+        f.write("origen;destino;distancia(km);ETA(min);flujo (und)\n")
+        for _ in range(filas):
+            u, v = rnd.sample(municipios, 2)
+            d = round(rnd.uniform(5, 120), 1)
+            f.write(f"{u};{v};{d};{int(d * 1.4)};{rnd.randint(50, 300)}\n")
+
+
+def cargar_grafo_iterrows(csv_path):
+    """Implementación anterior, conservada solo como referencia para la comparación"""
+    df = pd.read_csv(csv_path, sep=None, engine='python', encoding='latin1')
+    G = nx.Graph()
+    for _, row in df.iterrows():
+        G.add_edge(normaliza(row['origen']), normaliza(row['destino']),
+                   distancia=float(row['distancia(km)']), eta=float(row['ETA(min)']),
+                   flujo=float(row['flujo (und)']))
+    return G
+
+
+def medir(funcion, csv_path):
+    inicio = time.perf_counter()
+    G = funcion(csv_path)
+    return time.perf_counter() - inicio, G
+
+
+def main(tamanos):
+    print(f"{'Filas':>10} {'iterrows (s)':>14} {'columnar (s)':>14} {'Aceleración':>12}"
+          f" {'tabla CSV (s)':>14} {'tabla snapshot (s)':>19}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for filas in tamanos:
+            path = os.path.join(tmp, f"rutas_{filas}.csv")
+            generar_csv(path, filas)
+            t_viejo, G_viejo = medir(cargar_grafo_iterrows, path)
+            t_nuevo, G_nuevo = medir(lambda p: cargar_grafo(p, usar_snapshot=False), path)
+            assert sorted(G_viejo.edges(data=True)) == sorted(
+                (u, v, {k: d[k] for k in ('distancia', 'eta', 'flujo')}) for u, v, d in G_nuevo.edges(data=True)
+            )
+            t_csv, _ = medir(_leer_tabla, path)  # primera lectura: parsea y guarda el snapshot
+            t_snap, _ = medir(_leer_tabla, path)
+            print(f"{filas:>10} {t_viejo:>14.3f} {t_nuevo:>14.3f} {t_viejo / t_nuevo:>11.1f}x"
+                  f" {t_csv:>14.3f} {t_snap:>19.3f}")
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or [1_000, 10_000, 100_000])
@@ -0,0 +1,49 @@
+"""
+Preproceso y latencia de Contraction Hierarchies frente a MotorDijkstra (uni y bidireccional).
+
+Uso: python -m benchmarks.bench_ch [lado] [consultas]
+"""
+import sys
+import time
+
+from algorithms.caminocorto.contraction_hierarchies import JerarquiaContraccion
+from algorithms.caminocorto.dijkstra import MotorDijkstra, MotorDijkstraBidireccional
+from algorithms.grafo_csr import obtener_csr
+from benchmarks.redes import pares_aleatorios, red_vial
+
+
+def main(lado, consultas):
+    G = red_vial(lado)
+    csr = obtener_csr(G)
+    pares = [(csr.indice[s], csr.indice[t]) for s, t in pares_aleatorios(G, consultas)]
+    inicio = time.perf_counter()
+    jerarquia = JerarquiaContraccion.construir(csr)
+    print(f"{csr.n} nodos, {csr.m} arcos; preproceso {time.perf_counter() - inicio:.1f} s,"
+          f" {len(jerarquia.arriba[1]) + len(jerarquia.abajo[1])} arcos en la jerarquía")
+
+    uni, bi = MotorDijkstra(csr), MotorDijkstraBidireccional(csr)
+
+    def dijkstra(s, t):
+        uni.buscar(s, t)
+        return uni.dist[t], uni.asentados
+
+    metodos = [
+        ("Dijkstra", dijkstra),
+        ("Dijkstra bidireccional", lambda s, t: (bi.buscar(s, t)[0], bi.asentados)),
+        ("Contraction Hierarchies", lambda s, t: (jerarquia.consultar(s, t)[0], jerarquia.asentados)),
+    ]
+    referencia = None
+    for nombre, consulta in metodos:
+        inicio = time.perf_counter()
+        resultados = [consulta(s, t) for s, t in pares]
+        segundos = (time.perf_counter() - inicio) / consultas
+        distancias = [d for d, _ in resultados]
+        referencia = referencia or distancias
+        assert all(abs(a - b) < 1e-6 for a, b in zip(referencia, distancias))
+        asentados = sum(a for _, a in resultados) / consultas
+        print(f"{nombre:<24} {segundos * 1e6:>10.0f} µs/consulta {asentados:>9.0f} nodos asentados")
+
+
+if __name__ == "__main__":
+    argumentos = [int(x) for x in sys.argv[1:]]
+    main(*(argumentos + [100, 200][len(argumentos):]))
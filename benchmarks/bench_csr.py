@@ -0,0 +1,86 @@
+"""
+Memoria y velocidad de recorrido del GrafoCSR frente al nx.Graph del que se construye.
+
+Uso: python -m benchmarks.bench_csr [lado]
+"""
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+import numpy as np
+
+from algorithms.grafo_csr import GrafoCSR
+from benchmarks.redes import red_vial
+
+
+def memoria(funcion):
+    tracemalloc.start()
+    resultado = funcion()
+    usado, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, usado / 2**20
+
+
+def bfs_networkx(G, origen):
+    vistos = {origen}
+    cola = deque([origen])
+    while cola:
+        u = cola.popleft()
+        for v in G[u]:
+            if v not in vistos:
+                vistos.add(v)
+                cola.append(v)
+    return len(vistos)
+
+
+def bfs_csr(csr, origen):
+    offsets, destinos, _, _ = csr.listas()
+    visto = [False] * csr.n
+    visto[origen] = True
+    cola = deque([origen])
+    total = 1
+    while cola:
+        u = cola.popleft()
+        for v in destinos[offsets[u]:offsets[u + 1]]:
+            if not visto[v]:
+                visto[v] = True
+                total += 1
+                cola.append(v)
+    return total
+
+
+def suma_networkx(G):
+    return sum(d['distancia'] for u in G for d in G[u].values())
+
+
+def cronometro(funcion, repeticiones=5):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        resultado = funcion()
+    return (time.perf_counter() - inicio) / repeticiones, resultado
+
+
+def main(lado):
+    G, mem_nx = memoria(lambda: red_vial(lado))
+    csr, mem_csr = memoria(lambda: GrafoCSR.desde_networkx(G))
+    print(f"{G.number_of_nodes()} nodos, {G.number_of_edges()} aristas")
+    print(f"Memoria nx.Graph: {mem_nx:8.1f} MB ({mem_nx * 2**20 / G.number_of_edges():.0f} B/arista)")
+    print(f"Memoria CSR:      {mem_csr:8.1f} MB (arreglos: {csr.nbytes() / 2**20:.1f} MB,"
+          f" {csr.nbytes() / G.number_of_edges():.0f} B/arista)")
+
+    origen = next(iter(G))
+    t_nx, a = cronometro(lambda: bfs_networkx(G, origen))
+    csr.listas()
+    t_csr, b = cronometro(lambda: bfs_csr(csr, csr.indice[origen]))
+    assert a == b
+    print(f"BFS completo      nx: {t_nx * 1e3:8.1f} ms   CSR: {t_csr * 1e3:8.1f} ms   ({t_nx / t_csr:.1f}x)")
+
+    t_nx, a = cronometro(lambda: suma_networkx(G))
+    t_csr, b = cronometro(lambda: float(np.sum(csr.distancia)))
+    assert abs(a - b) < 1e-6 * a
+    print(f"Suma de pesos     nx: {t_nx * 1e3:8.1f} ms   CSR: {t_csr * 1e3:8.1f} ms   ({t_nx / t_csr:.0f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
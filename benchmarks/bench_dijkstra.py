@@ -0,0 +1,48 @@
+"""
+Latencia de consultas punto a punto: dijkstra_path + dijkstra_path_length de networkx
+(dos búsquedas y suma del ETA por aristas) contra MotorDijkstra sobre el CSR.
+
+Uso: python -m benchmarks.bench_dijkstra [lado] [consultas]
+"""
+import sys
+import time
+
+import networkx as nx
+
+from algorithms.caminocorto.dijkstra import shortest_path_dijkstra
+from algorithms.grafo_csr import obtener_csr
+from benchmarks.redes import pares_aleatorios, red_vial
+
+
+def dijkstra_networkx(G, origen, destino):
+    path = nx.dijkstra_path(G, origen, destino, weight='distancia')
+    distancia = nx.dijkstra_path_length(G, origen, destino, weight='distancia')
+    tiempo = sum(G[path[i]][path[i + 1]]['eta'] for i in range(len(path) - 1))
+    return path, distancia, tiempo
+
+
+def latencia(funcion, pares):
+    resultados = []
+    inicio = time.perf_counter()
+    for s, t in pares:
+        resultados.append(funcion(s, t)[1])
+    return (time.perf_counter() - inicio) / len(pares), resultados
+
+
+def main(lado, consultas):
+    G = red_vial(lado)
+    inicio = time.perf_counter()
+    obtener_csr(G)
+    print(f"{G.number_of_nodes()} nodos, {G.number_of_edges()} aristas;"
+          f" CSR construido en {time.perf_counter() - inicio:.2f} s")
+    pares = pares_aleatorios(G, consultas)
+    t_nx, a = latencia(lambda s, t: dijkstra_networkx(G, s, t), pares)
+    t_motor, b = latencia(lambda s, t: shortest_path_dijkstra(G, s, t), pares)
+    assert all(abs(x - y) < 1e-6 for x, y in zip(a, b))
+    print(f"networkx (2 búsquedas): {t_nx * 1e3:8.1f} ms/consulta")
+    print(f"MotorDijkstra:          {t_motor * 1e3:8.1f} ms/consulta ({t_nx / t_motor:.1f}x)")
+
+
+if __name__ == "__main__":
+    argumentos = [int(x) for x in sys.argv[1:]]
+    main(*(argumentos + [320, 20][len(argumentos):]))
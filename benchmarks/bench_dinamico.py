@@ -0,0 +1,118 @@
+"""
+Ediciones "qué pasa si" (cierres de tramos y cambios de distancia/ETA): recalcular desde cero
+(CSR, árboles de Dijkstra y Floyd-Warshall) contra reparar solo lo afectado con el módulo dinámico.
+
+Uso: python -m benchmarks.bench_dinamico [lado] [ediciones] [arboles]
+"""
+import random
+import sys
+import time
+
+import numpy as np
+
+from algorithms.grafo_csr import marcar_modificado, obtener_csr
+from algorithms.caminocorto.dijkstra import arbol_caminos_dijkstra
+from algorithms.caminocorto.dinamico import editar_aristas, reparar_arbol, reparar_tabla
+from algorithms.caminocorto.floyd_warshall import floyd_warshall_matrices
+from benchmarks.redes import red_vial
+
+
+def ediciones_aleatorias(G, cantidad, semilla=7):
+    """Una arista por edición: se cierra, sube o baja su distancia, o cambia solo su ETA"""
+    azar = random.Random(semilla)
+    ediciones = []
+    for u, v in azar.sample(list(G.edges), cantidad):
+        tipo = azar.random()
+        if tipo < 0.25:
+            ediciones.append({(u, v): None})
+        elif tipo < 0.75:
+            ediciones.append({(u, v): {'distancia': G[u][v]['distancia'] * azar.uniform(0.3, 3)}})
+        else:
+            ediciones.append({(u, v): {'eta': G[u][v]['eta'] * azar.uniform(0.5, 2)}})
+    return ediciones
+
+
+def aplicar_en_networkx(G, cambios):
+    for (u, v), pesos in cambios.items():
+        if pesos is None:
+            G.remove_edge(u, v)
+        else:
+            G[u][v].update(pesos)
+    marcar_modificado(G)
+
+
+def _pesos_del_camino(csr, camino):
+    """(distancia, ETA) sumados a lo largo de un camino de ids, por el arco más corto de cada tramo"""
+    distancia = eta = 0.0
+    for u, v in zip(camino, camino[1:]):
+        arco = min(csr.arcos_entre(u, v), key=lambda i: csr.distancia[i])
+        distancia += csr.distancia[arco]
+        eta += csr.eta[arco]
+    return distancia, eta
+
+
+def _comparar(nombre, dist, tiempo, ref_dist, ref_tiempo, camino, csr, rtol):
+    """
+    Las distancias deben ser las de recalcular. El ETA puede diferir solo en empates: otro
+    camino igual de corto, y entonces debe ser el ETA del camino que se devuelve.
+    """
+    assert np.allclose(dist, ref_dist, rtol=rtol), f"{nombre}: distancias distintas"
+    for k in np.argwhere(~np.isclose(tiempo, ref_tiempo, rtol=rtol)):
+        k = tuple(int(x) for x in k)
+        d, eta = _pesos_del_camino(csr, camino(*k))
+        assert np.isclose(d, ref_dist[k], rtol=rtol) and np.isclose(eta, tiempo[k], rtol=rtol), \
+            f"{nombre}: ETA distinto en {k}"
+
+
+def comprobar(G, H, origenes, arboles, tabla):
+    """Los árboles y la tabla reparados sobre G deben coincidir con recalcularlos desde cero sobre H"""
+    for o, arbol in zip(origenes, arboles):
+        ref = arbol_caminos_dijkstra(H, o)
+        orden = [arbol.csr.indice[n] for n in ref.csr.nodos]
+        _comparar(f"árbol desde {o}", np.asarray(arbol.dist)[orden], np.asarray(arbol.tiempo)[orden],
+                  np.asarray(ref.dist), np.asarray(ref.tiempo), lambda j: arbol.camino_ids(orden[j]),
+                  arbol.csr, 1e-9)
+    ref = floyd_warshall_matrices(H, compacta=True)
+    orden = [tabla.indice[n] for n in ref.nodos]
+    dist, tiempo, _ = tabla.filas(orden)
+    ref_dist, ref_tiempo, _ = ref.filas(np.arange(len(orden)))
+    _comparar("tabla", dist[:, orden], tiempo[:, orden], ref_dist, ref_tiempo,
+              lambda i, j: tabla.camino_ids(orden[i], orden[j]), obtener_csr(G), 1e-4)
+
+
+def main(lado, cantidad, arboles):
+    G = red_vial(lado)
+    origenes = random.Random(3).sample(list(G.nodes), arboles)
+    ediciones = ediciones_aleatorias(G, cantidad)
+    print(f"{G.number_of_nodes()} nodos, {cantidad} ediciones, {arboles} árboles + tabla de todos los pares")
+
+    H = G.copy()
+    inicio = time.perf_counter()
+    for cambios in ediciones:
+        aplicar_en_networkx(H, cambios)
+        obtener_csr(H)
+        for o in origenes:
+            arbol_caminos_dijkstra(H, o)
+        floyd_warshall_matrices(H, compacta=True)
+    completo = (time.perf_counter() - inicio) / cantidad
+    print(f"{'Recalcular todo':<20} {completo * 1e3:>9.1f} ms/edición")
+
+    tabla = floyd_warshall_matrices(G, compacta=True)
+    actuales = [arbol_caminos_dijkstra(G, o) for o in origenes]
+    reparado = 0.0
+    for cambios in ediciones:
+        inicio = time.perf_counter()
+        edicion = editar_aristas(G, cambios)
+        actuales = [reparar_arbol(a, edicion) for a in actuales]
+        reparar_tabla(tabla, edicion)
+        reparado += time.perf_counter() - inicio
+    reparado /= cantidad
+    print(f"{'Reparar afectados':<20} {reparado * 1e3:>9.1f} ms/edición "
+          f"(x{completo / reparado:.1f})")
+    comprobar(G, H, origenes, actuales, tabla)
+    print("Resultados reparados iguales a recalcular desde cero")
+
+
+if __name__ == "__main__":
+    argumentos = [int(x) for x in sys.argv[1:]]
+    main(*(argumentos + [30, 20, 20][len(argumentos):]))
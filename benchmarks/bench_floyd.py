@@ -0,0 +1,45 @@
+"""
+Floyd-Warshall de networkx (distancias + predecesores + caminos y ETA armados en Python) contra
+Floyd-Warshall vectorizado con matriz de predecesores, completo y por bloques de filas.
+
+Uso: python -m benchmarks.bench_floyd [lado]
+"""
+import sys
+import time
+
+import networkx as nx
+
+from algorithms.caminocorto.floyd_warshall import floyd_warshall_matrices
+from benchmarks.redes import red_vial
+
+
+def floyd_networkx(G):
+    """Lo que hacía shortest_paths_floyd_warshall antes: dos corridas de nx y todos los caminos"""
+    distancias = nx.floyd_warshall(G, weight='distancia')
+    predecesores = nx.floyd_warshall_predecessor_and_distance(G, weight='distancia')[0]
+    tiempos = {}
+    for u in distancias:
+        tiempos[u] = {}
+        for v in predecesores[u]:
+            path = nx.reconstruct_path(u, v, predecesores)
+            tiempos[u][v] = sum(G[a][b]['eta'] for a, b in zip(path, path[1:]))
+    return distancias
+
+
+def main(lado):
+    G = red_vial(lado)
+    print(f"{G.number_of_nodes()} nodos, {G.number_of_edges()} aristas")
+    metodos = [
+        ("numpy por bloques (64)", lambda: floyd_warshall_matrices(G, 64).dist),
+        ("numpy matriz completa", lambda: floyd_warshall_matrices(G, None).dist),
+    ]
+    if G.number_of_nodes() <= 400:
+        metodos.insert(0, ("networkx", lambda: floyd_networkx(G)))
+    for nombre, calcular in metodos:
+        inicio = time.perf_counter()
+        calcular()
+        print(f"{nombre:<24} {time.perf_counter() - inicio:>8.2f} s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 30)
@@ -0,0 +1,56 @@
+"""
+Flujo máximo: los cuatro algoritmos sobre la red residual de arcos en pareja (RedResidual)
+contra los de networkx, que arman un grafo residual de diccionarios en cada consulta.
+
+Uso: python -m benchmarks.bench_flujo [lado] [consultas]
+"""
+import sys
+import time
+
+import networkx as nx
+from networkx.algorithms import flow
+
+from algorithms.flujomaximo.Dinic import dinic
+from algorithms.flujomaximo.Edmonds_Karp import edmonds_karp
+from algorithms.flujomaximo.Ford_Fulkerson import FordFulkerson
+from algorithms.flujomaximo.PushRelabel import push_relabel, reproducir_traza
+from algorithms.grafo_csr import obtener_csr
+from benchmarks.redes import pares_aleatorios, red_vial
+
+
+def con_traza(G, s, t, traza):
+    """Push-relabel con traza; comprueba que la reproducción termina con el flujo máximo en el sumidero"""
+    resultado = push_relabel(G, s, t, traza=traza)
+    ultimo = {}
+    for _, exceso in reproducir_traza(resultado):
+        ultimo = exceso
+    assert ultimo.get(t, 0) == resultado['max_flow'], (traza, s, t, ultimo.get(t, 0), resultado['max_flow'])
+    return resultado['max_flow']
+
+
+def main(lado, consultas):
+    G = red_vial(lado, dirigido=True)
+    csr = obtener_csr(G)
+    pares = pares_aleatorios(G, consultas)
+    print(f"{csr.n} nodos, {csr.m} arcos, {consultas} consultas")
+    metodos = [
+        ("networkx Edmonds-Karp", lambda s, t: nx.maximum_flow_value(G, s, t, flow_func=flow.edmonds_karp)),
+        ("networkx Dinitz", lambda s, t: nx.maximum_flow_value(G, s, t, flow_func=flow.dinitz)),
+        ("networkx preflow-push", lambda s, t: nx.maximum_flow_value(G, s, t, flow_func=flow.preflow_push)),
+        ("Ford-Fulkerson", lambda s, t: FordFulkerson(G).compute_max_flow(s, t)['max_flow']),
+        ("Ford-Fulkerson escalado", lambda s, t: FordFulkerson(G, escalado=True).compute_max_flow(s, t)['max_flow']),
+        ("Edmonds-Karp", lambda s, t: edmonds_karp(G, s, t)['max_flow']),
+        ("Dinic", lambda s, t: dinic(G, s, t)['max_flow']),
+        ("Push-Relabel", lambda s, t: push_relabel(G, s, t)['max_flow']),
+        ("Push-Relabel (muestreo)", lambda s, t: con_traza(G, s, t, 'muestreo')),
+        ("Push-Relabel (anillo)", lambda s, t: con_traza(G, s, t, 'anillo')),
+    ]
+    for nombre, calcular in metodos:
+        inicio = time.perf_counter()
+        total = sum(calcular(s, t) for s, t in pares)
+        print(f"{nombre:<24} {(time.perf_counter() - inicio) / consultas * 1e3:>9.1f} ms/consulta (suma {total:.0f})")
+
+
+if __name__ == "__main__":
+    argumentos = [int(x) for x in sys.argv[1:]]
+    main(*(argumentos + [20, 10][len(argumentos):]))
@@ -0,0 +1,39 @@
+"""
+Isócronas: Dijkstra completo desde el origen y filtrado por el límite contra la búsqueda
+acotada de MotorIsocrona, que solo recorre la vecindad alcanzable.
+
+Uso: python -m benchmarks.bench_isocronas [lado] [limite_min] [origenes]
+"""
+import sys
+import time
+
+from algorithms.caminocorto.dijkstra import shortest_paths_from_source_dijkstra
+from algorithms.caminocorto.isocronas import isocronas
+from benchmarks.redes import pares_aleatorios, red_vial
+
+
+def filtrar_completo(G, origenes, limite):
+    resultados = {}
+    for o in origenes:
+        _, _, tiempos, _ = shortest_paths_from_source_dijkstra(G, o)
+        resultados[o] = {v for v, t in tiempos.items() if t <= limite}
+    return resultados
+
+
+def main(lado, limite, origenes):
+    G = red_vial(lado)
+    fuentes = [s for s, _ in pares_aleatorios(G, origenes)]
+    print(f"{G.number_of_nodes()} nodos, límite {limite} min")
+    inicio = time.perf_counter()
+    filtrar_completo(G, fuentes, limite)
+    print(f"{'Dijkstra completo':<20} {(time.perf_counter() - inicio) / origenes * 1e3:>8.1f} ms/origen")
+    inicio = time.perf_counter()
+    resultados = isocronas(G, fuentes, limite, "eta")
+    segundos = time.perf_counter() - inicio
+    promedio = sum(len(r) for r in resultados.values()) / origenes
+    print(f"{'Isócrona acotada':<20} {segundos / origenes * 1e3:>8.1f} ms/origen ({promedio:.0f} nodos alcanzados)")
+
+
+if __name__ == "__main__":
+    argumentos = [int(x) for x in sys.argv[1:]]
+    main(*(argumentos + [150, 90, 20][len(argumentos):]))
@@ -0,0 +1,39 @@
+"""
+Johnson de networkx (más la suma de distancia y ETA por camino que hacía el código anterior)
+contra Johnson repesado una vez y con los Dijkstra por fuente repartidos entre procesos.
+
+Uso: python -m benchmarks.bench_johnson [lado] [procesos]
+"""
+import os
+import sys
+import time
+
+import networkx as nx
+
+from algorithms.caminocorto.johnson import johnson_matrices
+from benchmarks.redes import red_vial
+
+
+def johnson_networkx(G):
+    paths = dict(nx.johnson(G, weight='distancia'))
+    for origen in paths:
+        for path in paths[origen].values():
+            sum(G[a][b]['distancia'] for a, b in zip(path, path[1:]))
+            sum(G[a][b]['eta'] for a, b in zip(path, path[1:]))
+
+
+def main(lado, procesos):
+    G = red_vial(lado)
+    print(f"{G.number_of_nodes()} nodos, {G.number_of_edges()} aristas, {os.cpu_count()} CPU")
+    metodos = [("networkx", lambda: johnson_networkx(G)), ("CSR, 1 proceso", lambda: johnson_matrices(G, 1))]
+    if procesos > 1:
+        metodos.append((f"CSR, {procesos} procesos", lambda: johnson_matrices(G, procesos)))
+    for nombre, calcular in metodos:
+        inicio = time.perf_counter()
+        calcular()
+        print(f"{nombre:<24} {time.perf_counter() - inicio:>8.2f} s")
+
+
+if __name__ == "__main__":
+    argumentos = [int(x) for x in sys.argv[1:]]
+    main(*(argumentos + [30, os.cpu_count() or 1][len(argumentos):]))
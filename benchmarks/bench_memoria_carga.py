@@ -0,0 +1,42 @@
+"""
+Pico de memoria al leer la tabla de rutas completa (leer_rutas) contra la lectura
+por bloques con aristas internadas y fusionadas al vuelo (leer_rutas_por_bloques).
+
+Uso: python -m benchmarks.bench_memoria_carga [filas]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bench_carga import generar_csv
+from models.graph_logic import leer_rutas, leer_rutas_por_bloques
+
+
+def medir(funcion, *args):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    tabla = funcion(*args)
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return segundos, pico / 2**20, len(tabla)
+
+
+def main(filas):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rutas.csv")
+        generar_csv(path, filas)
+        print(f"{filas} filas, {os.path.getsize(path) / 2**20:.1f} MB en disco")
+        print(f"{'Lector':<28} {'Tiempo (s)':>11} {'Pico (MB)':>10} {'Aristas':>9}")
+        for nombre, funcion, args in [
+            ("leer_rutas", leer_rutas, (path,)),
+            ("por bloques (100k filas)", leer_rutas_por_bloques, (path, 100_000)),
+        ]:
+            segundos, pico, aristas = medir(funcion, *args)
+            print(f"{nombre:<28} {segundos:>11.2f} {pico:>10.1f} {aristas:>9}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,39 @@
+"""
+Matriz origen/destino: un calcular_caminos_a_todos por origen contra matriz_od con Dijkstra
+que termina al alcanzar los destinos y con cubetas sobre Contraction Hierarchies.
+
+Uso: python -m benchmarks.bench_od [lado] [origenes] [destinos]
+"""
+import random
+import sys
+import time
+
+from algorithms.caminocorto.contraction_hierarchies import obtener_jerarquia
+from algorithms.caminocorto.dijkstra import shortest_paths_from_source_dijkstra
+from algorithms.caminocorto.matriz_od import matriz_od
+from benchmarks.redes import red_vial
+
+
+def main(lado, origenes, destinos):
+    G = red_vial(lado)
+    rnd = random.Random(1)
+    nodos = list(G)
+    O = rnd.sample(nodos, origenes)
+    D = rnd.sample(nodos, destinos)
+    inicio = time.perf_counter()
+    obtener_jerarquia(G)
+    print(f"{len(nodos)} nodos; jerarquía preprocesada en {time.perf_counter() - inicio:.1f} s")
+    metodos = [
+        ("un origen a la vez", lambda: [shortest_paths_from_source_dijkstra(G, o) for o in O]),
+        ("dijkstra con objetivos", lambda: matriz_od(G, O, D, "dijkstra")),
+        ("cubetas CH", lambda: matriz_od(G, O, D, "ch")),
+    ]
+    for nombre, calcular in metodos:
+        inicio = time.perf_counter()
+        calcular()
+        print(f"{nombre:<24} {time.perf_counter() - inicio:>8.2f} s")
+
+
+if __name__ == "__main__":
+    argumentos = [int(x) for x in sys.argv[1:]]
+    main(*(argumentos + [60, 100, 200][len(argumentos):]))
@@ -0,0 +1,40 @@
+"""
+K caminos más cortos: nx.shortest_simple_paths contra KCaminosYen (árbol hacia el destino
+reutilizado como cota exacta y atajo, y desvíos solo desde el punto de separación).
+
+Uso: python -m benchmarks.bench_yen [lado] [k] [consultas]
+"""
+import itertools
+import sys
+import time
+
+import networkx as nx
+
+from algorithms.caminocorto.yen import KCaminosYen
+from algorithms.grafo_csr import obtener_csr
+from benchmarks.redes import pares_aleatorios, red_vial
+
+
+def main(lado, k, consultas):
+    G = red_vial(lado)
+    csr = obtener_csr(G)
+    pares = pares_aleatorios(G, consultas)
+    print(f"{csr.n} nodos, k = {k}")
+    inicio = time.perf_counter()
+    for s, t in pares:
+        list(itertools.islice(nx.shortest_simple_paths(G, s, t, weight='distancia'), k))
+    print(f"{'networkx':<12} {(time.perf_counter() - inicio) / consultas * 1e3:>8.1f} ms/consulta")
+    inicio = time.perf_counter()
+    busquedas = atajos = 0
+    for s, t in pares:
+        yen = KCaminosYen(csr, csr.indice[s], csr.indice[t])
+        list(yen.caminos(k))
+        busquedas += yen.busquedas
+        atajos += yen.atajos
+    print(f"{'Yen CSR':<12} {(time.perf_counter() - inicio) / consultas * 1e3:>8.1f} ms/consulta"
+          f" ({busquedas / consultas:.0f} búsquedas de desvío, {atajos / consultas:.0f} atajos por árbol)")
+
+
+if __name__ == "__main__":
+    argumentos = [int(x) for x in sys.argv[1:]]
+    main(*(argumentos + [60, 10, 10][len(argumentos):]))
@@ -0,0 +1,41 @@
+"""Redes sintéticas para los benchmarks de algoritmos"""
+import random
+
+import networkx as nx
+
+
+def red_vial(lado, semilla=0, dirigido=False):
+    """
+    Cuadrícula lado x lado con algunas diagonales, parecida a una red vial regional.
+    Las aristas tienen distancia (km), eta (min) y capacity; los nodos tienen pos (lat, lon).
+    """
+    rnd = random.Random(semilla)
+    G = nx.DiGraph() if dirigido else nx.Graph()
+    paso = 0.05  # grados, unos 5.5 km entre nodos vecinos
+    for i in range(lado):
+        for j in range(lado):
+            G.add_node(f"N{i}_{j}", pos=(10.0 - i * paso, -75.5 + j * paso))
+
+    def agregar(a, b, factor=1.0):
+        km = round(paso * 111 * factor * rnd.uniform(1.05, 1.6), 1)
+        eta = round(km * rnd.uniform(0.9, 2.2), 1)
+        cap = rnd.randint(50, 300)
+        G.add_edge(a, b, distancia=km, eta=eta, capacity=cap)
+        if dirigido:
+            G.add_edge(b, a, distancia=km, eta=eta, capacity=rnd.randint(50, 300))
+
+    for i in range(lado):
+        for j in range(lado):
+            if i + 1 < lado:
+                agregar(f"N{i}_{j}", f"N{i + 1}_{j}")
+            if j + 1 < lado:
+                agregar(f"N{i}_{j}", f"N{i}_{j + 1}")
+            if i + 1 < lado and j + 1 < lado and rnd.random() < 0.2:
+                agregar(f"N{i}_{j}", f"N{i + 1}_{j + 1}", 1.42)
+    return G
+
+
+def pares_aleatorios(G, cantidad, semilla=1):
+    rnd = random.Random(semilla)
+    nodos = list(G.nodes)
+    return [tuple(rnd.sample(nodos, 2)) for _ in range(cantidad)]
@@ -1,10 +1,25 @@
+import os
+import unicodedata
+from functools import lru_cache, partial
+
+import numpy as np
 import pandas as pd
 import networkx as nx
-from algorithms.caminocorto.dijkstra import shortest_path_dijkstra, shortest_paths_from_source_dijkstra
-from algorithms.caminocorto.bellman_ford import shortest_paths_from_source_bellman
+from models.snapshot import cargar_snapshot, guardar_snapshot, hash_archivo
+from algorithms.grafo_csr import obtener_csr
+# Se reexporta para quien edite el grafo a mano (ver cargar_red)
+from algorithms.grafo_csr import marcar_modificado  # noqa: F401
+from algorithms.caminocorto.dijkstra import arbol_caminos_dijkstra, shortest_path_dijkstra
+from algorithms.caminocorto.bellman_ford import bellman_ford, shortest_paths_from_source_bellman
 from algorithms.caminocorto.astar import shortest_path_astar
-from algorithms.caminocorto.floyd_warshall import shortest_paths_floyd_warshall
-from algorithms.caminocorto.johnson import shortest_paths_johnson
+from algorithms.caminocorto.floyd_warshall import floyd_warshall_matrices
+from algorithms.caminocorto.johnson import johnson_matrices
+from algorithms.caminocorto.contraction_hierarchies import obtener_jerarquia, shortest_path_ch
+from algorithms.caminocorto.isocronas import isocrona, isocronas
+from algorithms.caminocorto.matriz_od import matriz_od
+from algorithms.caminocorto.yen import k_shortest_paths_yen
+from algorithms.caminocorto.dinamico import cerrar_arista, editar_arista, editar_aristas
+from algorithms.caminocorto.todos_pares import calcular_en_segundo_plano, resultado_listo, resultado_memorizado
 
 COORDS = {
     "Cartagena": (10.4236, -75.5253),
@@ -55,97 +70,270 @@ COORDS = {
     "San Jacinto Del Cauca": (8.3889, -74.6418),
 }
 
+@lru_cache(maxsize=None)
 def normaliza(nombre):
     """Convierte a formato 'Titulo' sin tildes"""
-    import unicodedata
     n = str(nombre).strip().title()
     n = ''.join(c for c in unicodedata.normalize('NFD', n) if unicodedata.category(c) != 'Mn')
     return n
 
-def cargar_grafo(csv_path):
-    df = pd.read_csv(csv_path, sep=None, engine='python', encoding='latin1')
-    G = nx.Graph()
-    for _, row in df.iterrows():
-        origen = normaliza(row['origen'])
-        destino = normaliza(row['destino'])
-        distancia = float(row['distancia(km)'])
-        eta = float(row['ETA(min)'])
-        if 'flujo (und)' in df.columns:
-            flujo = float(row['flujo (und)'])
-            G.add_edge(origen, destino, distancia=distancia, eta=eta, flujo=flujo)
-        else:
-            G.add_edge(origen, destino, distancia=distancia, eta=eta)
-    # --- ASIGNAR COORDENADAS ---
-    for n in G.nodes:
-        nodo = normaliza(n)
-        found = False
-        for k in COORDS:
-            if normaliza(k) == nodo:
-                G.nodes[n]['pos'] = COORDS[k]
-                found = True
-                break
-        if not found:
-            G.nodes[n]['pos'] = (0, 0)
-    return G
 
+# Índice nombre normalizado -> (lat, lon); se construye una vez y se consulta en O(1) por nodo
+INDICE_COORDS = {}
+for _nombre, _pos in COORDS.items():
+    INDICE_COORDS.setdefault(normaliza(_nombre), _pos)
 
-def cargar_grafo_caminos(csv_path):
-    with open(csv_path, encoding='latin1') as f:
-        primer_linea = f.readline()
-        sep = '\t' if '\t' in primer_linea else ';'
-    df = pd.read_csv(csv_path, sep=sep, encoding='latin1')
-    df.columns = df.columns.str.strip()
-    G = nx.Graph()
-    for _, row in df.iterrows():
-        origen = normaliza(row['origen'])
-        destino = normaliza(row['destino'])
-        distancia = float(row['distancia(km)'])
-        eta = float(row['ETA(min)'])
-        G.add_edge(origen, destino, distancia=distancia, eta=eta)
-    # --- ASIGNAR COORDENADAS ---
-    for n in G.nodes:
-        nodo = normaliza(n)
-        found = False
-        for k in COORDS:
-            if normaliza(k) == nodo:
-                G.nodes[n]['pos'] = COORDS[k]
-                found = True
-                break
-        if not found:
-            G.nodes[n]['pos'] = (0, 0)
-    return G
 
+def cargar_coordenadas(path, reemplazar=False):
+    """
+    Agrega al índice de coordenadas los municipios de un archivo externo con columnas
+    municipio, lat y lon. Con reemplazar=True se descartan las coordenadas embebidas.
+    :return: cantidad de municipios en el índice
+    """
+    df = pd.read_csv(path, sep=_detectar_separador(path), encoding='latin1')
+    df.columns = df.columns.str.strip().str.lower()
+    nombres = _normalizar_columna(df['municipio'].astype(str))
+    lat = df['lat'].astype(float).tolist()
+    lon = df['lon'].astype(float).tolist()
+    if reemplazar:
+        INDICE_COORDS.clear()
+    INDICE_COORDS.update(zip(nombres.tolist(), zip(lat, lon)))
+    return len(INDICE_COORDS)
 
-def cargar_grafo_flujo(csv_path):
+
+def _detectar_separador(csv_path):
+    """Detecta el separador del CSV a partir de la primera línea"""
     with open(csv_path, encoding='latin1') as f:
         primer_linea = f.readline()
-        sep = '\t' if '\t' in primer_linea else ';'
-    df = pd.read_csv(csv_path, sep=sep, encoding='latin1')
+    if '\t' in primer_linea:
+        return '\t'
+    if ';' in primer_linea:
+        return ';'
+    return ','
+
+
+def _normalizar_columna(serie):
+    """Aplica normaliza una sola vez por nombre distinto y expande el resultado a toda la columna"""
+    codigos, unicos = pd.factorize(serie)
+    normalizados = np.array([normaliza(n) for n in unicos] + [''], dtype=object)
+    return pd.Series(normalizados[codigos], index=serie.index)
+
+
+def leer_rutas(csv_path):
+    """
+    Lee el CSV de rutas y devuelve la tabla de aristas con columnas ya tipadas:
+    origen, destino (en formato 'Titulo'), distancia, eta y, si existe, flujo.
+    """
+    df = pd.read_csv(csv_path, sep=_detectar_separador(csv_path), encoding='latin1')
     df.columns = df.columns.str.strip()
-    G = nx.DiGraph()
-    for _, row in df.iterrows():
-        origen = str(row['origen']).strip().title()
-        destino = str(row['destino']).strip().title()
-        distancia = float(row['distancia(km)'])
-        eta = float(row['ETA(min)'])
-        flujo = float(row['flujo (und)']) if 'flujo (und)' in df.columns else 150
+    tabla = pd.DataFrame({
+        'origen': df['origen'].astype(str).str.strip().str.title(),
+        'destino': df['destino'].astype(str).str.strip().str.title(),
+        'distancia': df['distancia(km)'].astype(float),
+        'eta': df['ETA(min)'].astype(float),
+    })
+    if 'flujo (und)' in df.columns:
+        tabla['flujo'] = df['flujo (und)'].astype(float)
+    return tabla
 
-        G.add_edge(origen, destino, distancia=distancia, eta=eta, capacity=flujo)
 
-    # --- ASIGNAR COORDENADAS ---
-    for n in G.nodes:
-        nodo = normaliza(n)
-        found = False
-        for k in COORDS:
-            if normaliza(k) == nodo:
-                G.nodes[n]['pos'] = COORDS[k]
-                found = True
-                break
-        if not found:
-            G.nodes[n]['pos'] = (0, 0)
+class _ArregloCreciente:
+    """Arreglo NumPy que duplica su capacidad cuando se llena"""
+    def __init__(self, dtype, capacidad=1024):
+        self.datos = np.empty(capacidad, dtype=dtype)
+        self.n = 0
+
+    def extender(self, valores):
+        fin = self.n + len(valores)
+        if fin > len(self.datos):
+            nuevo = np.empty(max(fin, 2 * len(self.datos)), dtype=self.datos.dtype)
+            nuevo[:self.n] = self.datos[:self.n]
+            self.datos = nuevo
+        self.datos[self.n:fin] = valores
+        self.n = fin
+
+    def valores(self):
+        return self.datos[:self.n]
+
+
+def _internar(serie, ids):
+    """Convierte los nombres de la columna en ids enteros, agregando al diccionario los nuevos"""
+    codigos, unicos = pd.factorize(serie.astype(str))
+    mapa = np.array([ids.setdefault(n.strip().title(), len(ids)) for n in unicos], dtype=np.int64)
+    return mapa[codigos]
+
+
+def leer_rutas_por_bloques(csv_path, filas_por_bloque=500_000):
+    """
+    Igual que leer_rutas, pero lee el archivo por bloques para no materializar todo el CSV.
+    Los nombres se internan en ids enteros y las aristas se acumulan en arreglos que crecen;
+    las aristas repetidas (mismo origen y destino) se fusionan al vuelo conservando los
+    valores de la última fila, como hacía add_edge. La tabla sale ordenada por la última
+    aparición de cada arista, así el grafo no dirigido resuelve igual los pares (a,b)/(b,a).
+    """
+    ids = {}
+    columnas = {
+        'origen': _ArregloCreciente(np.int32),
+        'destino': _ArregloCreciente(np.int32),
+        'distancia': _ArregloCreciente(np.float64),
+        'eta': _ArregloCreciente(np.float64),
+        'flujo': _ArregloCreciente(np.float64),
+        'fila': _ArregloCreciente(np.int64),
+    }
+    # Claves (origen << 32 | destino) ordenadas y la posición de cada arista en los arreglos
+    claves = np.empty(0, dtype=np.int64)
+    posiciones = np.empty(0, dtype=np.int64)
+    tiene_flujo = False
+    filas_leidas = 0
+
+    lector = pd.read_csv(csv_path, sep=_detectar_separador(csv_path), encoding='latin1',
+                         chunksize=filas_por_bloque)
+    for bloque in lector:
+        bloque.columns = bloque.columns.str.strip()
+        tiene_flujo = 'flujo (und)' in bloque.columns
+        u = _internar(bloque['origen'], ids)
+        v = _internar(bloque['destino'], ids)
+        valores = {
+            'origen': u,
+            'destino': v,
+            'distancia': bloque['distancia(km)'].to_numpy(dtype=np.float64),
+            'eta': bloque['ETA(min)'].to_numpy(dtype=np.float64),
+            'flujo': bloque['flujo (und)'].to_numpy(dtype=np.float64) if tiene_flujo else np.zeros(len(bloque)),
+            'fila': np.arange(filas_leidas, filas_leidas + len(bloque)),
+        }
+        filas_leidas += len(bloque)
+
+        # Última aparición de cada arista dentro del bloque
+        clave = (u << 32) | v
+        unicas, desde_el_final = np.unique(clave[::-1], return_index=True)
+        ultima = len(clave) - 1 - desde_el_final
+
+        idx = np.searchsorted(claves, unicas)
+        existe = idx < len(claves)
+        existe[existe] = claves[idx[existe]] == unicas[existe]
+
+        # Aristas ya vistas: se sobreescriben sus valores
+        destino = posiciones[idx[existe]]
+        for nombre, arreglo in columnas.items():
+            arreglo.datos[destino] = valores[nombre][ultima[existe]]
+
+        # Aristas nuevas: se agregan al final y se insertan en el índice ordenado
+        nuevas = ~existe
+        inicio = columnas['fila'].n
+        for nombre, arreglo in columnas.items():
+            arreglo.extender(valores[nombre][ultima[nuevas]])
+        claves = np.insert(claves, idx[nuevas], unicas[nuevas])
+        posiciones = np.insert(posiciones, idx[nuevas], np.arange(inicio, columnas['fila'].n))
+
+    orden = np.argsort(columnas['fila'].valores(), kind='stable')
+    nombres = list(ids)
+    tabla = pd.DataFrame({
+        'origen': pd.Categorical.from_codes(columnas['origen'].valores()[orden], categories=nombres),
+        'destino': pd.Categorical.from_codes(columnas['destino'].valores()[orden], categories=nombres),
+        'distancia': columnas['distancia'].valores()[orden],
+        'eta': columnas['eta'].valores()[orden],
+    })
+    if tiene_flujo:
+        tabla['flujo'] = columnas['flujo'].valores()[orden]
+    return tabla
+
+
+# A partir de este tamaño el CSV se lee por bloques en lugar de cargarlo completo
+TAMANO_LECTURA_POR_BLOQUES = 256 * 1024 * 1024
+
+
+def _leer_csv(csv_path):
+    if os.path.getsize(csv_path) >= TAMANO_LECTURA_POR_BLOQUES:
+        return leer_rutas_por_bloques(csv_path)
+    return leer_rutas(csv_path)
+
+
+def _leer_tabla(csv_path, usar_snapshot=True):
+    """
+    Tabla de aristas del archivo, reutilizando el snapshot binario si el contenido del CSV
+    no cambió. :return: (tabla, coords) con coords {nombre normalizado: (lat, lon)} o None
+    """
+    if not usar_snapshot:
+        return _leer_csv(csv_path), None
+    huella = hash_archivo(csv_path)
+    guardado = cargar_snapshot(csv_path, huella)
+    if guardado is not None:
+        tabla, coords = guardado
+        return tabla, {normaliza(n): pos for n, pos in coords.items() if pos != (0, 0)}
+    tabla = _leer_csv(csv_path)
+    guardar_snapshot(csv_path, tabla, lambda n: INDICE_COORDS.get(normaliza(n), (0, 0)), huella)
+    return tabla, None
+
+
+def _construir_grafo(G, origenes, destinos, atributos, coords=None):
+    """Agrega todas las aristas de una vez; atributos es {nombre_atributo: columna}"""
+    nombres = list(atributos)
+    columnas = [col.tolist() for col in atributos.values()]
+    G.add_edges_from(
+        (u, v, dict(zip(nombres, valores)))
+        for u, v, *valores in zip(origenes.tolist(), destinos.tolist(), *columnas)
+    )
+    _asignar_coordenadas(G, coords)
     return G
 
 
+def _asignar_coordenadas(G, coords=None):
+    """Usa el índice de municipios y, en su defecto, las coordenadas guardadas en el snapshot"""
+    coords = coords or {}
+    for n in G.nodes:
+        clave = normaliza(n)
+        G.nodes[n]['pos'] = INDICE_COORDS.get(clave) or coords.get(clave, (0, 0))
+
+
+def grafo_desde_tabla(tabla, incluir_flujo=True, coords=None):
+    """Grafo no dirigido de rutas con nombres normalizados (sin tildes)"""
+    atributos = {'distancia': tabla['distancia'], 'eta': tabla['eta']}
+    if incluir_flujo and 'flujo' in tabla.columns:
+        atributos['flujo'] = tabla['flujo']
+    return _construir_grafo(nx.Graph(), _normalizar_columna(tabla['origen']),
+                            _normalizar_columna(tabla['destino']), atributos, coords)
+
+
+def grafo_flujo_desde_tabla(tabla, coords=None):
+    """Grafo dirigido con atributo 'capacity' (150 por defecto si el archivo no trae flujo)"""
+    capacidad = tabla['flujo'] if 'flujo' in tabla.columns else pd.Series(150, index=tabla.index)
+    atributos = {'distancia': tabla['distancia'], 'eta': tabla['eta'], 'capacity': capacidad}
+    return _construir_grafo(nx.DiGraph(), tabla['origen'], tabla['destino'], atributos, coords)
+
+
+def cargar_red(csv_path, usar_snapshot=True):
+    """
+    Lee el archivo una sola vez y deriva de la misma tabla de aristas el grafo de rutas,
+    el grafo dirigido de flujo y si el archivo trae datos de flujo. Las aristas o pesos se editan
+    con actualizar_arista / cerrar_via; si se editan a mano hay que llamar a marcar_modificado(G)
+    para invalidar lo precalculado.
+    :return: (G, GD, tiene_flujo)
+    """
+    tabla, coords = _leer_tabla(csv_path, usar_snapshot)
+    tiene_flujo = 'flujo' in tabla.columns
+    G = grafo_desde_tabla(tabla, coords=coords)
+    GD = grafo_flujo_desde_tabla(tabla, coords)
+    # La representación compacta que usan los algoritmos se construye una sola vez aquí
+    obtener_csr(G)
+    obtener_csr(GD)
+    return G, GD, tiene_flujo
+
+
+def cargar_grafo(csv_path, usar_snapshot=True):
+    tabla, coords = _leer_tabla(csv_path, usar_snapshot)
+    return grafo_desde_tabla(tabla, coords=coords)
+
+
+def cargar_grafo_caminos(csv_path, usar_snapshot=True):
+    tabla, coords = _leer_tabla(csv_path, usar_snapshot)
+    return grafo_desde_tabla(tabla, incluir_flujo=False, coords=coords)
+
+
+def cargar_grafo_flujo(csv_path, usar_snapshot=True):
+    tabla, coords = _leer_tabla(csv_path, usar_snapshot)
+    return grafo_flujo_desde_tabla(tabla, coords)
+
+
 def redireccionar_grafo_favor_flujo(G, fuente, sumidero):
     """
     Redirige todas las aristas del grafo para que apunten en la dirección que acerca al sumidero.
@@ -187,21 +375,106 @@ def info_nodos(G):
         print(f"→ {nodo} | Grado: {G.degree[nodo]} | Vecinos: {vecinos}")
     print(f"\nCantidad total de nodos: {G.number_of_nodes()}")
 
-def calcular_camino_mas_corto(G, origen, destino):
-    return shortest_path_dijkstra(G, origen, destino)
+def calcular_camino_mas_corto(G, origen, destino, bidireccional=False):
+    return shortest_path_dijkstra(G, origen, destino, bidireccional=bidireccional)
+
+def calcular_k_caminos(G, origen, destino, k=10):
+    """Hasta k rutas alternativas sin ciclos (Yen): lista de (camino, distancia, tiempo)"""
+    return k_shortest_paths_yen(G, origen, destino, k)
+
+def preparar_jerarquia(G, path=None):
+    """Preprocesa (o carga de path) la jerarquía de contracción del grafo para consultas rápidas"""
+    return obtener_jerarquia(G, path)
+
+def calcular_camino_ch(G, origen, destino, path=None):
+    return shortest_path_ch(G, origen, destino, path)
+
+# Árboles de un origen memorizados por versión del grafo (los de los orígenes usados hace más
+# tiempo se descartan)
+ARBOLES_MEMORIZADOS = 32
 
 def calcular_caminos_a_todos(G, origen):
-    return shortest_paths_from_source_dijkstra(G, origen)
+    # actualizar_arista repara los árboles memorizados en vez de descartarlos; los errores no se memorizan
+    try:
+        arbol = resultado_memorizado(G, ("Dijkstra", origen), partial(arbol_caminos_dijkstra, origen=origen),
+                                     limite=ARBOLES_MEMORIZADOS)
+    except Exception as e:
+        print(e)
+        return {}, {}, {}, "Dijkstra"
+    return (*arbol.vistas(), "Dijkstra")
 
 def calcular_todos_caminos_bellman(G, origen):
 
     return shortest_paths_from_source_bellman(G, origen)
 
-def calcular_camino_astar(G, origen, destino):
-    return shortest_path_astar(G, origen, destino)
+def calcular_bellman_ford(G, origen, modo="cola"):
+    """ResultadoBellman: árbol de caminos o el ciclo negativo encontrado, para que la interfaz lo muestre"""
+    return bellman_ford(G, origen, modo)
+
+def calcular_camino_astar(G, origen, destino, modo="euclidea"):
+    """modo 'euclidea' (coordenadas) o 'alt' (landmarks precalculados)"""
+    return shortest_path_astar(G, origen, destino, modo)
+
+def calcular_isocrona(G, origen, limite, peso="eta"):
+    """Municipios alcanzables desde origen sin superar limite (minutos si peso='eta', km si 'distancia')"""
+    return isocrona(G, origen, limite, peso)
+
+def calcular_isocronas(G, origenes, limite, peso="eta"):
+    return isocronas(G, origenes, limite, peso)
+
+def calcular_matriz_od(G, origenes, destinos, metodo="auto", salida=None):
+    """
+    Matrices (distancia, eta) de len(origenes) x len(destinos), con inf donde no hay camino.
+    metodo 'ch' (cubetas sobre Contraction Hierarchies), 'dijkstra' (un Dijkstra por origen
+    que se detiene al alcanzar todos los destinos) o 'auto' ('ch' si ya hay jerarquía).
+    Con salida, las filas se van escribiendo en <salida>_distancia.npy y <salida>_eta.npy.
+    """
+    return matriz_od(G, origenes, destinos, metodo, salida)
+
+# Algoritmos de todos los pares: la TablaTodosPares se calcula una vez por versión del grafo y
+# se memoriza en forma compacta (float32, triangular si el grafo no es dirigido)
+TODOS_PARES = {
+    "Floyd-Warshall": partial(floyd_warshall_matrices, compacta=True),
+    # En la interfaz corre en un hilo de Tk: se calcula en el mismo proceso, sin pool
+    "Johnson": partial(johnson_matrices, procesos=1, compacta=True),
+}
+
+def calcular_todos_caminos(G, algoritmo):
+    """(distancias, rutas, tiempos, algoritmo) como vistas sobre la tabla; ({}, {}, {}, algoritmo) si falla"""
+    try:
+        tabla = resultado_memorizado(G, algoritmo, TODOS_PARES[algoritmo])
+    except Exception as e:
+        # El error no queda memorizado: la próxima consulta vuelve a intentarlo
+        print(f"Error en {algoritmo}:", e)
+        return {}, {}, {}, algoritmo
+    # Johnson solo lista los destinos alcanzables de cada origen
+    return (*tabla.vistas(solo_alcanzables=algoritmo == "Johnson"), algoritmo)
+
+def precalcular_todos_caminos(G, algoritmo):
+    """Empieza el cálculo en segundo plano; las consultas posteriores esperan o lo encuentran listo"""
+    return calcular_en_segundo_plano(G, algoritmo, TODOS_PARES[algoritmo])
+
+def todos_caminos_listos(G, algoritmo):
+    return resultado_listo(G, algoritmo)
 
 def calcular_todos_caminos_floyd(G):
-    return shortest_paths_floyd_warshall(G)
+    return calcular_todos_caminos(G, "Floyd-Warshall")
 
 def calcular_todos_caminos_johnson(G):
-    return shortest_paths_johnson(G)
\ No newline at end of file
+    return calcular_todos_caminos(G, "Johnson")
+
+def actualizar_arista(G, origen, destino, distancia=None, eta=None):
+    """
+    Cambia la distancia y/o el ETA de una vía (por ejemplo un accidente) y repara solo lo
+    afectado de los caminos ya calculados: árboles de calcular_caminos_a_todos y tablas de
+    todos los pares. :return: Edicion (para reparar_arbol sobre árboles propios)
+    """
+    return editar_arista(G, origen, destino, distancia, eta)
+
+def cerrar_via(G, origen, destino):
+    """Quita una vía del grafo (cierre) reparando lo ya calculado como actualizar_arista"""
+    return cerrar_arista(G, origen, destino)
+
+def actualizar_aristas(G, cambios):
+    """Varias ediciones a la vez: {(origen, destino): {'distancia': ..., 'eta': ...} o None para cerrarla}"""
+    return editar_aristas(G, cambios)
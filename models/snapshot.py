@@ -0,0 +1,88 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+# Cambiar cuando cambie el contenido del snapshot para invalidar los archivos viejos
+VERSION_SNAPSHOT = 1
+CARPETA_CACHE = '.grafos_cache'
+
+
+def hash_archivo(path, bloque=1 << 20):
+    """Hash del contenido del archivo, leído por bloques"""
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for trozo in iter(lambda: f.read(bloque), b''):
+            h.update(trozo)
+    return h.hexdigest()
+
+
+def ruta_snapshot(csv_path):
+    carpeta = os.path.join(os.path.dirname(os.path.abspath(csv_path)), CARPETA_CACHE)
+    return os.path.join(carpeta, os.path.basename(csv_path) + '.npz')
+
+
+def guardar_snapshot(csv_path, tabla, coords, huella=None):
+    """
+    Guarda la tabla de aristas como arreglos: tabla de nodos internada, índices
+    origen/destino, distancia, eta, flujo (si existe) y coordenadas por nodo.
+    :param coords: función nombre -> (lat, lon)
+    :return: ruta del snapshot o None si no se pudo escribir
+    """
+    huella = huella or hash_archivo(csv_path)
+    codigos, nombres = pd.factorize(pd.concat([tabla['origen'], tabla['destino']], ignore_index=True))
+    m = len(tabla)
+    posiciones = np.array([coords(n) for n in nombres], dtype=np.float64).reshape(-1, 2)
+    arreglos = {
+        'version': np.array(VERSION_SNAPSHOT),
+        'hash': np.array(huella),
+        'nombres': np.array(nombres, dtype=str),
+        'origen': codigos[:m].astype(np.int32),
+        'destino': codigos[m:].astype(np.int32),
+        'distancia': tabla['distancia'].to_numpy(dtype=np.float64),
+        'eta': tabla['eta'].to_numpy(dtype=np.float64),
+        'lat': posiciones[:, 0],
+        'lon': posiciones[:, 1],
+    }
+    if 'flujo' in tabla.columns:
+        arreglos['flujo'] = tabla['flujo'].to_numpy(dtype=np.float64)
+    destino = ruta_snapshot(csv_path)
+    try:
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        temporal = destino + '.tmp.npz'
+        np.savez(temporal, **arreglos)
+        os.replace(temporal, destino)
+    except OSError as e:
+        print("No se pudo guardar el snapshot del grafo:", e)
+        return None
+    return destino
+
+
+def cargar_snapshot(csv_path, huella=None):
+    """
+    Devuelve (tabla, coords) desde el snapshot si el hash del CSV coincide, o None.
+    coords es un diccionario nombre -> (lat, lon) con los nombres de la tabla.
+    """
+    destino = ruta_snapshot(csv_path)
+    if not os.path.exists(destino):
+        return None
+    huella = huella or hash_archivo(csv_path)
+    try:
+        with np.load(destino, allow_pickle=False) as datos:
+            if int(datos['version']) != VERSION_SNAPSHOT or str(datos['hash']) != huella:
+                return None
+            nombres = datos['nombres'].astype(object)
+            tabla = pd.DataFrame({
+                'origen': nombres[datos['origen']],
+                'destino': nombres[datos['destino']],
+                'distancia': datos['distancia'],
+                'eta': datos['eta'],
+            })
+            if 'flujo' in datos.files:
+                tabla['flujo'] = datos['flujo']
+            coords = dict(zip(nombres.tolist(), zip(datos['lat'].tolist(), datos['lon'].tolist())))
+    except (OSError, KeyError, ValueError) as e:
+        print("Snapshot inválido, se vuelve a leer el CSV:", e)
+        return None
+    return tabla, coords